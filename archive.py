@@ -0,0 +1,245 @@
+"""Archivo por año de las fechas y pagos de años cerrados
+
+Uso:
+    python archive.py 2023 [2024 ...] [--db tax_reminder.db]
+    python archive.py --list [--db tax_reminder.db]
+
+Las fechas de los calendarios de un año (tax_dates.year) y los pagos de ese
+año pasan a archive/tax_reminder-<año>.db, así la base de datos en uso solo
+crece con los años abiertos. Las consultas de la ventana de recordatorios no
+abren los archivos; los reportes que piden años archivados los adjuntan con
+ATTACH y unen sus filas con UNION ALL a las de la base de datos en uso.
+
+Los ids se conservan. tax_dates usa AUTOINCREMENT, así SQLite nunca vuelve a
+asignar el id de una fecha archivada (los pagos archivados apuntan a esos ids).
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+ARCHIVE_VERSION = 1
+# Los vencimientos de fin de año pueden pasar al siguiente día hábil de enero
+_GRACE_DAYS = 31
+# SQLite permite 10 bases adjuntas por defecto; se deja margen
+_ATTACH_BATCH = 8
+# Copias al archivo antes de desistir si el año sigue cambiando
+_MOVE_ATTEMPTS = 3
+
+_ARCHIVE_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS {schema}.tax_dates (
+        id INTEGER NOT NULL PRIMARY KEY,
+        table_name VARCHAR(50) NOT NULL,
+        month INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        description VARCHAR(200),
+        year INTEGER,
+        rif_digits VARCHAR(10),
+        doy INTEGER
+    )""",
+    """CREATE TABLE IF NOT EXISTS {schema}.payments (
+        id INTEGER NOT NULL PRIMARY KEY,
+        tax_date_id INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        paid_at DATETIME NOT NULL
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS {schema}.uq_payments_tax_date_year ON payments (tax_date_id, year)",
+)
+
+# Mismas columnas que models._REMINDER_COLUMNS
+_ARCHIVED_DATES = """
+    SELECT d.id, d.table_name, t.description, d.month, d.day, d.description, d.year, d.rif_digits
+    FROM {schema}.tax_dates d LEFT JOIN main.tables t ON t.name = d.table_name
+"""
+_ARCHIVED_PAYMENTS = "SELECT tax_date_id, year FROM {schema}.payments"
+
+
+def archive_dir(db_path: str) -> str:
+    """Directory of the archive files of a database"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive')
+
+
+def archive_path(db_path: str, year: int) -> str:
+    """Path of the archive file of one year, e.g. archive/tax_reminder-2023.db"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return os.path.join(archive_dir(db_path), f'{stem}-{year}.db')
+
+
+def archived_years(db_path: str) -> List[int]:
+    """Years that have an archive file next to the database"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(re.escape(stem) + r'-(\d{4})\.db$')
+    years = []
+    for path in glob.glob(os.path.join(archive_dir(db_path), f'{glob.escape(stem)}-*.db')):
+        match = pattern.search(os.path.basename(path))
+        if match:
+            years.append(int(match.group(1)))
+    return sorted(years)
+
+
+def is_closed(year: int, today: date = None) -> bool:
+    """Whether a year is over, including the days its last deadlines can roll into"""
+    if today is None:
+        today = date.today()
+    return today > date(year + 1, 1, 1) + timedelta(days=_GRACE_DAYS - 1)
+
+
+@contextmanager
+def attached(connection, db_path: str, years: Iterable[int]) -> Iterator[List[str]]:
+    """ATTACH the archives of the given years (only those that exist) and DETACH them on exit
+
+    Yields:
+        The schema names, e.g. ['archive_2023']
+    """
+    schemas = []
+    try:
+        for year in sorted(set(years)):
+            path = archive_path(db_path, year)
+            if os.path.exists(path):
+                schema = f'archive_{int(year)}'
+                connection.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+                schemas.append(schema)
+        yield schemas
+    finally:
+        for schema in schemas:
+            connection.execute(f"DETACH DATABASE {schema}")
+
+
+def _union_rows(connection, db_path: str, years: Iterable[int], query: str) -> Iterator[tuple]:
+    """Run query over the archives of the given years, a UNION ALL per batch of attachments"""
+    years = sorted(set(years) & set(archived_years(db_path)))
+    for start in range(0, len(years), _ATTACH_BATCH):
+        with attached(connection, db_path, years[start:start + _ATTACH_BATCH]) as schemas:
+            if schemas:
+                sql = '\nUNION ALL\n'.join(query.format(schema=schema) for schema in schemas)
+                yield from connection.execute(sql).fetchall()
+
+
+def read_archived_dates(connection, db_path: str, years: Iterable[int]) -> List[tuple]:
+    """Get the archived tax dates of the given years as reminder rows"""
+    return list(_union_rows(connection, db_path, years, _ARCHIVED_DATES))
+
+
+def read_archived_payments(connection, db_path: str, years: Iterable[int]) -> Set[Tuple[int, int]]:
+    """Get the archived (tax_date_id, year) payments of the given years"""
+    return set(_union_rows(connection, db_path, years, _ARCHIVED_PAYMENTS))
+
+
+@contextmanager
+def _write_transaction(cursor) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT, or ROLLBACK if the block raises"""
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    cursor.execute("COMMIT")
+
+
+def archive_year(connection, db_path: str, year: int, today: date = None) -> Dict[str, int]:
+    """Move the tax dates and payments of a closed year into its archive file
+
+    SQLite does not commit atomically across attached databases in WAL mode,
+    so the move takes two transactions: the rows are first copied into the
+    archive and committed there, then deleted from the live database once
+    every one of them is found in the archive. The copy replaces rows by id,
+    so after an interruption archiving the same year again completes the move.
+    It also moves whatever was added to the year since the last time.
+
+    Args:
+        connection: sqlite3 connection to the live database, without an open transaction
+
+    Returns:
+        {'dates': moved tax dates, 'payments': moved payments}
+
+    Raises:
+        ValueError: If the year is not closed yet, or if its rows kept changing
+            while they were being copied
+    """
+    if not is_closed(year, today):
+        raise ValueError(f"El año {year} todavía no está cerrado")
+
+    os.makedirs(archive_dir(db_path), exist_ok=True)
+    schema = f'archive_{int(year)}'
+    # También los pagos de otros años que apunten a estas fechas (por la clave foránea)
+    moved_dates = "FROM main.tax_dates WHERE year = ?"
+    moved_payments = """
+        FROM main.payments WHERE (year = ?
+           OR tax_date_id IN (SELECT id FROM main.tax_dates WHERE year = ?))
+    """
+    previous_isolation = connection.isolation_level
+    connection.isolation_level = None  # Controlar BEGIN/COMMIT manualmente
+    try:
+        connection.execute(f"ATTACH DATABASE ? AS {schema}", (archive_path(db_path, year),))
+        cursor = connection.cursor()
+        try:
+            for _ in range(_MOVE_ATTEMPTS):
+                # 1) Copia: solo cambia el archivo del año
+                with _write_transaction(cursor):
+                    for statement in _ARCHIVE_SCHEMA:
+                        cursor.execute(statement.format(schema=schema))
+                    cursor.execute(f"PRAGMA {schema}.user_version = {ARCHIVE_VERSION}")
+                    cursor.execute(f"""
+                        INSERT OR REPLACE INTO {schema}.tax_dates
+                        SELECT id, table_name, month, day, description, year, rif_digits, doy {moved_dates}
+                    """, (year,))
+                    cursor.execute(f"""
+                        INSERT OR REPLACE INTO {schema}.payments
+                        SELECT id, tax_date_id, year, paid_at {moved_payments}
+                    """, (year, year))
+
+                # 2) Borrado: solo cambia la base de datos en uso, y solo si todo quedó archivado
+                with _write_transaction(cursor):
+                    missing = cursor.execute(f"""
+                        SELECT (SELECT count(*) {moved_dates} AND id NOT IN (SELECT id FROM {schema}.tax_dates))
+                             + (SELECT count(*) {moved_payments} AND id NOT IN (SELECT id FROM {schema}.payments))
+                    """, (year, year, year)).fetchone()[0]
+                    if missing:
+                        continue  # Alguien escribió entre las dos transacciones: copiar de nuevo
+                    cursor.execute(f"DELETE {moved_payments}", (year, year))
+                    payments = cursor.rowcount
+                    cursor.execute(f"DELETE {moved_dates}", (year,))
+                    dates = cursor.rowcount
+                return {'dates': dates, 'payments': payments}
+        finally:
+            cursor.close()
+            connection.execute(f"DETACH DATABASE {schema}")
+    finally:
+        connection.isolation_level = previous_isolation
+    raise ValueError(f"Las fechas de {year} cambiaron mientras se archivaban; vuelva a intentarlo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archivar las fechas y pagos de años cerrados")
+    parser.add_argument('years', type=int, nargs='*', help="años a archivar")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    parser.add_argument('--list', action='store_true', help="mostrar los años ya archivados")
+    args = parser.parse_args()
+
+    from models import DatabaseManager
+
+    db = DatabaseManager(f'sqlite:///{os.path.abspath(args.db)}' if args.db else None)
+    if args.list or not args.years:
+        years = db.get_archived_years()
+        print(f"📦 Años archivados: {', '.join(map(str, years))}" if years else "ℹ️ No hay años archivados")
+        return 0
+
+    exit_code = 0
+    for year in args.years:
+        try:
+            moved = db.archive_year(year)
+        except ValueError as e:
+            print(f"❌ {e}")
+            exit_code = 1
+            continue
+        print(f"✅ {year}: {moved['dates']} fechas y {moved['payments']} pagos en {archive_path(db.db_path, year)}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
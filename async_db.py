@@ -0,0 +1,112 @@
+"""Fachada asyncio sobre DatabaseManager
+
+Uso:
+    async with AsyncDatabaseManager('sqlite:///tax_reminder.db') as db:
+        reminders = await db.check_today()
+
+Las consultas corren en un ThreadPoolExecutor acotado; cada hilo tiene su propio
+DatabaseManager (y por lo tanto sus propias sesiones y conexión del pool).
+Las lecturas idénticas que llegan mientras otra igual está en curso comparten
+su resultado: 200 llamadas simultáneas a check_today hacen una sola consulta.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# Hilos de consulta por defecto; el pool de conexiones de SQLAlchemy admite hasta 15
+DEFAULT_MAX_WORKERS = 4
+
+
+class AsyncDatabaseManager:
+    """Asyncio wrapper around DatabaseManager with request coalescing
+
+    Results of coalesced reads are shared between callers, so treat them as
+    read-only.
+
+    Args:
+        db_url: Database URL, as for DatabaseManager
+        max_workers: Number of query threads
+        pragmas: SQLite pragmas, as for DatabaseManager
+    """
+
+    def __init__(self, db_url: str = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 pragmas: Optional[Dict[str, Any]] = None):
+        self.db_url = db_url
+        self.pragmas = pragmas
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-db')
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+        # Contadores para medir el efecto de la coalescencia
+        self.queries = 0
+        self.coalesced = 0
+
+    async def __aenter__(self) -> 'AsyncDatabaseManager':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Wait for running queries and stop the worker threads"""
+        self._executor.shutdown(wait=True)
+
+    def _manager(self):
+        # Un DatabaseManager por hilo; todos comparten el engine del proceso
+        manager = getattr(self._local, 'manager', None)
+        if manager is None:
+            from models import DatabaseManager
+            manager = DatabaseManager(self.db_url, self.pragmas)
+            self._local.manager = manager
+        return manager
+
+    def _call(self, method: str, args: tuple) -> Any:
+        return getattr(self._manager(), method)(*args)
+
+    async def run(self, method: str, *args) -> Any:
+        """Run a DatabaseManager method on the executor without coalescing (use for writes)"""
+        self.queries += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, method, args)
+
+    async def read(self, method: str, *args) -> Any:
+        """Run a read-only DatabaseManager method, sharing the result of identical calls in flight"""
+        key = (method, args)
+        future = self._inflight.get(key)
+        if future is None:
+            self.queries += 1
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._call, method, args)
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: si un llamador se cancela, los demás siguen esperando la misma consulta
+        return await asyncio.shield(future)
+
+    async def check_today(self) -> List[Dict[str, Any]]:
+        # La fecha va en la clave para no mezclar llamadas de antes y después de medianoche
+        today = date.today()
+        return await self.read('get_dates_by_month_day', today.month, today.day, today.year)
+
+    async def get_dates_by_month_day(self, month: int, day: int, year: int = None) -> List[Dict[str, Any]]:
+        return await self.read('get_dates_by_month_day', month, day, year)
+
+    async def get_dates_for_table(self, table_name: str) -> List[Dict[str, Any]]:
+        return await self.read('get_dates_for_table', table_name)
+
+    async def get_upcoming_for_clients(self, reference_date: date = None,
+                                       horizon_days: int = 3) -> List[Dict[str, Any]]:
+        return await self.read('get_upcoming_for_clients', reference_date or date.today(), horizon_days)
+
+    async def get_next_unpaid(self, reference_date: date = None) -> Optional[Dict[str, Any]]:
+        return await self.read('get_next_unpaid', reference_date or date.today())
+
+    async def add_date(self, table_name: str, month: int, day: int, description: str = None,
+                       rif_digits: str = None) -> bool:
+        return await self.run('add_date', table_name, month, day, description, rif_digits)
+
+    async def record_payment(self, tax_date_id: int, year: int) -> bool:
+        return await self.run('record_payment', tax_date_id, year)
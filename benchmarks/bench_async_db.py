@@ -0,0 +1,79 @@
+"""Concurrent request throughput: one thread per request vs. AsyncDatabaseManager
+
+Uso:
+    python benchmarks/bench_async_db.py [--callers 200] [--rounds 5]
+
+Escenarios:
+- iguales: todos los llamadores piden los vencimientos de hoy
+- mezclados: cada llamador pide una de 12 fechas distintas
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+async def _naive(db, requests):
+    """Una llamada a DatabaseManager por petición en el pool por defecto de asyncio"""
+    return await asyncio.gather(*[
+        asyncio.to_thread(db.get_dates_by_month_day, *request) for request in requests
+    ])
+
+
+async def _facade(async_db, requests):
+    return await asyncio.gather(*[
+        async_db.get_dates_by_month_day(*request) for request in requests
+    ])
+
+
+def _measure(label, make_coroutine, callers, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        asyncio.run(make_coroutine())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<34}{best * 1000:>10.1f} ms{callers / best:>14,.0f} pet/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--callers', type=int, default=200, help="peticiones simultáneas")
+    parser.add_argument('--rounds', type=int, default=5, help="repeticiones (se reporta la mejor)")
+    args = parser.parse_args()
+
+    from async_db import AsyncDatabaseManager
+    from models import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'tax_reminder.db')}"
+        db = DatabaseManager(url, snapshot=False)
+        db.add_table('first_fortnight', 'Impuestos del 1-15 del mes')
+        db.bulk_add_dates({'table_name': 'first_fortnight', 'month': month, 'day': day}
+                          for month in range(1, 13) for day in range(1, 29))
+
+        today = date.today()
+        same = [(today.month, today.day, today.year)] * args.callers
+        mixed = [(month, 15, today.year) for month in range(1, 13)] * (args.callers // 12 + 1)
+        mixed = mixed[:args.callers]
+
+        async_db = AsyncDatabaseManager(url)
+        print(f"\n{'escenario':<34}{'mejor':>13}{'throughput':>17}")
+        for name, requests in (('iguales', same), ('mezclados', mixed)):
+            _measure(f"{name}: un hilo por petición", lambda: _naive(db, requests), args.callers, args.rounds)
+            queries_before = async_db.queries
+            _measure(f"{name}: AsyncDatabaseManager", lambda: _facade(async_db, requests), args.callers, args.rounds)
+            queries = (async_db.queries - queries_before) / args.rounds
+            print(f"{'':<34}consultas por ronda: {queries:.0f} de {args.callers}")
+        async_db.close()
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Cold-start time of mainshort: stdlib sqlite3 fast path vs. the SQLAlchemy path
+
+Uso:
+    python benchmarks/bench_cold_start.py [--runs 10]
+
+Cada medición lanza un intérprete nuevo, igual que abrir TaxRcorto. También
+muestra el tiempo de importación de los módulos de cada camino (-X importtime).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Camino anterior: modelos declarativos, engine y create_all antes de leer
+SQLALCHEMY_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+from models import DatabaseManager
+DatabaseManager({url!r}).get_deadline_index().upcoming()
+"""
+
+
+def _time_command(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=ROOT)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _import_time(module):
+    """Cumulative import time of a module in microseconds, from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        check=True, capture_output=True, text=True, cwd=ROOT
+    )
+    last = [line for line in result.stderr.splitlines() if line.rstrip().endswith(f' {module}')][-1]
+    return int(last.split('|')[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help="lanzamientos por escenario (se reporta la mediana)")
+    args = parser.parse_args()
+
+    from models import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tax_reminder.db')
+        db = DatabaseManager(f'sqlite:///{db_path}')
+        db.add_table('first_fortnight', 'Impuestos del 1-15 del mes')
+        for month in range(1, 13):
+            for day in (3, 10, 15):
+                db.add_date('first_fortnight', month, day)
+        db.engine.dispose()
+
+        scenarios = [
+            ('python vacío', [sys.executable, '-c', 'pass']),
+            ('mainshort (sqlite3)', [sys.executable, 'mainshort.py', '--db', db_path, '--no-pause']),
+            ('camino SQLAlchemy', [sys.executable, '-c',
+                                   SQLALCHEMY_SCRIPT.format(root=ROOT, url=f'sqlite:///{db_path}')]),
+        ]
+        print(f"\n{'escenario':<24}{'mediana (ms)':>14}")
+        for label, command in scenarios:
+            print(f"{label:<24}{_time_command(command, args.runs):>14.1f}")
+
+    print(f"\n{'importación':<24}{'tiempo (ms)':>14}")
+    for module in ('fast_reader', 'models'):
+        print(f"{module:<24}{_import_time(module) / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Per-operation latency of the old vs. pooled DatabaseManager session lifecycle
+
+Uso:
+    python benchmarks/bench_db_session.py [--ops 200]
+
+"before" reproduce el patrón anterior: un engine nuevo, create_all y pragmas por
+defecto en cada operación (como hacía gui_short.load_data). "after" usa un único
+DatabaseManager con el engine compartido, session_scope y los pragmas de WAL.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, DatabaseManager, TaxDate, TaxTable
+
+
+def _dates(ops):
+    """Yield (month, day) pairs valid in any year"""
+    for i in range(ops):
+        yield (i % 12) + 1, (i // 12) % 28 + 1
+
+
+def bench_before(db_url, ops):
+    """Old lifecycle: fresh engine and create_all for every operation"""
+    def run(month, day, write):
+        engine = create_engine(db_url)
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        try:
+            if write:
+                session.add(TaxDate(table_name='bench', month=month, day=day))
+                session.commit()
+            else:
+                session.query(TaxDate, TaxTable.description).join(
+                    TaxTable, TaxDate.table_name == TaxTable.name
+                ).filter(TaxDate.month == month, TaxDate.day == day).all()
+        finally:
+            session.close()
+            engine.dispose()
+
+    return _time_ops(run, ops)
+
+
+def bench_after(db_url, ops):
+    """New lifecycle: one process-wide engine, pooled connections and tuned pragmas"""
+    db = DatabaseManager(db_url)
+
+    def run(month, day, write):
+        if write:
+            db.add_date('bench', month, day)
+        else:
+            db.get_dates_by_month_day(month, day)
+
+    return _time_ops(run, ops)
+
+
+def _time_ops(run, ops):
+    results = {}
+    for label, write in (('write', True), ('read', False)):
+        start = time.perf_counter()
+        for month, day in _dates(ops):
+            run(month, day, write)
+        results[label] = (time.perf_counter() - start) / ops * 1000
+    return results
+
+
+def _prepare(path, pragmas=None):
+    # journal_mode=WAL queda guardado en el archivo, así que "before" se crea sin pragmas
+    db = DatabaseManager(f'sqlite:///{path}', pragmas)
+    db.add_table('bench', 'Benchmark')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ops', type=int, default=200, help='operaciones por escenario (máx. 336 fechas únicas)')
+    args = parser.parse_args()
+    ops = min(args.ops, 12 * 28)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = os.path.join(tmp, 'before.db')
+        after_path = os.path.join(tmp, 'after.db')
+        _prepare(before_path, pragmas={})
+        _prepare(after_path)
+
+        before = bench_before(f'sqlite:///{before_path}', ops)
+        after = bench_after(f'sqlite:///{after_path}', ops)
+
+    print(f"\n{'operación':<10}{'antes (ms)':>14}{'después (ms)':>16}{'mejora':>10}")
+    for label in ('write', 'read'):
+        speedup = before[label] / after[label] if after[label] else float('inf')
+        print(f"{label:<10}{before[label]:>14.3f}{after[label]:>16.3f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
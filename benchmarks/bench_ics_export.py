@@ -0,0 +1,68 @@
+"""Streaming .ics export: time and peak memory of a multi-year, multi-client feed
+
+Uso:
+    python benchmarks/bench_ics_export.py [--dates 120] [--clients 300] [--years 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dates', type=int, default=120, help="fechas de impuestos")
+    parser.add_argument('--clients', type=int, default=300, help="clientes")
+    parser.add_argument('--years', type=int, default=3, help="años a exportar")
+    args = parser.parse_args()
+
+    from ics_export import export_ics
+    from models import DatabaseManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'tax_reminder.db')}", snapshot=False)
+        db.add_table('bench', 'Impuestos de prueba')
+        db.bulk_add_dates({'table_name': 'bench', 'month': i % 12 + 1, 'day': i % 28 + 1,
+                           'description': f"Declaración {i}", 'rif_digits': str(i % 10) if i % 2 else None}
+                          for i in range(args.dates))
+        for i in range(args.clients):
+            db.add_client(f"J-{10000000 + i:08d}-{i % 10}", f"Cliente {i}")
+
+        start_year = date.today().year
+        end_year = start_year + args.years - 1
+        path = os.path.join(tmp, 'vencimientos.ics')
+
+        start = time.perf_counter()
+        export_ics(db, path, start_year, end_year, all_clients=True, force=True)
+        elapsed = time.perf_counter() - start
+
+        # Medición aparte: tracemalloc hace todo varias veces más lento
+        tracemalloc.start()
+        export_ics(db, path, start_year, end_year, all_clients=True, force=True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        with open(path, encoding='utf-8') as f:
+            events = sum(1 for line in f if line == 'BEGIN:VEVENT\n')
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        written = export_ics(db, path, start_year, end_year, all_clients=True)
+        unchanged = time.perf_counter() - start
+
+        print(f"eventos:              {events:>12,}")
+        print(f"archivo:              {size / 1e6:>12.1f} MB")
+        print(f"exportación:          {elapsed * 1000:>12.1f} ms")
+        print(f"pico de memoria:      {peak / 1e6:>12.1f} MB")
+        print(f"sin cambios:          {unchanged * 1000:>12.1f} ms ({'regenerado' if written else 'omitido'})")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Per-row memory of reminder representations when loading a million occurrences
+
+Uso:
+    python benchmarks/bench_reminder_memory.py [--occurrences 1000000] [--dates 10000]
+
+Lee las fechas de una base generada con generate_db y las expande a
+--occurrences vencimientos (una fila por fecha y año). Mide con tracemalloc:
+- filas: objetos TaxDate de la sesión ORM contra tuplas de una consulta Core
+- vencimientos: un dict por fila (como antes), Reminder con __slots__ y ReminderArray
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_db import generate  # noqa: E402  (mismo directorio)
+
+
+def _measure(label, build, rows):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34}{size / 1e6:>10.1f} MB{size / rows:>10.0f} B/fila{elapsed:>9.2f} s")
+    return result
+
+
+def _occurrences(rows, count):
+    """Yield (row, due_date) pairs, one per row and year, until count"""
+    produced = 0
+    year = date.today().year
+    while True:
+        for row in rows:
+            try:
+                due_date = date(year, row[3], row[4])
+            except ValueError:
+                continue
+            yield row, due_date
+            produced += 1
+            if produced == count:
+                return
+        year += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--occurrences', type=int, default=1_000_000, help="vencimientos a cargar")
+    parser.add_argument('--dates', type=int, default=10_000, help="fechas en la base generada")
+    args = parser.parse_args()
+
+    from sqlalchemy import select
+
+    from models import TaxDate, _REMINDER_COLUMNS, TaxTable
+    from reminder_records import Reminder, ReminderArray
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = generate(os.path.join(tmp, 'tax_reminder.db'), args.dates, 0)
+        query = select(*_REMINDER_COLUMNS).join_from(TaxDate, TaxTable, TaxDate.table_name == TaxTable.name)
+
+        print(f"\n{args.dates:,} fechas")
+        with db.get_db() as session:
+            _measure("objetos TaxDate (ORM)", lambda: session.query(TaxDate, TaxTable.description).join(
+                TaxTable, TaxDate.table_name == TaxTable.name).all(), args.dates)
+        with db.get_db() as session:
+            rows = _measure("tuplas Core", lambda: [tuple(row) for row in session.execute(query)], args.dates)
+
+        today = date.today()
+        print(f"\n{args.occurrences:,} vencimientos")
+        dicts = _measure("dict por fila", lambda: [{
+            'id': row[0], 'table': row[1], 'table_description': row[2], 'month': row[3], 'day': row[4],
+            'description': row[5], 'year': row[6], 'rif_digits': row[7],
+            'due_date': due_date, 'days_until': (due_date - today).days,
+        } for row, due_date in _occurrences(rows, args.occurrences)], args.occurrences)
+        del dicts
+        records = _measure("Reminder (__slots__)", lambda: [
+            Reminder.from_row(row, due_date=due_date, days_until=(due_date - today).days)
+            for row, due_date in _occurrences(rows, args.occurrences)
+        ], args.occurrences)
+        del records
+        _measure("ReminderArray", lambda: ReminderArray(
+            Reminder.from_row(row, due_date=due_date) for row, due_date in _occurrences(rows, args.occurrences)
+        ), args.occurrences)
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
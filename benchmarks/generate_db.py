@@ -0,0 +1,116 @@
+"""Synthetic tax_reminder.db generator for benchmarks
+
+Uso:
+    python benchmarks/generate_db.py salida.db [--dates 100000] [--clients 10000]
+
+Las fechas se reparten de forma determinista: cada tabla tiene una posición por
+día del año (incluido el 29 de febrero) en el calendario recurrente y en varios
+calendarios anuales; cuando una tabla se llena se crea la siguiente. Así la misma
+cantidad de fechas produce siempre la misma base de datos.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_TABLES = {
+    'first_fortnight': 'Impuestos del 1-15 del mes',
+    'second_fortnight': 'Impuestos del 16 a fin de mes',
+}
+# Días de un año bisiesto: cada (mes, día) posible
+_DAYS = [date(2000, 1, 1) + timedelta(days=n) for n in range(366)]
+_RIF_TYPES = 'VEJPG'
+
+
+def _year_slots(reference_year: int, count: int = 12):
+    """None (recurring) first, then the years closest to reference_year"""
+    slots = [None, reference_year]
+    offset = 1
+    while len(slots) < count:
+        slots.append(reference_year + offset)
+        slots.append(reference_year - offset)
+        offset += 1
+    return slots[:count]
+
+
+def table_names(dates: int, reference_year: int) -> Dict[str, str]:
+    """Tables needed for a number of dates: the two defaults plus bench_NNN"""
+    per_table = len(_DAYS) * len(_year_slots(reference_year))
+    tables = dict(DEFAULT_TABLES)
+    for n in range(max(0, -(-dates // per_table) - len(DEFAULT_TABLES))):
+        tables[f'bench_{n:03d}'] = f'Tabla de prueba {n:03d}'
+    return tables
+
+
+def iter_dates(dates: int, reference_year: int) -> Iterator[Dict[str, object]]:
+    """Yield bulk_add_dates rows for the synthetic calendar"""
+    names = list(table_names(dates, reference_year))
+    years = _year_slots(reference_year)
+    per_table = len(_DAYS) * len(years)
+    for i in range(dates):
+        table, slot = divmod(i, per_table)
+        year, day = divmod(slot, len(_DAYS))
+        yield {
+            'table_name': names[table],
+            'month': _DAYS[day].month,
+            'day': _DAYS[day].day,
+            'year': years[year],
+            'description': f"Declaración {i}" if i % 2 else None,
+            'rif_digits': str(i % 10) if i % 3 == 0 else None,
+        }
+
+
+def generate(path: str, dates: int, clients: int, reference_year: Optional[int] = None):
+    """Create (or replace) a database file with the requested number of dates and clients
+
+    Returns:
+        The DatabaseManager of the new file
+    """
+    from sqlalchemy import insert
+
+    from models import Client, DatabaseManager
+
+    reference_year = reference_year or date.today().year
+    for suffix in ('', '-wal', '-shm', '.snapshot.json'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+    db = DatabaseManager(f'sqlite:///{os.path.abspath(path)}', snapshot=False)
+    db.bulk_add_dates(iter_dates(dates, reference_year), tables=table_names(dates, reference_year),
+                      chunk_size=5000)
+    with db.session_scope() as session:
+        rows = []
+        for i in range(clients):
+            digit = str(i % 10)
+            rows.append({
+                'rif': f"{_RIF_TYPES[i % len(_RIF_TYPES)]}-{i:08d}-{digit}",
+                'name': f"Cliente {i:05d}",
+                'rif_digit': digit,
+            })
+        if rows:
+            session.execute(insert(Client), rows)
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help="archivo .db a crear (se reemplaza si existe)")
+    parser.add_argument('--dates', type=int, default=100_000, help="fechas de impuestos")
+    parser.add_argument('--clients', type=int, default=10_000, help="clientes")
+    parser.add_argument('--year', type=int, help="año de referencia (por defecto el actual)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    db = generate(args.output, args.dates, args.clients, args.year)
+    db.engine.dispose()
+    print(f"✅ {args.output}: {args.dates:,} fechas, {args.clients:,} clientes "
+          f"({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Load test of reminder_server: many polling clients with and without ETags
+
+Uso:
+    python benchmarks/load_test_server.py [--url http://127.0.0.1:8765] [--clients 200] [--requests 20]
+
+Sin --url levanta una instancia local sobre una base de datos temporal.
+"""
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ['/upcoming?days=3', '/upcoming?days=30', '/tables', '/dates']
+
+
+def _client(host, port, requests, use_etag, latencies, statuses, barrier):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    barrier.wait()
+    for i in range(requests):
+        path = PATHS[i % len(PATHS)]
+        headers = {'If-None-Match': etags[path]} if use_etag and path in etags else {}
+        start = time.perf_counter()
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses.append(response.status)
+        if response.getheader('ETag'):
+            etags[path] = response.getheader('ETag')
+    connection.close()
+
+
+def _run(host, port, clients, requests, use_etag):
+    latencies, statuses = [], []
+    barrier = threading.Barrier(clients + 1)
+    threads = [threading.Thread(target=_client, args=(host, port, requests, use_etag, latencies, statuses, barrier))
+               for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    label = 'con If-None-Match' if use_etag else 'sin ETag'
+    print(f"{label:<20}{len(latencies) / elapsed:>12,.0f} pet/s"
+          f"{statistics.median(latencies):>10.2f} ms{latencies[int(len(latencies) * 0.99) - 1]:>10.2f} ms"
+          f"{statuses.count(304):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help="instancia a probar (por defecto se levanta una local)")
+    parser.add_argument('--clients', type=int, default=200, help="clientes simultáneos")
+    parser.add_argument('--requests', type=int, default=20, help="peticiones por cliente")
+    args = parser.parse_args()
+
+    server = tmp = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from models import DatabaseManager
+        from reminder_server import make_server
+
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, 'tax_reminder.db')
+        db = DatabaseManager(f'sqlite:///{db_path}')
+        db.add_table('first_fortnight', 'Impuestos del 1-15 del mes')
+        db.add_table('second_fortnight', 'Impuestos del 16 a fin de mes')
+        db.bulk_add_dates({'table_name': 'first_fortnight' if day <= 15 else 'second_fortnight',
+                           'month': month, 'day': day}
+                          for month in range(1, 13) for day in range(1, 29))
+        for i in range(50):
+            db.add_client(f'J-{10000000 + i}-{i % 10}', f'Cliente {i}')
+
+        server = make_server(db_path, '127.0.0.1', 0)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print(f"\n{args.clients} clientes × {args.requests} peticiones contra http://{host}:{port}")
+    print(f"{'modo':<20}{'throughput':>16}{'mediana':>13}{'p99':>13}{'304':>8}")
+    for use_etag in (False, True):
+        _run(host, port, args.clients, args.requests, use_etag)
+
+    if server is not None:
+        cache = server.RequestHandlerClass.service.cache
+        print(f"\ncaché: {cache.hits} aciertos, {cache.misses} fallos")
+        server.shutdown()
+        server.server_close()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Benchmark suite over synthetic databases of increasing size, with JSON output
+
+Uso:
+    python benchmarks/run_benchmarks.py [--sizes 1000 10000 100000 1000000] [--clients 10000]
+                                        [--repeat 5] [--output resultados.json]
+                                        [--cache-dir dir] [--compare anterior.json] [--threshold 1.25]
+
+Por cada tamaño genera (o reutiliza, con --cache-dir) un tax_reminder.db con
+generate_db y mide:
+- DatabaseManager: check_today, get_upcoming, get_dates_by_month_day, get_dates_for_table
+- TaxReminderCLI: check_today y confirm_payment (respondiendo "n", sin escribir)
+- Interfaces Tk con una raíz oculta: carga y dibujo del resumen y de la página de
+  "Gestionar Fechas" de gui_main, y load_data de gui_short. Sin pantalla se
+  registran como omitidas.
+
+Con --compare se compara la mediana de cada caso con un resultado anterior y se
+termina con código 1 si alguno empeoró más que --threshold veces.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generate_db import generate  # noqa: E402  (mismo directorio)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    fn()  # Calentamiento: engine, cachés de SQLite e importaciones
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+@contextlib.contextmanager
+def _in_directory(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _quiet(fn: Callable[[], Any]) -> Callable[[], Any]:
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+def _database_cases(db_dir: str) -> Dict[str, Callable[[], Any]]:
+    from models import DatabaseManager
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        db = DatabaseManager(f"sqlite:///{os.path.join(db_dir, 'tax_reminder.db')}")
+    today = date.today()
+    return {
+        'DatabaseManager.check_today': db.check_today,
+        'DatabaseManager.get_upcoming': lambda: db.get_upcoming(today, 3),
+        'DatabaseManager.get_dates_by_month_day': lambda: db.get_dates_by_month_day(today.month, today.day, today.year),
+        'DatabaseManager.get_dates_for_table': lambda: db.get_dates_for_table('first_fortnight'),
+    }
+
+
+def _cli_cases(db_dir: str) -> Dict[str, Callable[[], Any]]:
+    from main import TaxReminderCLI
+
+    # TaxReminderCLI abre tax_reminder.db del directorio actual
+    with _in_directory(db_dir), contextlib.redirect_stdout(io.StringIO()):
+        cli = TaxReminderCLI()
+
+    def confirm_payment():
+        with mock.patch('builtins.input', return_value='n'):
+            cli.confirm_payment()
+
+    return {
+        'TaxReminderCLI.check_today': _quiet(cli.check_today),
+        'TaxReminderCLI.confirm_payment': _quiet(confirm_payment),
+    }
+
+
+def _gui_cases(db_dir: str, root) -> Dict[str, Callable[[], Any]]:
+    import gui_main
+    import gui_short
+
+    # Las interfaces buscan tax_reminder.db junto a su módulo
+    gui_main.base_dir = gui_short.base_dir = db_dir
+    with contextlib.redirect_stdout(io.StringIO()):
+        main_app = gui_main.TaxReminderMainGUI(root)
+        short_window = gui_short.tk.Toplevel(root)
+        short_app = gui_short.TaxReminderGUI(short_window)
+    # Los trabajos en segundo plano del arranque no deben medirse; la carga se mide síncrona
+    main_app.worker.shutdown()
+    today = date.today()
+
+    def dashboard():
+        main_app.render_dashboard(main_app.load_dashboard(today))
+        root.update_idletasks()
+
+    def manage_page():
+        main_app.apply_manage_page(main_app.load_manage_page(0))
+        root.update_idletasks()
+
+    def short_load():
+        short_app.load_data()
+        root.update_idletasks()
+
+    return {
+        'gui_main.refresh_dashboard': dashboard,
+        'gui_main.refresh_manage_list': manage_page,
+        'gui_short.load_data': short_load,
+    }
+
+
+def _tk_root():
+    """Hidden Tk root, or (None, reason) when there is no display"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        return None, f"Tk no disponible: {e}"
+    root.withdraw()
+    return root, None
+
+
+def run(sizes: List[int], clients: int, repeat: int, cache_dir: Optional[str]) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for dates in sizes:
+            db_dir = os.path.join(cache_dir or tmp, f'{dates}_{clients}_{date.today().year}')
+            db_path = os.path.join(db_dir, 'tax_reminder.db')
+            if not os.path.exists(db_path):
+                os.makedirs(db_dir, exist_ok=True)
+                print(f"⏳ Generando {dates:,} fechas y {clients:,} clientes...", flush=True)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate(db_path, dates, clients).engine.dispose()
+
+            cases = {}
+            cases.update(_database_cases(db_dir))
+            cases.update(_cli_cases(db_dir))
+
+            root, skipped = _tk_root()
+            if root is not None:
+                cases.update(_gui_cases(db_dir, root))
+
+            for name, fn in cases.items():
+                timing = _time(fn, repeat)
+                results.append({'dates': dates, 'clients': clients, 'case': name, **timing})
+                print(f"{dates:>10,}  {name:<42}{timing['median_ms']:>12.2f} ms", flush=True)
+
+            if root is not None:
+                root.destroy()
+            else:
+                for name in ('gui_main.refresh_dashboard', 'gui_main.refresh_manage_list', 'gui_short.load_data'):
+                    results.append({'dates': dates, 'clients': clients, 'case': name, 'skipped': skipped})
+                print(f"{dates:>10,}  interfaces Tk omitidas ({skipped})", flush=True)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], previous: List[Dict[str, Any]], threshold: float) -> int:
+    """Print the median ratio of every case against a previous run; return the regression count"""
+    before = {(r['dates'], r['clients'], r['case']): r for r in previous if 'median_ms' in r}
+    regressions = 0
+    print(f"\n{'fechas':>10}  {'caso':<42}{'antes':>12}{'ahora':>12}{'razón':>9}")
+    for result in results:
+        old = before.get((result['dates'], result['clients'], result['case']))
+        if old is None or 'median_ms' not in result:
+            continue
+        ratio = result['median_ms'] / old['median_ms'] if old['median_ms'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions += 1
+            flag = '  ⚠️ regresión'
+        print(f"{result['dates']:>10,}  {result['case']:<42}{old['median_ms']:>10.2f}ms"
+              f"{result['median_ms']:>10.2f}ms{ratio:>8.2f}x{flag}")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="cantidades de fechas")
+    parser.add_argument('--clients', type=int, default=10_000, help="clientes en cada base de datos")
+    parser.add_argument('--repeat', type=int, default=5, help="mediciones por caso")
+    parser.add_argument('--output', default='benchmark_results.json', help="archivo JSON de resultados")
+    parser.add_argument('--cache-dir', help="directorio donde guardar y reutilizar las bases generadas")
+    parser.add_argument('--compare', help="resultados anteriores (JSON) contra los que comparar")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="razón de la mediana a partir de la cual un caso cuenta como regresión")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.clients, args.repeat, args.cache_dir)
+    document = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados en {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)['results']
+        if compare(results, previous, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Calendario de días hábiles con feriados nacionales de Venezuela
+
+Los feriados se guardan en la tabla holidays (ver models.Holiday). Para cada año
+se precalcula un mapa de bits de días hábiles y sus sumas acumuladas, así
+"días hábiles hasta el vencimiento" y "siguiente día hábil" son O(1).
+"""
+from array import array
+from datetime import date, timedelta
+from typing import List, Any, Iterable, Mapping, Tuple
+
+from reminder_records import with_fields
+
+# Feriados nacionales de fecha fija (mes, día, nombre)
+FIXED_HOLIDAYS = [
+    (1, 1, 'Año Nuevo'),
+    (4, 19, 'Declaración de la Independencia'),
+    (5, 1, 'Día del Trabajador'),
+    (6, 24, 'Batalla de Carabobo'),
+    (7, 5, 'Día de la Independencia'),
+    (7, 24, 'Natalicio de Simón Bolívar'),
+    (10, 12, 'Día de la Resistencia Indígena'),
+    (12, 24, 'Víspera de Navidad'),
+    (12, 25, 'Navidad'),
+    (12, 31, 'Fin de Año'),
+]
+
+# Feriados móviles como desplazamiento en días desde el Domingo de Resurrección
+EASTER_HOLIDAYS = [
+    (-48, 'Lunes de Carnaval'),
+    (-47, 'Martes de Carnaval'),
+    (-3, 'Jueves Santo'),
+    (-2, 'Viernes Santo'),
+]
+
+# Lunes a viernes, igual que occurrences.DEFAULT_WEEKMASK
+WORKING_WEEKDAYS = frozenset(range(5))
+
+
+def easter_sunday(year: int) -> date:
+    """Date of Easter Sunday in the Gregorian calendar (anonymous algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def national_holidays(year: int) -> List[Tuple[date, str]]:
+    """Fixed and Easter-based national holidays of a year, ordered by date"""
+    holidays = [(date(year, month, day), name) for month, day, name in FIXED_HOLIDAYS]
+    easter = easter_sunday(year)
+    holidays.extend((easter + timedelta(days=offset), name) for offset, name in EASTER_HOLIDAYS)
+    return sorted(holidays)
+
+
+def window_years(reference_date: date, horizon_days: int) -> Tuple[int, int]:
+    """First and last year a calendar must cover to roll the deadlines of a window"""
+    # Un año antes por las fechas de fin de año que pasan a enero y uno después
+    # para el día hábil siguiente al final de la ventana
+    end = reference_date + timedelta(days=horizon_days)
+    return reference_date.year - 1, end.year + 1
+
+
+class BusinessCalendar:
+    """Business-day bitmap with prefix sums for a range of whole years
+
+    Args:
+        start_year: First year covered
+        end_year: Last year covered (inclusive)
+        holidays: Non-working dates; those outside the range are ignored
+    """
+
+    def __init__(self, start_year: int, end_year: int, holidays: Iterable[date] = ()):
+        self.start = date(start_year, 1, 1)
+        self.end = date(end_year, 12, 31)
+        holidays = set(holidays)
+
+        # Un byte por día: 1 = hábil. Se arma año por año y se concatena
+        bitmap = bytearray()
+        for year in range(start_year, end_year + 1):
+            first = date(year, 1, 1)
+            for offset in range((date(year + 1, 1, 1) - first).days):
+                day = first + timedelta(days=offset)
+                bitmap.append(day.weekday() in WORKING_WEEKDAYS and day not in holidays)
+        self._bitmap = bytes(bitmap)
+
+        # _prefix[i] = días hábiles antes del día i
+        self._prefix = array('l', [0])
+        for is_business in self._bitmap:
+            self._prefix.append(self._prefix[-1] + is_business)
+
+        # _next[i] = primer día hábil desde el día i (len(bitmap) si no hay otro en el rango)
+        size = len(self._bitmap)
+        self._next = array('l', [size]) * (size + 1)
+        for i in range(size - 1, -1, -1):
+            self._next[i] = i if self._bitmap[i] else self._next[i + 1]
+
+        # _previous[i] = último día hábil hasta el día i (-1 si no hay otro en el rango)
+        self._previous = array('l', [-1]) * size
+        last = -1
+        for i, is_business in enumerate(self._bitmap):
+            if is_business:
+                last = i
+            self._previous[i] = last
+
+        # Racha más larga de días no hábiles seguidos
+        self.max_gap = 0
+        run = 0
+        for is_business in self._bitmap:
+            run = 0 if is_business else run + 1
+            self.max_gap = max(self.max_gap, run)
+
+    def _index(self, day: date) -> int:
+        if not self.start <= day <= self.end:
+            raise ValueError(f"{day} está fuera del calendario {self.start.year}-{self.end.year}")
+        return (day - self.start).days
+
+    def covers(self, day: date) -> bool:
+        return self.start <= day <= self.end
+
+    def is_business_day(self, day: date) -> bool:
+        return bool(self._bitmap[self._index(day)])
+
+    def roll_forward(self, day: date) -> date:
+        """The day itself if it is a business day, otherwise the next business day"""
+        index = self._next[self._index(day)]
+        if index >= len(self._bitmap):
+            raise ValueError(f"No hay días hábiles después de {day} en el calendario")
+        return self.start + timedelta(days=index)
+
+    def next_business_day(self, day: date) -> date:
+        """First business day strictly after the given day"""
+        return self.roll_forward(day + timedelta(days=1))
+
+    def previous_business_day(self, day: date) -> date:
+        """Last business day strictly before the given day"""
+        index = self._previous[self._index(day - timedelta(days=1))]
+        if index < 0:
+            raise ValueError(f"No hay días hábiles antes de {day} en el calendario")
+        return self.start + timedelta(days=index)
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """Business days in (start, end]; negative when end is before start"""
+        return self._prefix[self._index(end) + 1] - self._prefix[self._index(start) + 1]
+
+    def annotate(self, reminder: Mapping[str, Any], reference_date: date) -> Mapping[str, Any]:
+        """Move a reminder's due_date to the next business day and add business-day counts
+
+        Returns a copy of the same type (Reminder or dict). The calendar date is
+        kept in 'nominal_date'; 'days_until' is recomputed from the actual due
+        date and 'business_days_until' is added.
+        """
+        nominal = reminder['due_date']
+        due_date = self.roll_forward(nominal)
+        return with_fields(reminder, nominal_date=nominal, due_date=due_date,
+                           days_until=(due_date - reference_date).days,
+                           business_days_until=self.business_days_between(reference_date, due_date))
+
+
+def calendar_from_holidays(start_year: int, end_year: int,
+                           holidays: Iterable[Tuple[date, bool]]) -> BusinessCalendar:
+    """Business calendar from stored (date, national) holidays, for readers that cannot write
+
+    Years whose national holidays were never stored get them computed, the
+    same ones DatabaseManager.ensure_national_holidays would store.
+    """
+    days = set()
+    national_years = set()
+    for day, national in holidays:
+        days.add(day)
+        if national:
+            national_years.add(day.year)
+    for year in range(start_year, end_year + 1):
+        if year not in national_years:
+            days.update(day for day, _ in national_holidays(year))
+    return BusinessCalendar(start_year, end_year, days)
@@ -1,22 +1,79 @@
+import argparse
+import glob
+import hashlib
 import os
 import shutil
+import sqlite3
 import sys
+from datetime import datetime
 
-def copy_db_to_dist():
+# Copias con fecha que se conservan en la carpeta backups
+DEFAULT_KEEP = 10
+# Páginas copiadas por paso de la API de respaldo; entre pasos otros procesos pueden escribir
+DEFAULT_PAGES = 256
+
+
+def _base_dir():
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def file_hash(path):
+    """SHA-256 of a file, or None if it does not exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def backup_database(source_db, dest_db, pages=DEFAULT_PAGES):
+    """
+    Copies a live database with the SQLite online backup API.
+    The copy is a consistent snapshot (including changes still in the WAL)
+    even while another process is writing. The copy uses a rollback
+    journal so it is a single self-contained file.
+    """
+    source = sqlite3.connect(source_db)
+    try:
+        dest = sqlite3.connect(dest_db)
+        try:
+            source.backup(dest, pages=pages)
+            # Sin WAL la copia es un solo archivo y quien la lea no crea -wal ni -shm
+            dest.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dest.close()
+    finally:
+        source.close()
+
+
+def rotate_backups(backup_dir, keep=DEFAULT_KEEP):
+    """Delete the oldest timestamped backups, keeping the newest `keep`"""
+    backups = sorted(glob.glob(os.path.join(backup_dir, 'tax_reminder-*.db')))
+    for path in backups[:max(len(backups) - keep, 0)]:
+        os.remove(path)
+
+
+def copy_db_to_dist(base_dir=None, keep=DEFAULT_KEEP, pages=DEFAULT_PAGES):
     """
     Copies the tax_reminder.db file from the project root to the dist folder.
     This ensures the executable has the latest version of the database.
+
+    The copy is taken with the online backup API into backups/ with a
+    timestamp; if its content hash matches dist/tax_reminder.db nothing is
+    replaced. Only the newest `keep` backups are kept.
     """
-    # Determine base directory
-    if getattr(sys, 'frozen', False):
-        base_dir = os.path.dirname(sys.executable)
-    else:
-        base_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = base_dir or _base_dir()
 
     # Define paths
     source_db = os.path.join(base_dir, 'tax_reminder.db')
     dist_dir = os.path.join(base_dir, 'dist')
     dest_db = os.path.join(dist_dir, 'tax_reminder.db')
+    backup_dir = os.path.join(base_dir, 'backups')
 
     # Check if source DB exists
     if not os.path.exists(source_db):
@@ -27,17 +84,45 @@ def copy_db_to_dist():
     if not os.path.exists(dist_dir):
         print(f"⚠️ 'dist' directory not found. Creating it at {dist_dir}...")
         os.makedirs(dist_dir)
+    os.makedirs(backup_dir, exist_ok=True)
 
+    backup_path = os.path.join(backup_dir, f"tax_reminder-{datetime.now():%Y%m%d-%H%M%S-%f}.db")
+    tmp_path = backup_path + '.tmp'
     try:
-        # Perform the copy
-        shutil.copy2(source_db, dest_db)
-        print(f"✅ Successfully copied database to: {dest_db}")
+        backup_database(source_db, tmp_path, pages)
+
+        # Mismo contenido que la copia de dist: no se reescribe ni se agrega un respaldo
+        if file_hash(tmp_path) == file_hash(dest_db):
+            os.remove(tmp_path)
+            print(f"✅ Database unchanged, nothing copied: {dest_db}")
+        else:
+            os.replace(tmp_path, backup_path)
+            rotate_backups(backup_dir, max(keep, 1))  # La copia recién hecha siempre se conserva
+            print(f"✅ Backup saved to: {backup_path}")
+
+            # Copiar a un temporal y reemplazar: quien lea dist nunca ve un archivo a medias
+            shutil.copyfile(backup_path, dest_db + '.tmp')
+            os.replace(dest_db + '.tmp', dest_db)
+            print(f"✅ Successfully copied database to: {dest_db}")
         return True
     except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         print(f"❌ Error copying database: {e}")
         return False
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Copiar tax_reminder.db a dist con respaldos rotativos")
+    parser.add_argument('--keep', type=int, default=DEFAULT_KEEP, help="respaldos con fecha que se conservan")
+    parser.add_argument('--pages', type=int, default=DEFAULT_PAGES, help="páginas por paso de la copia en línea")
+    parser.add_argument('--pause', action='store_true', help="esperar a que se presione Enter antes de salir")
+    args = parser.parse_args()
+
     print("🔄 Starting database copy process...")
-    copy_db_to_dist()
-    input("\nPress Enter to exit...")
+    ok = copy_db_to_dist(keep=args.keep, pages=args.pages)
+    if args.pause:
+        input("\nPress Enter to exit...")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
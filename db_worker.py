@@ -0,0 +1,131 @@
+"""Hilo de trabajo para las consultas de las interfaces Tk
+
+Tk no es seguro entre hilos: los trabajos (llamadas a DatabaseManager) corren en
+un hilo aparte y sus resultados vuelven al hilo de la interfaz con root.after,
+que revisa la cola de resultados cada ~16 ms (60 fps) solo mientras haya
+trabajos pendientes.
+"""
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Intervalo de revisión de resultados mientras hay trabajos pendientes (ms)
+DEFAULT_POLL_MS = 16
+
+
+class Job:
+    """A unit of work submitted to DBWorker; cancel() discards its result"""
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, on_done: Optional[Callable],
+                 on_error: Optional[Callable], key: Optional[str]):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self):
+        # Si aún está en la cola no se ejecuta; si ya corre, su resultado se descarta
+        self.cancelled = True
+
+
+class DBWorker:
+    """Runs database jobs on one background thread and delivers results on the Tk thread
+
+    Args:
+        root: Tk root used to schedule result delivery with after()
+        on_busy: Called on the Tk thread with True when work starts and False
+            when the last pending job finishes (e.g. to show a loading indicator)
+        poll_ms: Result polling interval while jobs are pending
+    """
+
+    def __init__(self, root, on_busy: Optional[Callable[[bool], None]] = None,
+                 poll_ms: int = DEFAULT_POLL_MS):
+        self.root = root
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+
+        self._jobs: queue.Queue = queue.Queue()
+        self._results: queue.Queue = queue.Queue()
+        self._latest: Dict[str, Job] = {}  # Último trabajo enviado por clave
+        self._pending = 0
+        self._polling = False
+
+        self._thread = threading.Thread(target=self._run, name='db-worker', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[str] = None, **kwargs) -> Job:
+        """Queue fn(*args, **kwargs); must be called from the Tk thread
+
+        Args:
+            on_done: Called on the Tk thread with the result
+            on_error: Called on the Tk thread with the exception
+            key: Jobs with the same key supersede each other: submitting a new
+                one cancels the previous one (e.g. repeated refreshes)
+        """
+        job = Job(fn, args, kwargs, on_done, on_error, key)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = job
+
+        self._pending += 1
+        if self._pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self._jobs.put(job)
+        self._schedule_poll()
+        return job
+
+    def shutdown(self):
+        """Stop the worker thread after the jobs already queued"""
+        self._jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if job.cancelled:
+                self._results.put((job, None, None))
+                continue
+            try:
+                result, error = job.fn(*job.args, **job.kwargs), None
+            except Exception as e:
+                result, error = None, e
+            self._results.put((job, result, error))
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                job, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if job.key is not None and self._latest.get(job.key) is job:
+                del self._latest[job.key]
+            if job.cancelled:
+                continue
+
+            if error is not None:
+                if job.on_error:
+                    job.on_error(error)
+                else:
+                    self.root.report_callback_exception(type(error), error, error.__traceback__)
+            elif job.on_done:
+                job.on_done(result)
+
+        if self._pending:
+            self._schedule_poll()
+        elif self.on_busy:
+            self.on_busy(False)
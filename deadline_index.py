@@ -0,0 +1,180 @@
+from bisect import bisect_left, bisect_right
+from array import array
+from calendar import isleap
+from datetime import date, timedelta
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from reminder_records import Reminder, ReminderArray
+
+# Año bisiesto de referencia para las claves: así el 29 de febrero tiene su propia posición
+_KEY_YEAR = 2000
+
+
+def day_of_year_key(month: int, day: int) -> int:
+    """Return the day-of-year key (1-366) of a month/day pair in a leap year"""
+    return date(_KEY_YEAR, month, day).timetuple().tm_yday
+
+
+def window_segments(reference_date: date, horizon_days: int) -> List[Tuple[int, date, date]]:
+    """Split a window of days into (year, first day, last day) segments
+
+    A window that crosses December 31st yields one segment per calendar year.
+    """
+    segments = []
+    if horizon_days <= 0:
+        return segments
+
+    end = reference_date + timedelta(days=horizon_days - 1)
+    segment_start = reference_date
+    while segment_start <= end:
+        segment_end = min(end, date(segment_start.year, 12, 31))
+        segments.append((segment_start.year, segment_start, segment_end))
+        segment_start = date(segment_start.year + 1, 1, 1)
+    return segments
+
+
+# Clave del 29 de febrero; solo existe en los años bisiestos
+_FEB_29_KEY = 60
+
+# Ventana completa en una sola consulta: un segmento (año, primera clave, última clave)
+# por año calendario tocado y un rango sobre el índice (doy, year) por segmento
+_WINDOW_QUERY = """
+    WITH segments(year, first_doy, last_doy, leap) AS (VALUES {segments})
+    SELECT d.id, d.table_name, t.description, d.month, d.day, d.description, d.year, d.rif_digits, s.year
+    FROM segments s
+    JOIN tax_dates d ON d.doy BETWEEN s.first_doy AND s.last_doy
+                    AND (d.year IS NULL OR d.year = s.year)
+                    AND (s.leap OR d.doy <> {feb_29})
+    JOIN tables t ON t.name = d.table_name
+    {unpaid}
+    ORDER BY s.year, d.doy, d.id
+"""
+_UNPAID_FILTER = "WHERE NOT EXISTS (SELECT 1 FROM payments p WHERE p.tax_date_id = d.id AND p.year = s.year)"
+
+
+def window_query(reference_date: date, horizon_days: int, include_paid: bool = True) -> Tuple[str, List[int]]:
+    """Build the single SQL statement that fetches every tax date due in a window
+
+    Uses the stored tax_dates.doy key (same as day_of_year_key); the Dec -> Jan
+    boundary becomes one segment per year and Feb 29 only matches leap years.
+
+    Returns:
+        (sql, parameters) for a sqlite3 cursor, or ('', []) for an empty window;
+        read the rows with window_rows
+    """
+    segments = window_segments(reference_date, horizon_days)
+    if not segments:
+        return '', []
+    params = []
+    for year, segment_start, segment_end in segments:
+        params += [year, day_of_year_key(segment_start.month, segment_start.day),
+                   day_of_year_key(segment_end.month, segment_end.day), int(isleap(year))]
+    sql = _WINDOW_QUERY.format(
+        segments=', '.join(['(?, ?, ?, ?)'] * len(segments)),
+        feb_29=_FEB_29_KEY,
+        unpaid='' if include_paid else _UNPAID_FILTER,
+    )
+    return sql, params
+
+
+def window_rows(rows: Iterable[tuple], reference_date: date) -> List[Reminder]:
+    """Convert the rows of window_query into Reminder records like DeadlineIndex.upcoming"""
+    results = []
+    for row in rows:
+        due_date = date(row[8], row[3], row[4])
+        results.append(Reminder(*row[:8], due_date=due_date, days_until=(due_date - reference_date).days))
+    return results
+
+
+def roll_to_business_days(reminders: Iterable[Reminder], reference_date: date,
+                          horizon_days: int, calendar) -> List[Reminder]:
+    """Move reminders to business days and keep the ones due inside the window
+
+    reminders must cover the window extended calendar.max_gap days back, since a
+    date from that far back can roll forward into the window.
+    """
+    window_end = reference_date + timedelta(days=horizon_days - 1)
+    results = []
+    for reminder in reminders:
+        reminder = calendar.annotate(reminder, reference_date)
+        if reference_date <= reminder['due_date'] <= window_end:
+            results.append(reminder)
+    results.sort(key=lambda r: r['due_date'])
+    return results
+
+
+class DeadlineIndex:
+    """In-memory index of tax dates sorted by day of year
+
+    Built once from the TaxDate/TaxTable join, it answers "everything due in
+    the next N days" with two bisect lookups per calendar year touched by the
+    window, instead of one query per day.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        keyed = []
+        for row in rows:
+            try:
+                keyed.append((day_of_year_key(row['month'], row['day']), row))
+            except ValueError:
+                # Fechas imposibles (e.g. 30 de febrero) nunca vencen
+                continue
+        keyed.sort(key=lambda item: item[0])
+
+        # Por columnas: con cientos de miles de fechas el índice ocupa una fracción de una lista de dicts
+        self._keys = array('H', (key for key, _ in keyed))
+        self._rows = ReminderArray(row for _, row in keyed)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Reminder]:
+        """Iterate over every row in day-of-year order"""
+        return iter(self._rows)
+
+    def upcoming(self, reference_date: Optional[date] = None, horizon_days: int = 3,
+                 calendar=None) -> List[Reminder]:
+        """Get every tax date due in the window starting at reference_date
+
+        Args:
+            reference_date: First day of the window (defaults to today)
+            horizon_days: Number of days in the window, including reference_date
+            calendar: Optional business_calendar.BusinessCalendar; deadlines on
+                non-working days then move to the next business day
+
+        Returns:
+            Reminder records ordered by due date, each one with the original
+            row plus 'due_date' and 'days_until' (and, with a calendar,
+            'nominal_date' and 'business_days_until')
+        """
+        if reference_date is None:
+            reference_date = date.today()
+        if calendar is not None:
+            return self._upcoming_business(reference_date, horizon_days, calendar)
+        results = []
+
+        # Recorrer la ventana por años para manejar el paso de diciembre a enero
+        for year, segment_start, segment_end in window_segments(reference_date, horizon_days):
+            lo = bisect_left(self._keys, day_of_year_key(segment_start.month, segment_start.day))
+            hi = bisect_right(self._keys, day_of_year_key(segment_end.month, segment_end.day))
+
+            for row in self._rows[lo:hi]:
+                if row.year is not None and row.year != year:
+                    continue  # Fecha de un calendario de otro año
+                try:
+                    due_date = date(year, row.month, row.day)
+                except ValueError:
+                    continue  # 29 de febrero en un año no bisiesto
+
+                # Cada lectura de ReminderArray crea un Reminder nuevo que nadie más tiene todavía
+                row.due_date = due_date
+                row.days_until = (due_date - reference_date).days
+                results.append(row)
+
+        return results
+
+    def _upcoming_business(self, reference_date: date, horizon_days: int, calendar) -> List[Reminder]:
+        # Una fecha de hace hasta max_gap días pudo pasar a un día hábil dentro de la ventana
+        lookback = calendar.max_gap
+        reminders = self.upcoming(reference_date - timedelta(days=lookback), horizon_days + lookback)
+        return roll_to_business_days(reminders, reference_date, horizon_days, calendar)
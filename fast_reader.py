@@ -0,0 +1,132 @@
+"""Lectura rápida de tax_reminder.db solo con sqlite3 de la biblioteca estándar
+
+Las vistas cortas solo leen el calendario, así que no necesitan SQLAlchemy ni
+los modelos declarativos. Si la base de datos no existe o su esquema es más
+viejo que el actual se lanza NeedsMigration y quien llama recurre a models.py.
+"""
+import os
+import sqlite3
+from datetime import date, timedelta
+from typing import List, Dict, Any, Tuple
+from urllib.parse import quote
+
+from business_calendar import BusinessCalendar, calendar_from_holidays, window_years
+from deadline_index import DeadlineIndex, roll_to_business_days, window_query, window_rows
+from reminder_records import Reminder, with_fields
+from migrations import SCHEMA_VERSION
+
+_DATES_QUERY = """
+    SELECT d.id, d.table_name, t.description, d.month, d.day, d.description, d.year, d.rif_digits
+    FROM tax_dates d JOIN tables t ON d.table_name = t.name
+"""
+_CLIENTS_QUERY = "SELECT id, rif, name, rif_digit FROM clients ORDER BY name"
+_HOLIDAYS_QUERY = "SELECT date, national FROM holidays WHERE date BETWEEN ? AND ?"
+
+
+class NeedsMigration(Exception):
+    """The database is missing or its schema has to be created or upgraded first"""
+
+
+def open_readonly(db_path: str) -> sqlite3.Connection:
+    """Open the database in read-only mode, checking that its schema is current"""
+    if not os.path.exists(db_path):
+        raise NeedsMigration(f"No existe la base de datos: {db_path}")
+
+    path = os.path.abspath(db_path).replace('\\', '/')
+    if not path.startswith('/'):
+        path = '/' + path  # Rutas de Windows: file:///C:/...
+    connection = sqlite3.connect(f"file://{quote(path)}?mode=ro", uri=True)
+
+    if connection.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        connection.close()
+        raise NeedsMigration(f"El esquema de {db_path} necesita actualizarse")
+    return connection
+
+
+def ensure_schema(db_path: str):
+    """Create or upgrade the database through models.py (imports SQLAlchemy)"""
+    from models import DatabaseManager
+    DatabaseManager(f'sqlite:///{db_path}')
+
+
+def read_deadline_index(connection: sqlite3.Connection) -> DeadlineIndex:
+    """Build the deadline index with the same rows as DatabaseManager.get_deadline_index"""
+    return DeadlineIndex(Reminder.from_row(row) for row in connection.execute(_DATES_QUERY))
+
+
+def read_clients(connection: sqlite3.Connection) -> List[Dict[str, Any]]:
+    """Get all clients ordered by name"""
+    return [{
+        'id': row[0],
+        'rif': row[1],
+        'name': row[2],
+        'rif_digit': row[3]
+    } for row in connection.execute(_CLIENTS_QUERY)]
+
+
+def read_business_calendar(connection: sqlite3.Connection, reference_date: date,
+                           horizon_days: int) -> BusinessCalendar:
+    """Business calendar of a window like DatabaseManager.get_calendar_for_window, without writing"""
+    start_year, end_year = window_years(reference_date, horizon_days)
+    rows = connection.execute(_HOLIDAYS_QUERY, (f'{start_year:04d}-01-01', f'{end_year:04d}-12-31'))
+    return calendar_from_holidays(start_year, end_year,
+                                  ((date.fromisoformat(day), bool(national)) for day, national in rows))
+
+
+def upcoming_for_clients(upcoming: List[Dict[str, Any]],
+                         clients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Match upcoming calendar dates to clients by RIF terminal digit
+
+    Same result as DatabaseManager.get_upcoming_for_clients, computed from an
+    already fetched window and client list.
+    """
+    clients_by_digit: Dict[str, List[Dict[str, Any]]] = {}
+    for client in clients:
+        clients_by_digit.setdefault(client['rif_digit'], []).append(client)
+
+    reminders = []
+    for reminder in upcoming:
+        # Sin terminales de RIF es una fecha propia de la firma, no de los clientes
+        digits = reminder.get('rif_digits') or ''
+        for digit in set(digits):
+            for client in clients_by_digit.get(digit, ()):
+                reminders.append(with_fields(reminder, client_id=client['id'], client_rif=client['rif'],
+                                             client_name=client['name']))
+
+    reminders.sort(key=lambda r: (r['due_date'], r['client_name'], r['table']))
+    return reminders
+
+
+def read_window(connection: sqlite3.Connection, reference_date: date,
+                horizon_days: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], BusinessCalendar]:
+    """Get the unpaid calendar and client reminders of the window and the calendar that rolled them
+
+    Deadlines on weekends or holidays move to the next business day, like
+    DatabaseManager.get_upcoming.
+    """
+    calendar = read_business_calendar(connection, reference_date, horizon_days)
+    # Una fecha de hace hasta max_gap días pudo pasar a un día hábil dentro de la ventana
+    lookback = calendar.max_gap
+    first_day = reference_date - timedelta(days=lookback)
+    sql, params = window_query(first_day, horizon_days + lookback, include_paid=False)
+    rows = window_rows(connection.execute(sql, params), reference_date) if sql else []
+    upcoming = roll_to_business_days(rows, reference_date, horizon_days, calendar)
+    return upcoming, upcoming_for_clients(upcoming, read_clients(connection)), calendar
+
+
+def read_upcoming(db_path: str, reference_date: date = None,
+                  horizon_days: int = 3) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Get the unpaid calendar and client reminders of the window, rolled to business days
+
+    Raises:
+        NeedsMigration: If the database has to be created or upgraded first
+    """
+    if reference_date is None:
+        reference_date = date.today()
+
+    connection = open_readonly(db_path)
+    try:
+        upcoming, client_reminders, _ = read_window(connection, reference_date, horizon_days)
+    finally:
+        connection.close()
+    return upcoming, client_reminders
@@ -22,7 +22,15 @@ else:
     base_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(base_dir)
 
-from models import DatabaseManager, TaxDate, TaxTable
+from db_worker import DBWorker
+from gui_widgets import CardPool, ScrollableFrame
+from instrumentation import timed
+from models import DatabaseManager, TaxDate, normalize_rif_digits
+
+# Días del resumen: hoy y los próximos 2 días
+UPCOMING_DAYS = 3
+# Filas por página en "Gestionar Fechas"; solo la página visible vive en el Treeview
+MANAGE_PAGE_SIZE = 500
 
 class TaxReminderMainGUI:
     def __init__(self, root):
@@ -35,6 +43,9 @@ class TaxReminderMainGUI:
         self.db_manager = DatabaseManager(self.db_url)
         
         self.setup_styles()
+        # Las consultas corren en un hilo aparte para no congelar la ventana
+        self.loading_bar = ttk.Progressbar(self.root, mode='indeterminate')
+        self.worker = DBWorker(self.root, on_busy=self.set_loading)
         self.create_widgets()
         
     def setup_styles(self):
@@ -148,6 +159,15 @@ class TaxReminderMainGUI:
         # Refresh data on tab change
         self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_change)
 
+    def set_loading(self, busy):
+        """Show an indeterminate progress bar while database jobs are pending"""
+        if busy:
+            self.loading_bar.pack(side='bottom', fill='x', padx=10, pady=(0, 10))
+            self.loading_bar.start(15)
+        else:
+            self.loading_bar.stop()
+            self.loading_bar.pack_forget()
+
     def on_tab_change(self, event):
         selected_tab = self.notebook.select()
         tab_text = self.notebook.tab(selected_tab, "text")
@@ -167,72 +187,64 @@ class TaxReminderMainGUI:
         ttk.Label(container, text="Resumen de Vencimientos", style='Header.TLabel').pack(anchor='w', pady=(0, 20))
         
         # Content Area
-        self.dashboard_content = ttk.Frame(container)
-        self.dashboard_content.pack(fill='both', expand=True)
+        self.dashboard_scroll = ScrollableFrame(container, background=self.colors['bg'])
+        self.dashboard_scroll.pack(fill='both', expand=True)
+        self.dashboard_content = self.dashboard_scroll.body
+        self.dashboard_cards = CardPool(self.dashboard_content)
         
         self.refresh_dashboard()
 
     def refresh_dashboard(self):
-        # Clear current content
-        for widget in self.dashboard_content.winfo_children():
-            widget.destroy()
-            
-        try:
-            today = date.today()
-            today_reminders = []
-            upcoming_reminders = []
-
-            # Logic same as gui_short.py / mainshort.py
-            for days_ahead in range(0, 3):
-                check_date = today + timedelta(days=days_ahead)
-                with self.db_manager.get_db() as session:
-                    results = session.query(TaxDate, TaxTable.description).join(
-                        TaxTable, TaxDate.table_name == TaxTable.name
-                    ).filter(
-                        TaxDate.month == check_date.month,
-                        TaxDate.day == check_date.day
-                    ).all()
-
-                    for date_obj, table_desc in results:
-                        current_year = today.year
-                        if date_obj.month < today.month or (date_obj.month == today.month and date_obj.day < today.day):
-                            current_year += 1
-                        
-                        reminder_date = date(current_year, date_obj.month, date_obj.day)
-                        days_until = (reminder_date - today).days
-
-                        reminder = {
-                            'table_description': table_desc,
-                            'month': date_obj.month,
-                            'day': date_obj.day,
-                            'description': date_obj.description,
-                            'days_until': days_until
-                        }
-
-                        if days_until == 0:
-                            today_reminders.append(reminder)
-                        elif days_until > 0:
-                            upcoming_reminders.append(reminder)
-
-            if not today_reminders and not upcoming_reminders:
-                ttk.Label(self.dashboard_content, 
-                        text="✅ No hay vencimientos pendientes para los próximos días.",
-                        style='TLabel').pack(pady=20)
-                return
-
-            if today_reminders:
-                ttk.Label(self.dashboard_content, text="🔔 HOY", style='SubHeaderToday.TLabel').pack(anchor='w', pady=(0, 10))
-                for reminder in today_reminders:
-                    self.create_dashboard_card(reminder, is_today=True)
-                ttk.Separator(self.dashboard_content, orient='horizontal').pack(fill='x', pady=15)
-
-            if upcoming_reminders:
-                ttk.Label(self.dashboard_content, text="🔔 PRÓXIMOS", style='SubHeaderUpcoming.TLabel').pack(anchor='w', pady=(0, 10))
-                for reminder in sorted(upcoming_reminders, key=lambda x: x['days_until']):
-                    self.create_dashboard_card(reminder, is_today=False)
-
-        except Exception as e:
-            ttk.Label(self.dashboard_content, text=f"Error al cargar datos: {e}", foreground='red').pack()
+        # Una actualización nueva cancela la anterior si aún no terminó
+        self.worker.submit(self.load_dashboard, date.today(), key='dashboard',
+                           on_done=self.render_dashboard,
+                           on_error=lambda e: self.dashboard_cards.render(
+                               [('message', f"Error al cargar datos: {e}", 'red')]))
+
+    @timed('gui_main.load_dashboard')
+    def load_dashboard(self, today):
+        """Fetch the dashboard reminders (runs on the worker thread, no Tk calls)"""
+        today_reminders = []
+        upcoming_reminders = []
+
+        for reminder in self.db_manager.get_upcoming(today, UPCOMING_DAYS):
+            if reminder['days_until'] == 0:
+                today_reminders.append(reminder)
+            else:
+                upcoming_reminders.append(reminder)
+        client_reminders = self.db_manager.get_upcoming_for_clients(today, UPCOMING_DAYS)
+        return today_reminders, upcoming_reminders, client_reminders
+
+    @timed('gui_main.render_dashboard')
+    def render_dashboard(self, reminders):
+        # Las tarjetas existentes se reutilizan; solo se crean u ocultan las que cambian
+        today_reminders, upcoming_reminders, client_reminders = reminders
+
+        items = []
+        if not today_reminders and not upcoming_reminders and not client_reminders:
+            items.append(('message', "✅ No hay vencimientos pendientes para los próximos días.", None))
+
+        if today_reminders:
+            items.append(('header', "🔔 HOY", 'SubHeaderToday.TLabel'))
+            for reminder in today_reminders:
+                items.append(self.dashboard_card_item(reminder, is_today=True))
+            items.append(('separator',))
+
+        if upcoming_reminders:
+            items.append(('header', "🔔 PRÓXIMOS", 'SubHeaderUpcoming.TLabel'))
+            for reminder in sorted(upcoming_reminders, key=lambda x: x['days_until']):
+                items.append(self.dashboard_card_item(reminder, is_today=False))
+
+        if client_reminders:
+            if today_reminders or upcoming_reminders:
+                items.append(('separator',))
+            items.append(('header', "👥 CLIENTES", 'SubHeaderUpcoming.TLabel'))
+            for reminder in client_reminders:
+                card = dict(reminder)
+                card['table_description'] = f"{reminder['client_name']} ({reminder['client_rif']}) · {reminder['table_description']}"
+                items.append(self.dashboard_card_item(card, is_today=reminder['days_until'] == 0))
+
+        self.dashboard_cards.render(items)
 
     def _format_table_name(self, name):
         if 'First_Fortnight' in name:
@@ -246,21 +258,22 @@ class TaxReminderMainGUI:
                   "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
         return months[month_number - 1] if 1 <= month_number <= 12 else ""
 
-    def create_dashboard_card(self, reminder, is_today):
-        card = ttk.Frame(self.dashboard_content, style='Card.TFrame', padding="10")
-        card.pack(fill='x', pady=(0, 10))
-        
+    def dashboard_card_item(self, reminder, is_today):
+        """Card item for CardPool.render"""
         desc = self._format_table_name(reminder['table_description'])
-        ttk.Label(card, text=f"• {desc}", style='CardText.TLabel', font=('Segoe UI', 10, 'bold')).pack(anchor='w')
         
         month_name = self._get_month_name(reminder['month'])
         days_text = ""
         if not is_today:
              days_text = f" (mañana)" if reminder['days_until'] == 1 else f" (en {reminder['days_until']} días)"
+             if 'business_days_until' in reminder:
+                 days_text += f" · {reminder['business_days_until']} hábil(es)"
         
-        ttk.Label(card, text=f"📅 {reminder['day']} de {month_name}{days_text}", style='CardText.TLabel').pack(anchor='w')
-        if reminder.get('description'):
-            ttk.Label(card, text=f"📝 {reminder['description']}", style='CardDesc.TLabel').pack(anchor='w', pady=(5, 0))
+        note = None
+        if reminder.get('nominal_date') not in (None, reminder.get('due_date')):
+            note = f"➡️ Día no hábil, vence el {reminder['due_date']:%d/%m/%Y}"
+        description = f"📝 {reminder['description']}" if reminder.get('description') else None
+        return ('card', f"• {desc}", f"📅 {reminder['day']} de {month_name}{days_text}", note, description)
 
     # ================= MANAGE TAB =================
 
@@ -284,7 +297,7 @@ class TaxReminderMainGUI:
         sb.pack(side='right', fill='y')
         
         self.tree = ttk.Treeview(tree_frame, 
-                               columns=('id', 'table', 'date', 'desc'), 
+                               columns=('id', 'table', 'date', 'year', 'desc'), 
                                show='headings',
                                yscrollcommand=sb.set,
                                selectmode='browse')
@@ -292,48 +305,92 @@ class TaxReminderMainGUI:
         self.tree.heading('id', text='ID') # Hidden column
         self.tree.heading('table', text='Tabla/Categoría')
         self.tree.heading('date', text='Fecha')
+        self.tree.heading('year', text='Año')
         self.tree.heading('desc', text='Descripción')
         
         self.tree.column('id', width=0, stretch=False) # Hide ID
         self.tree.column('table', width=200)
         self.tree.column('date', width=150)
+        self.tree.column('year', width=80)
         self.tree.column('desc', width=300)
         
         self.tree.pack(side='left', fill='both', expand=True)
         sb.config(command=self.tree.yview)
+        
+        # Paginación
+        pager = ttk.Frame(container)
+        pager.pack(fill='x', pady=(10, 0))
+        self.prev_page_button = ttk.Button(pager, text="◀", width=3, command=lambda: self.change_manage_page(-1))
+        self.prev_page_button.pack(side='left')
+        self.page_label = ttk.Label(pager, text="", style='TLabel')
+        self.page_label.pack(side='left', padx=10)
+        self.next_page_button = ttk.Button(pager, text="▶", width=3, command=lambda: self.change_manage_page(1))
+        self.next_page_button.pack(side='left')
+        
+        self.manage_page = 0
+        self.manage_rows = {}  # iid (id de la fecha) -> valores mostrados en el Treeview
+
+    def change_manage_page(self, step):
+        self.manage_page = max(0, self.manage_page + step)
+        self.refresh_manage_list()
 
     def refresh_manage_list(self):
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        try:
-            with self.db_manager.get_db() as session:
-                results = session.query(TaxDate, TaxTable.description).join(
-                    TaxTable, TaxDate.table_name == TaxTable.name
-                ).order_by(TaxDate.table_name, TaxDate.month, TaxDate.day).all()
-                
-                for date_obj, table_desc in results:
-                    month_name = self._get_month_name(date_obj.month)
-                    date_str = f"{date_obj.day} de {month_name}"
-                    table_str = self._format_table_name(table_desc)
-                    
-                    self.tree.insert('', 'end', values=(
-                        date_obj.id,
-                        table_str,
-                        date_str,
-                        date_obj.description or ""
-                    ))
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar lista: {e}")
+        self.worker.submit(self.load_manage_page, self.manage_page, key='manage',
+                           on_done=self.apply_manage_page,
+                           on_error=lambda e: messagebox.showerror("Error", f"Error al cargar lista: {e}"))
+
+    @timed('gui_main.load_manage_page')
+    def load_manage_page(self, page):
+        """Fetch one page of dates (runs on the worker thread, no Tk calls)"""
+        rows, total = self.db_manager.get_dates_page(page * MANAGE_PAGE_SIZE, MANAGE_PAGE_SIZE)
+        pages = max(1, -(-total // MANAGE_PAGE_SIZE))
+        if page >= pages:
+            # La página actual quedó vacía (e.g. tras eliminar su última fila)
+            page = pages - 1
+            rows, total = self.db_manager.get_dates_page(page * MANAGE_PAGE_SIZE, MANAGE_PAGE_SIZE)
+        return rows, total, page, pages
+
+    @timed('gui_main.apply_manage_page')
+    def apply_manage_page(self, result):
+        """Bring the visible page up to date touching only the rows that changed"""
+        rows, total, self.manage_page, pages = result
+        
+        wanted = {}
+        for row in rows:
+            month_name = self._get_month_name(row['month'])
+            wanted[str(row['id'])] = (
+                row['id'],
+                self._format_table_name(row['table_description']),
+                f"{row['day']} de {month_name}",
+                row['year'] or "Todos",  # Sin año: se repite cada año
+                row['description'] or ""
+            )
+        
+        # Diferencia contra lo que ya muestra el Treeview: borrar, actualizar e insertar
+        stale = [iid for iid in self.manage_rows if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+        for iid, values in wanted.items():
+            current = self.manage_rows.get(iid)
+            if current is None:
+                self.tree.insert('', 'end', iid=iid, values=values)
+            elif current != values:
+                self.tree.item(iid, values=values)
+        
+        # Reordenar en una sola llamada solo si cambió el orden (e.g. se editó el mes)
+        order = list(wanted)
+        if list(self.tree.get_children()) != order:
+            self.tree.set_children('', *order)
+        self.manage_rows = wanted
+        
+        self.page_label.config(text=f"Página {self.manage_page + 1} de {pages} · {total} fechas")
+        self.prev_page_button.state(['!disabled'] if self.manage_page > 0 else ['disabled'])
+        self.next_page_button.state(['!disabled'] if self.manage_page < pages - 1 else ['disabled'])
 
     def add_date_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Agregar Fecha")
-        dialog.geometry("400x450")
-        dialog.configure(bg=self.colors['bg'])
-        
-        self.create_date_form(dialog)
+        self.worker.submit(self.load_date_form, None, key='date_form',
+                           on_done=lambda result: self.open_date_dialog("Agregar Fecha", *result),
+                           on_error=lambda e: messagebox.showerror("Error", str(e)))
 
     def edit_date_dialog(self):
         selection = self.tree.selection()
@@ -341,46 +398,62 @@ class TaxReminderMainGUI:
             messagebox.showwarning("Aviso", "Por favor selecciona un elemento para editar.")
             return
             
-        item = self.tree.item(selection[0])
-        date_id = item['values'][0]
+        date_id = int(selection[0])
         
+        def loaded(result):
+            tables, existing_date = result
+            if existing_date is None:
+                messagebox.showerror("Error", "No se encontró el registro.")
+                return
+            self.open_date_dialog("Editar Fecha", tables, existing_date)
+        
+        self.worker.submit(self.load_date_form, date_id, key='date_form', on_done=loaded,
+                           on_error=lambda e: messagebox.showerror("Error", str(e)))
+
+    @timed('gui_main.load_date_form')
+    def load_date_form(self, date_id):
+        """Fetch the tables and, when editing, the date itself (runs on the worker thread)"""
+        tables = self.db_manager.get_tables()
+        if date_id is None:
+            return tables, None
+        with self.db_manager.get_db() as session:
+            row = session.query(
+                TaxDate.id, TaxDate.table_name, TaxDate.month, TaxDate.day, TaxDate.description,
+                TaxDate.rif_digits
+            ).filter(TaxDate.id == date_id).first()
+        return tables, row._asdict() if row else None
+
+    def open_date_dialog(self, title, tables, existing_date=None):
         dialog = tk.Toplevel(self.root)
-        dialog.title("Editar Fecha")
-        dialog.geometry("400x450")
+        dialog.title(title)
+        dialog.geometry("400x520")
         dialog.configure(bg=self.colors['bg'])
         
-        # Pre-load Data
-        with self.db_manager.get_db() as session:
-            date_obj = session.query(TaxDate).filter(TaxDate.id == date_id).first()
-            if date_obj:
-                self.create_date_form(dialog, date_obj)
-            else:
-                messagebox.showerror("Error", "No se encontró el registro.")
-                dialog.destroy()
+        self.create_date_form(dialog, tables, existing_date)
 
-    def create_date_form(self, window, existing_date=None):
-        # We need data for combo boxes
-        with self.db_manager.get_db() as session:
-            tables = session.query(TaxTable).all()
-            table_options = {t.description: t.name for t in tables}
-            table_names_display = list(table_options.keys())
+    def create_date_form(self, window, tables, existing_date=None):
+        # Opciones de los combos, ya leídas en el hilo de trabajo
+        table_options = {t['description']: t['name'] for t in tables}
+        table_names_display = list(table_options.keys())
         
         # Variables
         table_var = tk.StringVar(value=table_names_display[0] if table_names_display else "")
         month_var = tk.IntVar(value=1)
         day_var = tk.IntVar(value=1)
         desc_var = tk.StringVar()
+        digits_var = tk.StringVar()
         
         # Pre-fill if editing
         if existing_date:
             # Find display name for table name
             for desc, name in table_options.items():
-                if name == existing_date.table_name:
+                if name == existing_date['table_name']:
                     table_var.set(desc)
                     break
-            month_var.set(existing_date.month)
-            day_var.set(existing_date.day)
-            desc_var.set(existing_date.description or "")
+            month_var.set(existing_date['month'])
+            day_var.set(existing_date['day'])
+            desc_var.set(existing_date['description'] or "")
+            digits_var.set(existing_date['rif_digits'] or "")
         
         # Form Layout
         form = ttk.Frame(window, padding="20")
@@ -402,6 +475,10 @@ class TaxReminderMainGUI:
         day_spin = ttk.Spinbox(form, from_=1, to=31, textvariable=day_var)
         day_spin.pack(fill='x', pady=(0, 15))
         
+        ttk.Label(form, text="Terminales de RIF, e.g. 05 (opcional, vacío = fecha propia):",
+                  style='TLabel').pack(anchor='w', pady=(0, 5))
+        ttk.Entry(form, textvariable=digits_var).pack(fill='x', pady=(0, 15))
+        
         ttk.Label(form, text="Descripción (opcional):", style='TLabel').pack(anchor='w', pady=(0, 5))
         ttk.Entry(form, textvariable=desc_var).pack(fill='x', pady=(0, 20))
         
@@ -419,37 +496,70 @@ class TaxReminderMainGUI:
                 except ValueError:
                     messagebox.showerror("Error", "Fecha inválida (e.g. 30 de Febrero)")
                     return
+                try:
+                    rif_digits = normalize_rif_digits(digits_var.get())
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e).capitalize())
+                    return
+
+                def saved(ok):
+                    if not ok:
+                        save_button.state(['!disabled'])
+                        messagebox.showerror("Error", "Ya existe una fecha para ese día en esa tabla.")
+                        return
+                    messagebox.showinfo("Éxito", "Guardado correctamente")
+                    window.destroy()
+                    self.refresh_manage_list()
+
+                def failed(error):
+                    save_button.state(['!disabled'])
+                    messagebox.showerror("Error", str(error))
 
-                with self.db_manager.get_db() as session:
-                    # Check duplicates unless simple edit
-                    if not existing_date:
-                        exists = session.query(TaxDate).filter_by(
-                            table_name=table_name, month=month_idx, day=day
-                        ).first()
-                        if exists:
-                            messagebox.showerror("Error", "Ya existe una fecha para ese día en esa tabla.")
-                            return
-                        
-                        new_date = TaxDate(table_name=table_name, month=month_idx, day=day, description=description)
-                        session.add(new_date)
-                    else:
-                        # Re-query to attach to this session
-                        current = session.query(TaxDate).get(existing_date.id)
-                        current.table_name = table_name
-                        current.month = month_idx
-                        current.day = day
-                        current.description = description
-                    
-                    session.commit()
-                    
-                messagebox.showinfo("Éxito", "Guardado correctamente")
-                window.destroy()
-                self.refresh_manage_list()
+                save_button.state(['disabled'])  # Evitar guardar dos veces mientras corre
+                self.worker.submit(
+                    self.save_date, existing_date['id'] if existing_date else None,
+                    table_name, month_idx, day, description, rif_digits,
+                    on_done=saved, on_error=failed
+                )
                 
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
-        ttk.Button(form, text="💾 Guardar", command=save).pack(fill='x')
+        save_button = ttk.Button(form, text="💾 Guardar", command=save)
+        save_button.pack(fill='x')
+
+    @timed('gui_main.save_date')
+    def save_date(self, date_id, table_name, month, day, description, rif_digits=None):
+        """Insert or update a tax date (runs on the worker thread); False on duplicates"""
+        with self.db_manager.session_scope() as session:
+            # Las fechas nuevas se repiten cada año; al editar se conserva el año de la fecha
+            current = session.get(TaxDate, date_id) if date_id is not None else None
+            if date_id is not None and current is None:
+                raise ValueError("No se encontró el registro.")
+            year = current.year if current is not None else None
+            
+            # Misma regla que el índice único (table_name, coalesce(year, 0), month, day)
+            duplicate = session.query(TaxDate.id).filter(
+                TaxDate.table_name == table_name,
+                TaxDate.month == month,
+                TaxDate.day == day,
+                TaxDate.year.is_(None) if year is None else TaxDate.year == year
+            )
+            if date_id is not None:
+                duplicate = duplicate.filter(TaxDate.id != date_id)
+            if duplicate.first():
+                return False
+            
+            if current is None:
+                session.add(TaxDate(table_name=table_name, month=month, day=day,
+                                    rif_digits=rif_digits, description=description))
+            else:
+                current.table_name = table_name
+                current.month = month
+                current.day = day
+                current.description = description
+                current.rif_digits = rif_digits
+        return True
 
     def delete_date_dialog(self):
         selection = self.tree.selection()
@@ -458,17 +568,17 @@ class TaxReminderMainGUI:
             return
             
         if messagebox.askyesno("Confirmar", "¿Estás seguro de que deseas eliminar esta fecha?"):
-            item = self.tree.item(selection[0])
-            date_id = item['values'][0]
+            date_id = int(selection[0])
             
-            try:
-                if self.db_manager.delete_date(date_id):
+            def deleted(ok):
+                if ok:
                     self.refresh_manage_list()
                     messagebox.showinfo("Éxito", "Eliminado correctamente")
                 else:
                     messagebox.showerror("Error", "No se pudo eliminar.")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            
+            self.worker.submit(self.db_manager.delete_date, date_id, on_done=deleted,
+                               on_error=lambda e: messagebox.showerror("Error", str(e)))
 
     # ================= TOOLS TAB =================
 
@@ -491,28 +601,36 @@ class TaxReminderMainGUI:
 
     def clean_database_action(self):
         if messagebox.askyesno("PELIGRO", "⚠️ ¿Estás seguro? Esto eliminará TODOS los datos y no se puede deshacer."):
-            if self.db_manager.clean_database():
-                # Re-init default tables
-                cli_app = TaxReminderMainGUI(self.root) # Hacky way to re-trigger default table creation logic if it was in init
-                # Actually, models.py clean_database re-calls create_tables, but we need default rows
-                # Let's manually re-add defaults similar to main.py
-                default_tables = [
-                    ('first_fortnight', 'Impuestos del 1-15 del mes'),
-                    ('second_fortnight', 'Impuestos del 16 a fin de mes')
-                ]
-                for name, desc in default_tables:
-                    self.db_manager.add_table(name, desc)
-                    
-                messagebox.showinfo("Éxito", "Base de datos reiniciada.")
-                self.refresh_dashboard()
-                self.refresh_manage_list()
-            else:
-                messagebox.showerror("Error", "Falló la limpieza de la base de datos.")
+            def cleaned(ok):
+                if ok:
+                    messagebox.showinfo("Éxito", "Base de datos reiniciada.")
+                    self.refresh_dashboard()
+                    self.refresh_manage_list()
+                else:
+                    messagebox.showerror("Error", "Falló la limpieza de la base de datos.")
+            
+            self.worker.submit(self.reset_database, on_done=cleaned,
+                               on_error=lambda e: messagebox.showerror("Error", str(e)))
+
+    def reset_database(self):
+        """Remove all data and re-add the default tables (runs on the worker thread)"""
+        if not self.db_manager.clean_database():
+            return False
+        # models.py clean_database re-calls create_tables, but we need default rows
+        # Let's manually re-add defaults similar to main.py
+        default_tables = [
+            ('first_fortnight', 'Impuestos del 1-15 del mes'),
+            ('second_fortnight', 'Impuestos del 16 a fin de mes')
+        ]
+        for name, desc in default_tables:
+            self.db_manager.add_table(name, desc)
+        return True
 
 def main():
     root = tk.Tk()
     app = TaxReminderMainGUI(root)
     root.mainloop()
+    app.worker.shutdown()
 
 if __name__ == "__main__":
     main()
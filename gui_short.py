@@ -18,7 +18,7 @@ if sys.platform == 'win32':
 
 import tkinter as tk
 from tkinter import ttk
-from datetime import date, timedelta
+from datetime import date
 from typing import List, Dict, Any
 
 # Add project root to path to import models
@@ -29,7 +29,13 @@ else:
     
 sys.path.append(base_dir)
 
-from models import DatabaseManager, TaxDate, TaxTable
+from fast_reader import NeedsMigration, ensure_schema
+from gui_widgets import CardPool, ScrollableFrame
+from instrumentation import enable_from_environment, timed
+from reminder_snapshot import read_upcoming_cached
+
+# Días mostrados: hoy y los próximos 2 días
+UPCOMING_DAYS = 3
 
 class TaxReminderGUI:
     def __init__(self, root):
@@ -39,7 +45,6 @@ class TaxReminderGUI:
         
         # Determine DB path
         self.db_path = os.path.join(base_dir, 'tax_reminder.db')
-        self.db_url = f'sqlite:///{self.db_path}'
         
         self.setup_styles()
         self.create_widgets()
@@ -126,49 +131,31 @@ class TaxReminderGUI:
         # Separator
         ttk.Separator(self.main_container, orient='horizontal').pack(fill='x', pady=(0, 20))
         
-        # Content Area (Scrollable could be added here if needed, but keeping it simple for short view)
-        self.content_frame = ttk.Frame(self.main_container)
-        self.content_frame.pack(fill='both', expand=True)
+        # Content Area
+        self.content_scroll = ScrollableFrame(self.main_container, background=self.colors['bg'])
+        self.content_scroll.pack(fill='both', expand=True)
+        self.content_frame = self.content_scroll.body
+        self.cards = CardPool(self.content_frame)
 
+    @timed('gui_short.load_data')
     def load_data(self):
         try:
-            db = DatabaseManager(self.db_url)
             today = date.today()
             today_reminders = []
             upcoming_reminders = []
 
-            # Logic adapted from mainshort.py
-            for days_ahead in range(0, 3):
-                check_date = today + timedelta(days=days_ahead)
-                with db.get_db() as session:
-                    results = session.query(TaxDate, TaxTable.description).join(
-                        TaxTable, TaxDate.table_name == TaxTable.name
-                    ).filter(
-                        TaxDate.month == check_date.month,
-                        TaxDate.day == check_date.day
-                    ).all()
-
-                    for date_obj, table_desc in results:
-                        # Calculate current year logic
-                        current_year = today.year
-                        if date_obj.month < today.month or (date_obj.month == today.month and date_obj.day < today.day):
-                            current_year += 1
-                        
-                        reminder_date = date(current_year, date_obj.month, date_obj.day)
-                        days_until = (reminder_date - today).days
-
-                        reminder = {
-                            'table_description': table_desc,
-                            'month': date_obj.month,
-                            'day': date_obj.day,
-                            'description': date_obj.description,
-                            'days_until': days_until
-                        }
-
-                        if days_until == 0:
-                            today_reminders.append(reminder)
-                        elif days_until > 0:
-                            upcoming_reminders.append(reminder)
+            # Normalmente sale de la instantánea sin abrir la base de datos
+            try:
+                calendar_reminders, _ = read_upcoming_cached(self.db_path, today, UPCOMING_DAYS)
+            except NeedsMigration:
+                ensure_schema(self.db_path)
+                calendar_reminders, _ = read_upcoming_cached(self.db_path, today, UPCOMING_DAYS)
+
+            for reminder in calendar_reminders:
+                if reminder['days_until'] == 0:
+                    today_reminders.append(reminder)
+                else:
+                    upcoming_reminders.append(reminder)
 
             self.display_reminders(today_reminders, upcoming_reminders)
 
@@ -188,37 +175,30 @@ class TaxReminderGUI:
         return months[month_number - 1] if 1 <= month_number <= 12 else ""
 
     def display_reminders(self, today_reminders, upcoming_reminders):
-        # Clear previous content if any (not strictly needed here as we run once)
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-
+        # Reutiliza las tarjetas ya creadas si se vuelve a llamar
+        items = []
         if not today_reminders and not upcoming_reminders:
-            no_data = ttk.Label(self.content_frame, 
-                              text="✅ No hay vencimientos para hoy ni para los próximos 2 días.",
-                              style='TLabel')
-            no_data.pack(pady=20)
-            return
+            items.append(('message', "✅ No hay vencimientos para hoy ni para los próximos 2 días.", None))
 
         # Today's Reminders
         if today_reminders:
-            ttk.Label(self.content_frame, text="🔔 ¡VENCIMIENTOS PARA HOY!", style='SubHeaderToday.TLabel').pack(anchor='w', pady=(0, 10))
+            items.append(('header', "🔔 ¡VENCIMIENTOS PARA HOY!", 'SubHeaderToday.TLabel'))
             for reminder in today_reminders:
-                self.create_reminder_card(reminder, is_today=True)
-            ttk.Separator(self.content_frame, orient='horizontal').pack(fill='x', pady=20)
+                items.append(self.reminder_card_item(reminder, is_today=True))
+            items.append(('separator',))
 
         # Upcoming Reminders
         if upcoming_reminders:
-            ttk.Label(self.content_frame, text="🔔 PRÓXIMOS VENCIMIENTOS", style='SubHeaderUpcoming.TLabel').pack(anchor='w', pady=(0, 10))
+            items.append(('header', "🔔 PRÓXIMOS VENCIMIENTOS", 'SubHeaderUpcoming.TLabel'))
             for reminder in sorted(upcoming_reminders, key=lambda x: x['days_until']):
-                self.create_reminder_card(reminder, is_today=False)
+                items.append(self.reminder_card_item(reminder, is_today=False))
 
-    def create_reminder_card(self, reminder, is_today):
-        card = ttk.Frame(self.content_frame, style='Card.TFrame', padding="10")
-        card.pack(fill='x', pady=(0, 10))
-        
+        self.cards.render(items)
+
+    def reminder_card_item(self, reminder, is_today):
+        """Card item for CardPool.render"""
         # Title/Table Name
         desc = self._format_table_name(reminder['table_description'])
-        ttk.Label(card, text=f"• {desc}", style='CardText.TLabel', font=('Segoe UI', 10, 'bold')).pack(anchor='w')
         
         # Date and Time Info
         month_name = self._get_month_name(reminder['month'])
@@ -227,17 +207,21 @@ class TaxReminderGUI:
              days_text = f" (mañana)" if reminder['days_until'] == 1 else f" (en {reminder['days_until']} días)"
         
         date_text = f"📅 {reminder['day']} de {month_name}{days_text}"
-        ttk.Label(card, text=date_text, style='CardText.TLabel').pack(anchor='w')
+        
+        note = None
+        if reminder.get('nominal_date') not in (None, reminder.get('due_date')):
+            note = f"➡️ Día no hábil, vence el {reminder['due_date']:%d/%m/%Y}"
         
         # Description if exists
-        if reminder.get('description'):
-            ttk.Label(card, text=f"📝 {reminder['description']}", style='CardDesc.TLabel').pack(anchor='w', pady=(5, 0))
+        description = f"📝 {reminder['description']}" if reminder.get('description') else None
+        return ('card', f"• {desc}", date_text, note, description)
 
     def show_error(self, message):
-        error_label = ttk.Label(self.content_frame, text=f"Error: {message}", foreground="red", background=self.colors['bg'])
-        error_label.pack()
+        self.cards.render([('message', f"Error: {message}", 'red')])
 
 def main():
+    # Con TAX_REMINDER_METRICS definida se mide load_data (carga SQLAlchemy solo en ese caso)
+    enable_from_environment()
     root = tk.Tk()
     app = TaxReminderGUI(root)
     root.mainloop()
@@ -0,0 +1,141 @@
+"""Widgets compartidos por gui_main y gui_short
+
+CardPool reutiliza las tarjetas del resumen entre actualizaciones: en lugar de
+destruir y volver a crear Frames y Labels, reconfigura los existentes, crea solo
+los que faltan y oculta los que sobran. ScrollableFrame permite listas largas.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional, Tuple
+
+
+class ScrollableFrame(ttk.Frame):
+    """Frame with a vertical scrollbar; put the content in .body"""
+
+    def __init__(self, parent, background: Optional[str] = None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.canvas = tk.Canvas(self, highlightthickness=0, borderwidth=0, background=background)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+
+        self.body = ttk.Frame(self.canvas)
+        self._window = self.canvas.create_window((0, 0), window=self.body, anchor='nw')
+        self.body.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox('all')))
+        self.canvas.bind('<Configure>', lambda e: self.canvas.itemconfigure(self._window, width=e.width))
+
+        # Rueda del ratón: Windows/macOS usan <MouseWheel>, X11 los botones 4 y 5
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.bind_all(sequence, self._on_mousewheel, add='+')
+
+    def _on_mousewheel(self, event):
+        widget = self.winfo_containing(event.x_root, event.y_root)
+        if widget is None or not str(widget).startswith(str(self)):
+            return  # El puntero está sobre otro widget
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step, 'units')
+
+
+class _Card:
+    """One reusable card: title, date line, optional note and optional description"""
+
+    def __init__(self, parent):
+        self.frame = ttk.Frame(parent, style='Card.TFrame', padding="10")
+        self.title = ttk.Label(self.frame, style='CardText.TLabel', font=('Segoe UI', 10, 'bold'))
+        self.title.pack(anchor='w')
+        self.date = ttk.Label(self.frame, style='CardText.TLabel')
+        self.date.pack(anchor='w')
+        self.note = ttk.Label(self.frame, style='CardDesc.TLabel')
+        self.description = ttk.Label(self.frame, style='CardDesc.TLabel')
+        self._texts = (None, None, None, None)
+
+    def update(self, title: str, date_text: str, note: Optional[str], description: Optional[str]):
+        texts = (title, date_text, note, description)
+        if texts == self._texts:
+            return
+        old_title, old_date, old_note, old_description = self._texts
+        if title != old_title:
+            self.title.configure(text=title)
+        if date_text != old_date:
+            self.date.configure(text=date_text)
+
+        # Mostrar u ocultar las líneas opcionales solo cuando cambian
+        if bool(note) != bool(old_note) or bool(description) != bool(old_description):
+            self.note.pack_forget()
+            self.description.pack_forget()
+            if note:
+                self.note.pack(anchor='w')
+            if description:
+                self.description.pack(anchor='w', pady=(5, 0))
+        if note and note != old_note:
+            self.note.configure(text=note)
+        if description and description != old_description:
+            self.description.configure(text=description)
+        self._texts = texts
+
+
+# Elementos que acepta CardPool.render:
+#   ('header', texto, estilo)
+#   ('separator',)
+#   ('card', título, fecha, nota o None, descripción o None)
+#   ('message', texto, color o None)
+Item = Tuple
+
+
+class CardPool:
+    """Renders a list of headers, separators, cards and messages reusing widgets"""
+
+    _PACK_OPTIONS = {
+        'header': {'anchor': 'w', 'pady': (0, 10)},
+        'separator': {'fill': 'x', 'pady': 15},
+        'card': {'fill': 'x', 'pady': (0, 10)},
+        'message': {'pady': 20},
+    }
+
+    def __init__(self, parent):
+        self.parent = parent
+        self._pools = {kind: [] for kind in self._PACK_OPTIONS}
+        self._shown: List[tk.Widget] = []
+
+    def _create(self, kind: str):
+        if kind == 'header':
+            return ttk.Label(self.parent)
+        if kind == 'separator':
+            return ttk.Separator(self.parent, orient='horizontal')
+        if kind == 'card':
+            return _Card(self.parent)
+        return ttk.Label(self.parent, style='TLabel')
+
+    def render(self, items: List[Item]):
+        used = {kind: 0 for kind in self._pools}
+        widgets = []
+        for item in items:
+            kind = item[0]
+            pool = self._pools[kind]
+            if used[kind] == len(pool):
+                pool.append(self._create(kind))
+            element = pool[used[kind]]
+            used[kind] += 1
+
+            if kind == 'header':
+                element.configure(text=item[1], style=item[2])
+            elif kind == 'card':
+                element.update(*item[1:5])
+            elif kind == 'message':
+                element.configure(text=item[1], foreground=item[2] or '')
+            widgets.append((kind, element.frame if kind == 'card' else element))
+
+        # Solo se vuelve a empaquetar si cambió la secuencia de widgets visibles
+        sequence = [widget for _, widget in widgets]
+        if sequence != self._shown:
+            for widget in self._shown:
+                widget.pack_forget()
+            for kind, widget in widgets:
+                widget.pack(**self._PACK_OPTIONS[kind])
+            self._shown = sequence
@@ -0,0 +1,193 @@
+"""Exportación de los vencimientos a iCalendar (.ics)
+
+Uso:
+    python ics_export.py salida.ics [--from 2025] [--to 2027] [--table nombre]
+                         [--client J-12345678-9 | --all-clients] [--db tax_reminder.db] [--force]
+
+Los eventos se generan uno a uno y se escriben directamente al archivo, así un
+feed de varios años y muchos clientes no se arma completo en memoria. Junto al
+.ics se guarda la firma de la base de datos y los parámetros usados; si nada
+cambió, el archivo no se vuelve a generar.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from reminder_snapshot import db_signature
+
+_PRODID = '-//TaxReminder//Vencimientos de impuestos//ES'
+# Largo máximo de una línea iCalendar en octetos, sin contar CRLF (RFC 5545 §3.1)
+_LINE_LIMIT = 75
+
+
+def _escape(text: str) -> str:
+    return (text.replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _fold(line: str) -> str:
+    """Split a content line in chunks of at most 75 octets, continued with a space"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= _LINE_LIMIT:
+        return line + '\r\n'
+    parts = []
+    start = 0
+    limit = _LINE_LIMIT
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # No cortar en medio de un carácter UTF-8 (bytes de continuación 10xxxxxx)
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start = end
+        limit = _LINE_LIMIT - 1  # La línea de continuación empieza con un espacio
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _event(uid: str, stamp: str, due_date: date, summary: str, description: str) -> str:
+    return ''.join((
+        'BEGIN:VEVENT\r\n',
+        _fold(f'UID:{uid}'),
+        f'DTSTAMP:{stamp}\r\n',
+        f'DTSTART;VALUE=DATE:{due_date:%Y%m%d}\r\n',
+        f'DTEND;VALUE=DATE:{due_date + timedelta(days=1):%Y%m%d}\r\n',
+        _fold(f'SUMMARY:{_escape(summary)}'),
+        _fold(f'DESCRIPTION:{_escape(description)}') if description else '',
+        'TRANSP:TRANSPARENT\r\n',
+        'END:VEVENT\r\n',
+    ))
+
+
+def iter_ics(db, start_year: int, end_year: int, table: Optional[str] = None,
+             clients: Optional[List[Dict[str, Any]]] = None) -> Iterator[str]:
+    """Yield the iCalendar document chunk by chunk, one VEVENT at a time
+
+    Args:
+        db: DatabaseManager
+        start_year: First year to export
+        end_year: Last year to export (inclusive)
+        table: Only dates of this table
+        clients: Emit one event per matching client (by RIF terminal digit)
+            instead of one per date
+    """
+    calendar = db.get_business_calendar(start_year, end_year + 1)
+    # Las fechas de años archivados solo se leen si el rango los incluye
+    rows = [row for row in itertools.chain(db.get_deadline_index(),
+                                           db.get_archived_dates(range(start_year, end_year + 1)))
+            if table is None or row['table'] == table]
+    paid = db.get_paid_occurrences(range(start_year, end_year + 1))
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    yield ('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n'
+           f'PRODID:{_PRODID}\r\nCALSCALE:GREGORIAN\r\nMETHOD:PUBLISH\r\n'
+           'X-WR-CALNAME:Vencimientos de impuestos\r\n')
+
+    for year in range(start_year, end_year + 1):
+        for row in rows:
+            if row['year'] is not None and row['year'] != year:
+                continue
+            try:
+                nominal = date(year, row['month'], row['day'])
+            except ValueError:
+                continue  # 29 de febrero en un año no bisiesto
+            due_date = calendar.roll_forward(nominal)
+
+            summary = row['table_description'] or row['table']
+            if (row['id'], year) in paid:
+                summary = f"✅ {summary}"
+            description = row['description'] or ''
+            if due_date != nominal:
+                moved = f"Fecha del calendario: {nominal:%d/%m/%Y} (día no hábil)"
+                description = f"{description}\n{moved}" if description else moved
+
+            if clients is None:
+                yield _event(f"{row['id']}-{year}@taxreminder", stamp, due_date, summary, description)
+                continue
+
+            # Las fechas sin terminales de RIF son propias de la firma y no tienen eventos por cliente
+            digits = row['rif_digits'] or ''
+            for client in clients:
+                if client['rif_digit'] in digits:
+                    yield _event(f"{row['id']}-{year}-c{client['id']}@taxreminder", stamp, due_date,
+                                 f"{client['name']} ({client['rif']}) · {summary}", description)
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def export_ics(db, path: str, start_year: int, end_year: int, table: Optional[str] = None,
+               client_rif: Optional[str] = None, all_clients: bool = False, force: bool = False) -> bool:
+    """Write the .ics file unless the database and parameters are unchanged since the last export
+
+    Returns:
+        True if the file was (re)generated, False if it was already up to date
+    """
+    clients = None
+    if client_rif or all_clients:
+        clients = [c for c in db.get_clients() if all_clients or c['rif'] == client_rif]
+        if not clients:
+            raise ValueError(f"No existe el cliente {client_rif}")
+
+    # El calendario de feriados puede escribir en la base de datos: prepararlo antes de tomar la firma
+    db.get_business_calendar(start_year, end_year + 1)
+    meta = {
+        'signature': db_signature(db.db_path),
+        'params': [start_year, end_year, table, client_rif, all_clients],
+    }
+    meta_path = path + '.meta.json'
+    if not force and os.path.exists(path):
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                if json.load(f) == meta:
+                    return False
+        except (OSError, ValueError):
+            pass
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(iter_ics(db, start_year, end_year, table, clients))
+    os.replace(tmp_path, path)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return True
+
+
+def main():
+    this_year = date.today().year
+    parser = argparse.ArgumentParser(description="Exportar los vencimientos a iCalendar (.ics)")
+    parser.add_argument('output', help="archivo .ics de salida")
+    parser.add_argument('--from', dest='start_year', type=int, default=this_year, help="primer año (por defecto el actual)")
+    parser.add_argument('--to', dest='end_year', type=int, default=this_year + 1, help="último año (por defecto el próximo)")
+    parser.add_argument('--table', help="solo las fechas de esta tabla")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--client', help="RIF del cliente, e.g. J-12345678-9")
+    group.add_argument('--all-clients', action='store_true', help="un evento por cliente")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    parser.add_argument('--force', action='store_true', help="regenerar aunque nada haya cambiado")
+    args = parser.parse_args()
+
+    from models import DatabaseManager, normalize_rif
+
+    db = DatabaseManager(f'sqlite:///{os.path.abspath(args.db)}' if args.db else None)
+    client_rif = None
+    if args.client:
+        client_rif = normalize_rif(args.client)
+        if client_rif is None:
+            print(f"❌ RIF inválido: {args.client}")
+            return 1
+
+    try:
+        written = export_ics(db, args.output, args.start_year, args.end_year, args.table,
+                             client_rif, args.all_clients, args.force)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {args.output} generado" if written else f"ℹ️ {args.output} ya está al día")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Importa fechas de vencimiento desde un archivo CSV o JSON
+
+Uso:
+    python import_dates.py fechas.csv [--format csv|json] [--db tax_reminder.db]
+
+Columnas: table_name (o table), month, day y, opcionalmente, description,
+year y rif_digits. Con JSON se acepta un arreglo o un objeto por línea.
+Solo las fechas con rif_digits (e.g. '05' o '0123456789') se asignan a los
+clientes; sin rif_digits son fechas propias de la firma.
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa fechas de vencimiento a tax_reminder.db")
+    parser.add_argument('file', help="archivo CSV o JSON ('-' para leer de la entrada estándar)")
+    parser.add_argument('--format', choices=('csv', 'json'), help="formato (por defecto según la extensión)")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    args = parser.parse_args()
+
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.file)[1].lower()
+        fmt = 'json' if extension in ('.json', '.jsonl') else 'csv'
+
+    from models import DatabaseManager
+    db = DatabaseManager(f'sqlite:///{os.path.abspath(args.db)}' if args.db else None)
+
+    start = time.perf_counter()
+    try:
+        if args.file == '-':
+            report = db.import_dates(sys.stdin, fmt)
+        else:
+            with open(args.file, encoding='utf-8-sig', newline='') as stream:
+                report = db.import_dates(stream, fmt)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error al importar: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Importación completada en {elapsed:.2f} s")
+    print(f"   Insertadas: {report['inserted']}")
+    print(f"   Omitidas (ya existían): {report['skipped']}")
+    print(f"   Rechazadas: {report['rejected']}")
+    for line_number, reason in report['errors'][:20]:
+        print(f"   ❌ Línea {line_number}: {reason}")
+    if report['rejected'] > 20:
+        print(f"   ... y {report['rejected'] - 20} más")
+    return 0 if not report['rejected'] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""Instrumentación opcional de consultas y operaciones
+
+Se activa con la variable de entorno TAX_REMINDER_METRICS (ruta de un archivo
+.json o .prom, que se escribe al salir del programa) o llamando a enable().
+Mientras está desactivada no hay listeners en los engines ni envoltorios en
+DatabaseManager; las acciones de las interfaces marcadas con @timed solo
+revisan una variable global.
+
+Con la instrumentación activa se registra, por cada método de DatabaseManager
+y cada acción marcada:
+- la latencia (histograma)
+- cuántas sentencias SQL ejecutó y la latencia de cada una (histograma)
+- patrones N+1: la misma sentencia repetida muchas veces en una sola llamada
+
+Uso:
+    TAX_REMINDER_METRICS=metrics.prom python gui_main.py
+    python instrumentation.py metrics.json   # resumen de un archivo exportado
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+ENV_VAR = 'TAX_REMINDER_METRICS'
+# Límites superiores de los histogramas, en segundos
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Veces que la misma sentencia puede repetirse en una operación antes de contarla como N+1
+N_PLUS_ONE_THRESHOLD = 10
+# Operación a la que se atribuyen las sentencias ejecutadas fuera de una operación medida
+UNTRACKED = '(sin operación)'
+# Métodos de DatabaseManager que solo entregan sesiones: medirlos no dice nada
+_SKIPPED_METHODS = {'get_db', 'session_scope'}
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_wrapped: Dict[type, Dict[str, Callable]] = {}
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in seconds"""
+
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # El último es +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                break
+        else:
+            i = len(BUCKETS)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'sum': self.sum, 'buckets': list(self.counts)}
+
+
+class OperationStats:
+    """Aggregated metrics of one instrumented operation"""
+
+    __slots__ = ('latency', 'statement_latency', 'statements', 'errors', 'n_plus_one')
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statement_latency = Histogram()
+        self.statements = 0
+        self.errors = 0
+        self.n_plus_one: Counter = Counter()  # Sentencia -> llamadas en que se repitió
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency': self.latency.to_dict(),
+            'statement_latency': self.statement_latency.to_dict(),
+            'statements': self.statements,
+            'errors': self.errors,
+            'n_plus_one': dict(self.n_plus_one),
+        }
+
+
+_operations: Dict[str, OperationStats] = {}
+
+
+class _Frame:
+    """One running operation on the current thread"""
+
+    __slots__ = ('name', 'statements', 'repeated')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.statements = 0
+        self.repeated: Counter = Counter()
+
+
+def _stack() -> List[_Frame]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _stats(name: str) -> OperationStats:
+    stats = _operations.get(name)
+    if stats is None:
+        stats = _operations.setdefault(name, OperationStats())
+    return stats
+
+
+def _run_operation(name: str, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    stack = _stack()
+    frame = _Frame(name)
+    stack.append(frame)
+    failed = False
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        with _lock:
+            stats = _stats(name)
+            stats.latency.observe(elapsed)
+            stats.statements += frame.statements
+            stats.errors += failed
+            for statement, times in frame.repeated.items():
+                if times > N_PLUS_ONE_THRESHOLD:
+                    stats.n_plus_one[statement] += 1
+        if stack:
+            # Las sentencias de una operación anidada también cuentan para la que la llamó
+            stack[-1].statements += frame.statements
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording a function as an operation while instrumentation is enabled"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            return _run_operation(name, fn, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    stack = _stack()
+    if stack:
+        frame = stack[-1]
+        frame.statements += 1
+        # El texto ya viene parametrizado: la misma forma de consulta da el mismo texto
+        frame.repeated[statement] += 1
+        name = frame.name
+    else:
+        name = UNTRACKED
+    with _lock:
+        stats = _stats(name)
+        stats.statement_latency.observe(elapsed)
+        if not stack:
+            stats.statements += 1
+
+
+def _instrument_class(cls: type):
+    """Wrap every public method of cls as an operation named Class.method"""
+    originals = {}
+    for attr, value in list(vars(cls).items()):
+        if (attr.startswith('_') or attr in _SKIPPED_METHODS or not callable(value)
+                or isinstance(value, (staticmethod, classmethod))):
+            continue
+        name = f'{cls.__name__}.{attr}'
+
+        def make_wrapper(fn, name=name):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                return _run_operation(name, fn, args, kwargs)
+            return wrapper
+
+        originals[attr] = value
+        setattr(cls, attr, make_wrapper(value))
+    _wrapped[cls] = originals
+
+
+def enable(export_path: Optional[str] = None):
+    """Start recording; with export_path, write the metrics there when the program exits"""
+    global _enabled
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+    event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    from models import DatabaseManager
+    _instrument_class(DatabaseManager)
+
+    if export_path:
+        atexit.register(export, export_path)
+
+
+def disable():
+    """Stop recording and remove the listeners and wrappers; collected metrics are kept"""
+    global _enabled
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _lock:
+        if not _enabled:
+            return
+        _enabled = False
+    event.remove(Engine, 'before_cursor_execute', _before_cursor_execute)
+    event.remove(Engine, 'after_cursor_execute', _after_cursor_execute)
+    for cls, originals in _wrapped.items():
+        for attr, fn in originals.items():
+            setattr(cls, attr, fn)
+    _wrapped.clear()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable_from_environment():
+    """Enable instrumentation if TAX_REMINDER_METRICS names an export file"""
+    path = os.environ.get(ENV_VAR)
+    if path and not _enabled:
+        enable(path)
+
+
+def reset():
+    """Discard the collected metrics"""
+    with _lock:
+        _operations.clear()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Copy of the collected metrics by operation name"""
+    with _lock:
+        return {name: stats.to_dict() for name, stats in sorted(_operations.items())}
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _prometheus_histogram(lines: List[str], metric: str, labels: str, histogram: Dict[str, Any]):
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ('+Inf',), histogram['buckets']):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_sum{{{labels}}} {histogram["sum"]:.6f}')
+    lines.append(f'{metric}_count{{{labels}}} {histogram["count"]}')
+
+
+def to_prometheus(metrics: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """Render metrics in the Prometheus text exposition format"""
+    metrics = snapshot() if metrics is None else metrics
+    lines = [
+        '# HELP taxreminder_operation_seconds Latency of DatabaseManager methods and GUI actions',
+        '# TYPE taxreminder_operation_seconds histogram',
+    ]
+    for name, stats in metrics.items():
+        if stats['latency']['count']:
+            _prometheus_histogram(lines, 'taxreminder_operation_seconds', f'operation="{_label(name)}"', stats['latency'])
+    lines += [
+        '# HELP taxreminder_statement_seconds Latency of SQL statements by enclosing operation',
+        '# TYPE taxreminder_statement_seconds histogram',
+    ]
+    for name, stats in metrics.items():
+        if stats['statement_latency']['count']:
+            _prometheus_histogram(lines, 'taxreminder_statement_seconds', f'operation="{_label(name)}"',
+                                  stats['statement_latency'])
+    lines += [
+        '# HELP taxreminder_statements_total SQL statements executed by operation',
+        '# TYPE taxreminder_statements_total counter',
+    ]
+    lines += [f'taxreminder_statements_total{{operation="{_label(name)}"}} {stats["statements"]}'
+              for name, stats in metrics.items()]
+    lines += [
+        '# HELP taxreminder_operation_errors_total Operations that raised an exception',
+        '# TYPE taxreminder_operation_errors_total counter',
+    ]
+    lines += [f'taxreminder_operation_errors_total{{operation="{_label(name)}"}} {stats["errors"]}'
+              for name, stats in metrics.items()]
+    lines += [
+        '# HELP taxreminder_n_plus_one_total Calls that repeated the same statement more than '
+        f'{N_PLUS_ONE_THRESHOLD} times',
+        '# TYPE taxreminder_n_plus_one_total counter',
+    ]
+    for name, stats in metrics.items():
+        for statement, calls in stats['n_plus_one'].items():
+            lines.append(f'taxreminder_n_plus_one_total{{operation="{_label(name)}",'
+                         f'statement="{_label(statement)}"}} {calls}')
+    return '\n'.join(lines) + '\n'
+
+
+def export(path: str):
+    """Write the metrics to path: Prometheus text for .prom/.txt, JSON otherwise"""
+    metrics = snapshot()
+    if path.endswith(('.prom', '.txt')):
+        content = to_prometheus(metrics)
+    else:
+        content = json.dumps({'buckets': list(BUCKETS), 'operations': metrics}, ensure_ascii=False, indent=2)
+    # Escritura atómica: un recolector puede estar leyendo el archivo
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def report(metrics: Dict[str, Dict[str, Any]]) -> str:
+    """Human-readable summary, slowest operations first"""
+    rows = sorted(metrics.items(), key=lambda item: item[1]['latency']['sum'], reverse=True)
+    lines = [f"{'operación':<46}{'llamadas':>9}{'total ms':>11}{'media ms':>10}{'SQL':>8}{'SQL/llam.':>10}"]
+    for name, stats in rows:
+        calls = stats['latency']['count']
+        total = stats['latency']['sum'] * 1000
+        mean = total / calls if calls else 0.0
+        per_call = stats['statements'] / calls if calls else float(stats['statements'])
+        lines.append(f"{name:<46}{calls:>9}{total:>11.1f}{mean:>10.2f}{stats['statements']:>8}{per_call:>10.1f}")
+    warnings = [(name, statement, calls) for name, stats in rows for statement, calls in stats['n_plus_one'].items()]
+    if warnings:
+        lines.append("\n⚠️ Posibles consultas N+1:")
+        for name, statement, calls in warnings:
+            lines.append(f"  {name} ({calls} llamada(s)): {' '.join(statement.split())[:100]}")
+    return '\n'.join(lines)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Uso: python instrumentation.py metrics.json")
+        return 1
+    with open(sys.argv[1], encoding='utf-8') as f:
+        print(report(json.load(f)['operations']))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any
-from models import DatabaseManager, TaxTable, TaxDate, Base
+from models import DatabaseManager, TaxTable, TaxDate, Base, normalize_rif, normalize_rif_digits
+from instrumentation import timed
 import sqlalchemy.orm
 import sys
 
@@ -22,44 +23,20 @@ class TaxReminderCLI:
             # This will only add the table if it doesn't already exist
             self.db.add_table(name, desc)
     
+    @timed('TaxReminderCLI.check_today')
     def check_today(self):
         """Check for any tax dates due today or in the next 2 days"""
         today = date.today()
         today_reminders = []
         upcoming_reminders = []
         
-        # Primero, obtener todos los vencimientos
-        all_reminders = []
-        with self.db.get_db() as db:
-            results = db.query(TaxDate, TaxTable.description).join(
-                TaxTable, TaxDate.table_name == TaxTable.name
-            ).all()
-            
-            for date_obj, table_desc in results:
-                all_reminders.append({
-                    'table': date_obj.table_name,
-                    'table_description': table_desc,
-                    'month': date_obj.month,
-                    'day': date_obj.day,
-                    'description': date_obj.description
-                })
-        
-        # Verificar para hoy y los próximos 2 días
-        for days_ahead in range(0, 3):  # Hoy (0), mañana (1), pasado mañana (2)
-            check_date = today + timedelta(days=days_ahead)
-            
-            for reminder in all_reminders:
-                # Verificar si la fecha coincide con el día a verificar
-                if reminder['month'] == check_date.month and reminder['day'] == check_date.day:
-                    # Calcular días restantes
-                    days_until = (check_date - today).days
-                    
-                    if days_until == 0:
-                        today_reminders.append(reminder)
-                    elif days_until > 0:  # Solo agregar fechas futuras
-                        reminder_copy = reminder.copy()  # Crear una copia para no modificar el original
-                        reminder_copy['days_until'] = days_until
-                        upcoming_reminders.append(reminder_copy)
+        # Vencimientos sin pagar de hoy y los próximos 2 días en una sola consulta;
+        # los que caen en fin de semana o feriado pasan al siguiente día hábil
+        for reminder in self.db.get_upcoming(today, 3):
+            if reminder['days_until'] == 0:
+                today_reminders.append(reminder)
+            else:
+                upcoming_reminders.append(reminder)
         
         # Display today's reminders
         if today_reminders:
@@ -77,6 +54,7 @@ class TaxReminderCLI:
             
             for reminder in sorted(upcoming_reminders, key=lambda x: x['days_until']):
                 days_text = "mañana" if reminder['days_until'] == 1 else f"en {reminder['days_until']} días"
+                days_text += f", {reminder['business_days_until']} hábil(es)"
                 
                 # Formatear los nombres de las quincenas
                 table_desc = reminder['table_description']
@@ -90,6 +68,7 @@ class TaxReminderCLI:
                 
                 print(f"\n• {table_desc}")
                 print(f"  📅 {reminder['day']} de {month_name} ({days_text})")
+                self._print_moved_date(reminder)
                 if reminder.get('description'):
                     print(f"  📝 {reminder['description']}")
         
@@ -117,9 +96,16 @@ class TaxReminderCLI:
             # Mostrar la información del recordatorio
             print(f"\n• {table_desc}")
             print(f"  📅 {reminder['day']} de {month_name}")
+            self._print_moved_date(reminder)
             if reminder.get('description'):
                 print(f"  📝 {reminder['description']}")
     
+    def _print_moved_date(self, reminder):
+        """Show the actual due date when a deadline moved to the next business day"""
+        due_date = reminder.get('due_date')
+        if due_date is not None and reminder.get('nominal_date') not in (None, due_date):
+            print(f"  ➡️  Cae en día no hábil, vence el {due_date:%d/%m/%Y}")
+    
     def _get_valid_input(self, prompt, input_type=int, valid_range=None, allow_cancel=True):
         """Ayuda para obtener y validar la entrada del usuario con opción de cancelar"""
         while True:
@@ -220,6 +206,17 @@ class TaxReminderCLI:
                     print("\n❌ This date already exists in the selected table.")
                     return
                 
+                # Terminales de RIF: sin ellos la fecha es propia y no aplica a ningún cliente
+                rif_digits = input("\nTerminales de RIF a los que aplica, e.g. 05 (opcional, Enter para omitir): ").strip()
+                if rif_digits.lower() == 'q':
+                    print("\nOperación cancelada.")
+                    return
+                try:
+                    rif_digits = normalize_rif_digits(rif_digits)
+                except ValueError as e:
+                    print(f"\n❌ Error: {str(e).capitalize()}")
+                    return
+                
                 # Obtener descripción con opción de cancelar
                 description = input("\nIngresa una descripción (opcional, presiona Enter para omitir): ").strip()
                 if description.lower() == 'q':
@@ -229,7 +226,7 @@ class TaxReminderCLI:
                 description = description or None
                 
                 # Intentar agregar la fecha
-                if self.db.add_date(selected_table.name, month, day, description):
+                if self.db.add_date(selected_table.name, month, day, description, rif_digits):
                     print("\n✅ ¡Fecha agregada correctamente!")
                 else:
                     print("\n❌ Error al agregar la fecha. Es posible que ya exista.")
@@ -458,6 +455,54 @@ class TaxReminderCLI:
             if 'db' in locals():
                 db.rollback()
     
+    def manage_clients(self):
+        """Lista, agrega o elimina los clientes (contribuyentes) de la firma"""
+        try:
+            clients = self.db.get_clients()
+            
+            print("\n👥 Clientes")
+            print("-----------------------------------")
+            if not clients:
+                print("No hay clientes registrados.")
+            for i, client in enumerate(clients, 1):
+                print(f"{i}. {client['name']} ({client['rif']})")
+            
+            print("\n1. Agregar cliente")
+            print("2. Eliminar cliente")
+            print("3. Volver")
+            action = self._get_valid_input("\nSelecciona una opción (1-3): ", int, (1, 3))
+            
+            if action == 1:
+                rif = input("\nRIF (e.g. J-12345678-9): ").strip()
+                if normalize_rif(rif) is None:
+                    print("\n❌ RIF inválido.")
+                    return
+                name = input("Nombre o razón social: ").strip()
+                if not name:
+                    print("\nOperación cancelada.")
+                    return
+                if self.db.add_client(rif, name):
+                    print("\n✅ ¡Cliente agregado correctamente!")
+                else:
+                    print("\n❌ Ya existe un cliente con ese RIF.")
+            
+            elif action == 2:
+                if not clients:
+                    return
+                choice = self._get_valid_input("\nNúmero del cliente a eliminar: ", int, (1, len(clients)))
+                if choice is None:
+                    print("\nOperación cancelada.")
+                    return
+                client = clients[choice - 1]
+                confirm = input(f"\n⚠️  ¿Eliminar a {client['name']}? (s/N): ").strip().lower()
+                if confirm == 's' and self.db.delete_client(client['id']):
+                    print("\n✅ Cliente eliminado correctamente.")
+                else:
+                    print("\nOperación cancelada.")
+        
+        except KeyboardInterrupt:
+            print("\nOperación cancelada por el usuario.")
+    
     def show_menu(self):
         """Muestra el menú principal"""
         while True:
@@ -469,7 +514,8 @@ class TaxReminderCLI:
                 print("4. Editar o eliminar fechas")
                 print("5. Confirmar pago del impuesto")
                 print("6. Limpiar base de datos")
-                print("7. Salir")
+                print("7. Gestionar clientes")
+                print("8. Salir")
                 
                 choice = input("\nSeleccione una opción: ").strip()
                 
@@ -486,6 +532,8 @@ class TaxReminderCLI:
                 elif choice == '6':
                     self.clean_database()
                 elif choice == '7':
+                    self.manage_clients()
+                elif choice == '8':
                     print("\n¡Hasta luego! 👋")
                     sys.exit(0)
                 else:
@@ -497,75 +545,48 @@ class TaxReminderCLI:
             except Exception as e:
                 print(f"\n❌ Ocurrió un error: {e}")
     
+    @timed('TaxReminderCLI.confirm_payment')
     def confirm_payment(self):
-        """Confirma el pago del impuesto más cercano y lo elimina de la base de datos"""
+        """Confirma el pago del próximo vencimiento pendiente del año que corresponde"""
         try:
             today = date.today()
-            next_deadline = None
+            # Una sola consulta con LIMIT 1; los pagos quedan en la tabla payments
+            next_deadline = self.db.get_next_unpaid(today)
             
-            with self.db.get_db() as db:
-                # Obtener todas las fechas ordenadas por proximidad
-                all_dates = db.query(TaxDate, TaxTable.description).join(
-                    TaxTable, TaxDate.table_name == TaxTable.name
-                ).order_by(TaxDate.month, TaxDate.day).all()
-                
-                if not all_dates:
-                    print("\nℹ️ No hay impuestos registrados.")
-                    return
-                
-                # Encontrar la próxima fecha de vencimiento (puede ser hoy o en el futuro)
-                for date_obj, table_desc in all_dates:
-                    # Crear fecha de vencimiento para el año actual
-                    deadline = date(today.year, date_obj.month, date_obj.day)
-                    
-                    # Si ya pasó este año, considerar el próximo año
-                    if deadline < today:
-                        deadline = date(today.year + 1, date_obj.month, date_obj.day)
-                    
-                    if next_deadline is None or deadline < next_deadline['deadline']:
-                        next_deadline = {
-                            'date_obj': date_obj,
-                            'table_desc': table_desc,
-                            'deadline': deadline
-                        }
-                
-                if next_deadline is None:
-                    print("\nℹ️ No se encontraron vencimientos futuros.")
-                    return
-                
-                # Mostrar información del próximo vencimiento
-                date_obj = next_deadline['date_obj']
-                month_name = date(2023, date_obj.month, 1).strftime('%B')
-                days_until = (next_deadline['deadline'] - today).days
-                
-                print("\n\033[93m\033[1m📅 PRÓXIMO VENCIMIENTO\033[0m")
-                print(f"\n• {next_deadline['table_desc']}")
-                print(f"  📅 {date_obj.day:02d} de {month_name}")
-                if date_obj.description:
-                    print(f"  📝 {date_obj.description}")
-                
-                if days_until > 0:
-                    print(f"\nℹ️ Este vencimiento es en {days_until} días.")
-                elif days_until == 0:
-                    print("\nℹ️ Este vencimiento es hoy.")
-                else:
-                    print(f"\n⚠️  Este vencimiento era hace {-days_until} días.")
-                
-                # Pedir confirmación
-                confirm = input("\n¿Confirmar pago de este impuesto? (s/N): ").strip().lower()
+            if next_deadline is None:
+                print("\nℹ️ No hay vencimientos pendientes de pago.")
+                return
+            
+            # Mostrar información del próximo vencimiento
+            month_name = date(2023, next_deadline['month'], 1).strftime('%B')
+            days_until = next_deadline['days_until']
+            
+            print("\n\033[93m\033[1m📅 PRÓXIMO VENCIMIENTO\033[0m")
+            print(f"\n• {next_deadline['table_description']}")
+            print(f"  📅 {next_deadline['day']:02d} de {month_name} de {next_deadline['year']}")
+            self._print_moved_date(next_deadline)
+            if next_deadline['description']:
+                print(f"  📝 {next_deadline['description']}")
+            
+            if days_until > 0:
+                print(f"\nℹ️ Este vencimiento es en {days_until} días ({next_deadline['business_days_until']} hábiles).")
+            elif days_until == 0:
+                print("\nℹ️ Este vencimiento es hoy.")
+            else:
+                print(f"\n⚠️  Este vencimiento era hace {-days_until} días.")
+            
+            # Pedir confirmación
+            confirm = input("\n¿Confirmar pago de este impuesto? (s/N): ").strip().lower()
+            
+            if confirm == 's':
+                # Registrar el pago de este año; la fecha sigue en el calendario
+                self.db.record_payment(next_deadline['id'], next_deadline['year'])
+                print("\n✅ ¡Pago confirmado! El impuesto ha sido registrado como pagado.")
+            else:
+                print("\nOperación cancelada.")
                 
-                if confirm == 's':
-                    # Eliminar el registro
-                    db.delete(date_obj)
-                    db.commit()
-                    print("\n✅ ¡Pago confirmado! El impuesto ha sido registrado como pagado.")
-                else:
-                    print("\nOperación cancelada.")
-                    
         except Exception as e:
             print(f"\n❌ Ocurrió un error al procesar el pago: {e}")
-            if 'db' in locals():
-                db.rollback()
 
 def main():
     """Punto de entrada principal de la aplicación"""
@@ -1,19 +1,31 @@
 import os
 import sys
 import time
-from datetime import date, timedelta
+from datetime import date
+
+# Días revisados: hoy y los próximos 2 días
+UPCOMING_DAYS = 3
 
 # Configurar título de la consola
 if os.name == 'nt':  # Solo intentar en Windows
     try:
         import ctypes
-        ctypes.windll.kernel32.SetConsoleTitleW("Recordatorio de Impuestos")
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetConsoleTitleW("Recordatorio de Impuestos")
+        # Activar las secuencias ANSI para limpiar la pantalla sin lanzar 'cls'
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
     except:
         pass
 
 def clear_screen():
     """Clear the console screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Secuencia ANSI en lugar de un subproceso 'clear'/'cls'
+    if sys.stdout.isatty():
+        sys.stdout.write("\033[2J\033[H")
+        sys.stdout.flush()
 
 def print_header():
     """Mostrar encabezado de la aplicación"""
@@ -23,70 +35,53 @@ def print_header():
     print("=" * 50)
     print(f"Fecha de hoy: {date.today().strftime('%d/%m/%Y')}\n")
 
-def check_upcoming_deadlines():
-    """Check for tax deadlines due today or in the next 2 days"""
-    import sys
-    import os
-    from models import DatabaseManager, TaxDate, TaxTable
+def _default_db_path():
+    """Path of tax_reminder.db next to the script or the executable"""
+    if getattr(sys, 'frozen', False):
+        # Si es un ejecutable
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        # Si se ejecuta desde el código fuente
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, 'tax_reminder.db')
+
+def _read_upcoming(db_path, today):
+    """Read the window from the snapshot or stdlib sqlite3; create or migrate the DB only if needed"""
+    from fast_reader import NeedsMigration, ensure_schema
+    from reminder_snapshot import read_upcoming_cached
     
+    try:
+        return read_upcoming_cached(db_path, today, UPCOMING_DAYS)
+    except NeedsMigration:
+        # Solo en este caso se cargan SQLAlchemy y los modelos (operación de escritura)
+        ensure_schema(db_path)
+        return read_upcoming_cached(db_path, today, UPCOMING_DAYS)
+
+def check_upcoming_deadlines(db_path=None):
+    """Check for tax deadlines due today or in the next 2 days"""
     try:
         # Usar la ruta correcta para la base de datos
-        if getattr(sys, 'frozen', False):
-            # Si es un ejecutable
-            base_dir = os.path.dirname(sys.executable)
-        else:
-            # Si se ejecuta desde el código fuente
-            base_dir = os.path.dirname(os.path.abspath(__file__))
+        if db_path is None:
+            db_path = _default_db_path()
+        print(f"Conectando a la base de datos en: {db_path}")
         
-        # Crear la ruta completa al archivo de la base de datos
-        db_path = os.path.join(base_dir, 'tax_reminder.db')
-        db_url = f'sqlite:///{db_path}'
-        print(f"Conectando a la base de datos en: {db_url}")
-        
-        db = DatabaseManager(db_url)
         today = date.today()
         today_reminders = []
         upcoming_reminders = []
+        client_reminders = []
         has_errors = False
 
         # Check for today and next 2 days
-        for days_ahead in range(0, 3):
-            try:
-                check_date = today + timedelta(days=days_ahead)
-                with db.get_db() as session:
-                    results = session.query(TaxDate, TaxTable.description).join(
-                        TaxTable, TaxDate.table_name == TaxTable.name
-                    ).filter(
-                        TaxDate.month == check_date.month,
-                        TaxDate.day == check_date.day
-                    ).all()
-
-                    for date_obj, table_desc in results:
-                        # Calculate the correct year for the reminder
-                        current_year = today.year
-                        if date_obj.month < today.month or (date_obj.month == today.month and date_obj.day < today.day):
-                            current_year += 1  # Next year if the date has passed this year
-                        
-                        reminder_date = date(current_year, date_obj.month, date_obj.day)
-                        days_until = (reminder_date - today).days
-
-                        reminder = {
-                            'table': date_obj.table_name,
-                            'table_description': table_desc,
-                            'month': date_obj.month,
-                            'day': date_obj.day,
-                            'description': date_obj.description
-                        }
-
-                        if days_until == 0:
-                            today_reminders.append(reminder)
-                        elif days_until > 0:
-                            reminder['days_until'] = days_until
-                            upcoming_reminders.append(reminder)
-            except Exception as e:
-                print(f"⚠️  Error al verificar fechas: {str(e)}")
-                has_errors = True
-                continue
+        try:
+            calendar_reminders, client_reminders = _read_upcoming(db_path, today)
+            for reminder in calendar_reminders:
+                if reminder['days_until'] == 0:
+                    today_reminders.append(reminder)
+                else:
+                    upcoming_reminders.append(reminder)
+        except Exception as e:
+            print(f"⚠️  Error al verificar fechas: {str(e)}")
+            has_errors = True
 
         # Display header
         print_header()
@@ -112,10 +107,15 @@ def check_upcoming_deadlines():
                 
                 print(f"\n• {table_desc}")
                 print(f"  📅 {reminder['day']} de {month_name} ({days_text})")
+                _print_moved_date(reminder)
                 if reminder.get('description'):
                     print(f"  📝 {reminder['description']}")
         
-        if not today_reminders and not upcoming_reminders and not has_errors:
+        # Display firm-wide client reminders
+        if client_reminders:
+            _print_client_reminders(client_reminders)
+        
+        if not today_reminders and not upcoming_reminders and not client_reminders and not has_errors:
             print("\n✅ No hay vencimientos para hoy ni para los próximos 2 días.")
             
     except Exception as e:
@@ -145,20 +145,48 @@ def _print_reminders(reminders):
         month_name = _get_month_name(reminder['month'])
         print(f"\n• {table_desc}")
         print(f"  📅 {reminder['day']} de {month_name}")
+        _print_moved_date(reminder)
         if reminder.get('description'):
             print(f"  📝 {reminder['description']}")
 
+def _print_moved_date(reminder):
+    """Show the actual due date when a deadline moved to the next business day"""
+    due_date = reminder.get('due_date')
+    if due_date is not None and reminder.get('nominal_date') not in (None, due_date):
+        print(f"  ➡️  Cae en día no hábil, vence el {due_date:%d/%m/%Y}")
+
+def _print_client_reminders(reminders):
+    """Print the firm-wide reminders grouped by client"""
+    print("\n\033[96m\033[1m👥 VENCIMIENTOS DE CLIENTES\033[0m")
+    current_client = None
+    for reminder in sorted(reminders, key=lambda x: (x['client_name'], x['days_until'])):
+        if reminder['client_rif'] != current_client:
+            current_client = reminder['client_rif']
+            print(f"\n• {reminder['client_name']} ({reminder['client_rif']})")
+        
+        if reminder['days_until'] == 0:
+            days_text = "hoy"
+        elif reminder['days_until'] == 1:
+            days_text = "mañana"
+        else:
+            days_text = f"en {reminder['days_until']} días"
+        month_name = _get_month_name(reminder['month'])
+        print(f"  📅 {reminder['day']} de {month_name} ({days_text}) - {reminder['table_description']}")
+
 def main():
     """Main function"""
-    check_upcoming_deadlines()
+    import argparse
+    parser = argparse.ArgumentParser(description="Próximos vencimientos de impuestos")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db junto al programa)")
+    parser.add_argument('--no-pause', action='store_true', help="salir sin esperar a que se presione Enter")
+    args = parser.parse_args()
     
-    # Pausa antes de salir
+    check_upcoming_deadlines(os.path.abspath(args.db) if args.db else None)
+    
+    # Pausa antes de salir, solo en la consola de Windows (se cierra al terminar)
     print("\n" + "=" * 50)
-    if os.name == 'nt':  # Solo pausar en Windows
+    if os.name == 'nt' and not args.no_pause and sys.stdin.isatty():
         input("\nPresiona Enter para salir...")
-    else:
-        # En otros sistemas, esperar antes de salir
-        time.sleep(5)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,378 @@
+import itertools
+import os
+import sqlite3
+import sys
+from typing import List, Tuple, Callable
+
+import archive
+
+# Cada migración recibe un cursor de sqlite3 y se ejecuta dentro de una transacción.
+# La versión aplicada se guarda en PRAGMA user_version del propio archivo .db.
+# create_all corre antes y ya crea las tablas nuevas, por eso se usa IF NOT EXISTS
+
+
+def _merge_duplicate_dates(cursor) -> int:
+    """Collapse repeated (table_name, month, day) rows onto the lowest id without losing data
+
+    The surviving row gets the distinct descriptions of its group joined with
+    ' / ', and the removed rows are copied to tax_dates_duplicates (with the
+    id they were merged into) so they can be reviewed.
+
+    Returns:
+        Number of rows merged
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tax_dates_duplicates (
+            id INTEGER NOT NULL,
+            kept_id INTEGER NOT NULL,
+            table_name VARCHAR(50) NOT NULL,
+            month INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            description VARCHAR(200),
+            PRIMARY KEY (id)
+        )
+    """)
+    rows = cursor.execute("""
+        SELECT id, table_name, month, day, description FROM tax_dates
+        WHERE (table_name, month, day) IN (
+            SELECT table_name, month, day FROM tax_dates
+            GROUP BY table_name, month, day HAVING COUNT(*) > 1
+        )
+        ORDER BY table_name, month, day, id
+    """).fetchall()
+
+    merged = 0
+    for _, group in itertools.groupby(rows, key=lambda row: row[1:4]):
+        kept, *duplicates = group
+        kept_id = kept[0]
+        descriptions = []
+        for row in (kept, *duplicates):
+            if row[4] and row[4] not in descriptions:
+                descriptions.append(row[4])
+        cursor.execute("UPDATE tax_dates SET description = ? WHERE id = ?",
+                       (' / '.join(descriptions) or None, kept_id))
+        for duplicate_id, table_name, month, day, description in duplicates:
+            cursor.execute(
+                "INSERT INTO tax_dates_duplicates (id, kept_id, table_name, month, day, description) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (duplicate_id, kept_id, table_name, month, day, description)
+            )
+            cursor.execute("DELETE FROM tax_dates WHERE id = ?", (duplicate_id,))
+            merged += 1
+    return merged
+
+
+def _add_tax_dates_indexes(cursor):
+    """Composite indexes on tax_dates and uniqueness of (table_name, month, day)"""
+    # Unir las fechas duplicadas antes de crear el índice único
+    merged = _merge_duplicate_dates(cursor)
+    if merged:
+        print(f"⚠️ {merged} fechas duplicadas unidas a la primera de su grupo; "
+              "las filas originales quedan en la tabla tax_dates_duplicates")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_tax_dates_month_day ON tax_dates (month, day)")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_tax_dates_table_month_day "
+        "ON tax_dates (table_name, month, day)"
+    )
+
+
+def _add_year_and_rif_digits(cursor):
+    """Year-specific calendars (e.g. SPE-2025) and RIF terminal digits on tax_dates"""
+    cursor.execute("ALTER TABLE tax_dates ADD COLUMN year INTEGER")
+    cursor.execute("ALTER TABLE tax_dates ADD COLUMN rif_digits VARCHAR(10)")
+    # La misma fecha puede repetirse en calendarios de años distintos
+    cursor.execute("DROP INDEX IF EXISTS uq_tax_dates_table_month_day")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tax_dates_table_month_day "
+        "ON tax_dates (table_name, month, day)"
+    )
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_tax_dates_table_year_month_day "
+        "ON tax_dates (table_name, coalesce(year, 0), month, day)"
+    )
+
+
+def _add_clients(cursor):
+    """Clients linked to the shared calendar through their RIF terminal digit"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER NOT NULL,
+            rif VARCHAR(12) NOT NULL,
+            name VARCHAR(200) NOT NULL,
+            rif_digit VARCHAR(1) NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (rif)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_clients_rif_digit ON clients (rif_digit)")
+
+
+def _add_holidays(cursor):
+    """Non-working days for the business-day calendar"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS holidays (
+            id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            name VARCHAR(100) NOT NULL,
+            national BOOLEAN NOT NULL,
+            PRIMARY KEY (id),
+            UNIQUE (date)
+        )
+    """)
+
+
+def _add_payments(cursor):
+    """Payment ledger: one row per paid (tax date, year) occurrence"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS payments (
+            id INTEGER NOT NULL,
+            tax_date_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            paid_at DATETIME NOT NULL,
+            PRIMARY KEY (id),
+            FOREIGN KEY(tax_date_id) REFERENCES tax_dates (id)
+        )
+    """)
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_payments_tax_date_year "
+        "ON payments (tax_date_id, year)"
+    )
+
+
+# Día del año de (mes, día) en un año bisiesto (1-366), o NULL si la fecha no existe.
+# Es la misma clave que deadline_index.day_of_year_key; {row} es NEW en los triggers
+_DOY_EXPRESSION = """
+    CASE WHEN strftime('%m', date(printf('2000-%02d-01', {row}.month), printf('+%d days', {row}.day - 1)))
+              = printf('%02d', {row}.month)
+         THEN CAST(strftime('%j', date(printf('2000-%02d-01', {row}.month), printf('+%d days', {row}.day - 1))) AS INTEGER)
+    END
+"""
+
+# Triggers que mantienen tax_dates.doy con cualquier escritor (ORM, inserciones masivas o sqlite3).
+# models.py también los crea al hacer create_all en una base de datos nueva
+DOY_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tr_tax_dates_doy_insert AFTER INSERT ON tax_dates
+    BEGIN
+        UPDATE tax_dates SET doy = {_DOY_EXPRESSION.format(row='NEW')} WHERE id = NEW.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tr_tax_dates_doy_update AFTER UPDATE OF month, day ON tax_dates
+    BEGIN
+        UPDATE tax_dates SET doy = {_DOY_EXPRESSION.format(row='NEW')} WHERE id = NEW.id;
+    END
+    """,
+]
+
+
+def _add_day_of_year(cursor):
+    """Stored day-of-year key on tax_dates for single-query window lookups"""
+    cursor.execute("ALTER TABLE tax_dates ADD COLUMN doy INTEGER")
+    cursor.execute(f"UPDATE tax_dates SET doy = {_DOY_EXPRESSION.format(row='tax_dates')}")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_tax_dates_doy_year ON tax_dates (doy, year)")
+    for trigger in DOY_TRIGGERS:
+        cursor.execute(trigger)
+
+
+def _spe_all_terminals(cursor):
+    """SPE dates that apply to every RIF terminal store all ten digits instead of NULL"""
+    # NULL queda para las fechas propias de la firma, que no se asignan a los clientes
+    cursor.execute("""
+        UPDATE tax_dates SET rif_digits = '0123456789'
+        WHERE rif_digits IS NULL AND year IS NOT NULL
+          AND table_name IN (SELECT name FROM tables WHERE description LIKE '%(SPE %)')
+    """)
+
+
+def _move_archived_copies(cursor, archive_file: str) -> int:
+    """Move to an archive file the rows that archive_year used to leave behind in tax_dates
+
+    Before tax_dates had AUTOINCREMENT, archiving kept the date with the highest
+    id in both files so SQLite would not hand out its id again. Those copies
+    and the payments that point to them move to the archive like any other
+    date of the year.
+
+    Returns:
+        Highest tax date id in the archive (0 if it is empty)
+    """
+    archive_db = sqlite3.connect(archive_file)
+    try:
+        archived_ids = [row[0] for row in archive_db.execute("SELECT id FROM tax_dates")]
+        copies = []
+        for start in range(0, len(archived_ids), 500):
+            chunk = archived_ids[start:start + 500]
+            copies += cursor.execute(
+                f"SELECT id, table_name, month, day, description, year, rif_digits, doy FROM tax_dates "
+                f"WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+        if not copies:
+            return max(archived_ids, default=0)
+
+        ids = [row[0] for row in copies]
+        placeholders = ','.join('?' * len(ids))
+        payments = cursor.execute(
+            f"SELECT id, tax_date_id, year, paid_at FROM payments WHERE tax_date_id IN ({placeholders})", ids
+        ).fetchall()
+        # El archivo se escribe primero; si la migración falla, volver a copiar las mismas filas no cambia nada
+        with archive_db:
+            archive_db.executemany("INSERT OR REPLACE INTO tax_dates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", copies)
+            archive_db.executemany("INSERT OR REPLACE INTO payments VALUES (?, ?, ?, ?)", payments)
+        cursor.execute(f"DELETE FROM payments WHERE tax_date_id IN ({placeholders})", ids)
+        cursor.execute(f"DELETE FROM tax_dates WHERE id IN ({placeholders})", ids)
+        return max(archived_ids)
+    finally:
+        archive_db.close()
+
+
+def _autoincrement_tax_dates(cursor):
+    """AUTOINCREMENT on tax_dates so the id of an archived date is never handed out again"""
+    db_path = next((row[2] for row in cursor.execute("PRAGMA database_list").fetchall() if row[1] == 'main'), '')
+    highest = cursor.execute("SELECT coalesce(max(id), 0) FROM tax_dates").fetchone()[0]
+    if db_path:
+        for year in archive.archived_years(db_path):
+            highest = max(highest, _move_archived_copies(cursor, archive.archive_path(db_path, year)))
+
+    # SQLite no puede agregar AUTOINCREMENT a una tabla existente: se reconstruye con los mismos ids
+    cursor.execute("""
+        CREATE TABLE tax_dates_new (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            table_name VARCHAR(50) NOT NULL,
+            month INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            description VARCHAR(200),
+            year INTEGER,
+            rif_digits VARCHAR(10),
+            doy INTEGER,
+            FOREIGN KEY(table_name) REFERENCES tables (name)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO tax_dates_new (id, table_name, month, day, description, year, rif_digits, doy)
+        SELECT id, table_name, month, day, description, year, rif_digits, doy FROM tax_dates
+    """)
+    cursor.execute("DROP TABLE tax_dates")
+    cursor.execute("ALTER TABLE tax_dates_new RENAME TO tax_dates")
+    cursor.execute("CREATE INDEX ix_tax_dates_month_day ON tax_dates (month, day)")
+    cursor.execute("CREATE INDEX ix_tax_dates_table_month_day ON tax_dates (table_name, month, day)")
+    cursor.execute(
+        "CREATE UNIQUE INDEX uq_tax_dates_table_year_month_day "
+        "ON tax_dates (table_name, coalesce(year, 0), month, day)"
+    )
+    cursor.execute("CREATE INDEX ix_tax_dates_doy_year ON tax_dates (doy, year)")
+    for trigger in DOY_TRIGGERS:
+        cursor.execute(trigger)
+
+    # El próximo id queda por encima también de las fechas que ya no están en esta base
+    cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('tax_dates', 'tax_dates_new')")
+    cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('tax_dates', ?)", (highest,))
+
+
+# (versión, descripción, función) en orden; nunca modificar una migración ya publicada
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, 'Índices compuestos y unicidad en tax_dates', _add_tax_dates_indexes),
+    (2, 'Año y terminales de RIF en tax_dates', _add_year_and_rif_digits),
+    (3, 'Tabla de clientes', _add_clients),
+    (4, 'Tabla de feriados', _add_holidays),
+    (5, 'Registro de pagos por año', _add_payments),
+    (6, 'Día del año en tax_dates', _add_day_of_year),
+    (7, 'Terminales de RIF explícitos en el calendario SPE', _spe_all_terminals),
+    (8, 'Ids de tax_dates que no se reutilizan (AUTOINCREMENT)', _autoincrement_tax_dates),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection) -> int:
+    """Get the schema version recorded in a sqlite3 connection"""
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate_connection(connection, fresh: bool = False) -> int:
+    """Apply every pending migration to a sqlite3 connection
+
+    Each migration runs in its own transaction together with the update of
+    PRAGMA user_version, so a failed step leaves the file at the last good version.
+
+    Args:
+        connection: sqlite3 connection to the database file
+        fresh: True when the schema was just created from the models, which
+            already include every migration, so only the version is recorded
+
+    Returns:
+        The schema version after migrating
+    """
+    previous_isolation = connection.isolation_level
+    connection.isolation_level = None  # Controlar BEGIN/COMMIT manualmente
+    try:
+        current = get_schema_version(connection)
+        if fresh and current == 0:
+            connection.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+            return SCHEMA_VERSION
+
+        for version, description, migration in MIGRATIONS:
+            if version <= current:
+                continue
+
+            cursor = connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+
+            print(f"Migración {version} aplicada: {description}")
+            current = version
+        return current
+    finally:
+        connection.isolation_level = previous_isolation
+
+
+def migrate_engine(engine, fresh: bool = False) -> int:
+    """Apply every pending migration to the database behind a SQLAlchemy engine"""
+    if engine.dialect.name != 'sqlite':
+        raise ValueError(f"Migrations are only supported on SQLite, not {engine.dialect.name}")
+
+    raw = engine.raw_connection()
+    try:
+        return migrate_connection(raw.driver_connection, fresh)
+    finally:
+        raw.close()
+
+
+def main(paths: List[str]) -> int:
+    """Upgrade the given .db files in place (default: project and dist databases)"""
+    from models import DatabaseManager
+
+    if not paths:
+        if getattr(sys, 'frozen', False):
+            base_dir = os.path.dirname(sys.executable)
+        else:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+        paths = [
+            os.path.join(base_dir, 'tax_reminder.db'),
+            os.path.join(base_dir, 'dist', 'tax_reminder.db'),
+        ]
+
+    exit_code = 0
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"⚠️ No se encontró la base de datos: {path}")
+            exit_code = 1
+            continue
+        try:
+            db = DatabaseManager(f'sqlite:///{os.path.abspath(path)}')
+            print(f"✅ {path}: esquema en versión {db.schema_version}")
+        except Exception as e:
+            print(f"❌ Error migrando {path}: {e}")
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
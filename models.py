@@ -1,9 +1,24 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, ForeignKey, Date, func
+from sqlalchemy import DDL, create_engine, event, insert, inspect, select, literal, exists, union_all, and_, or_, Column, Integer, String, Boolean, ForeignKey, Date, DateTime, Index, func
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
-from datetime import datetime, date
-from typing import List, Optional, Tuple, Dict, Any
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Iterator
+import archive
+import csv
+import itertools
+import json
 import os
+import re
+import threading
+
+from business_calendar import BusinessCalendar, national_holidays, window_years
+from deadline_index import DeadlineIndex, roll_to_business_days, window_query, window_rows, window_segments
+from instrumentation import enable_from_environment
+from migrations import DOY_TRIGGERS, migrate_engine
+from reminder_records import Reminder
+from reminder_snapshot import invalidate_snapshot
 
 # SQLAlchemy setup
 Base = declarative_base()
@@ -25,23 +40,320 @@ class TaxTable(Base):
 class TaxDate(Base):
     """Represents a tax date in a specific table"""
     __tablename__ = 'tax_dates'
+    # Los ids de fechas archivadas no se reutilizan (migración 8)
+    __table_args__ = {'sqlite_autoincrement': True}
     
     id = Column(Integer, primary_key=True)
     table_name = Column(String(50), ForeignKey('tables.name'), nullable=False)
     month = Column(Integer, nullable=False)  # 1-12
     day = Column(Integer, nullable=False)    # 1-31
     description = Column(String(200))
+    year = Column(Integer)                   # None = se repite todos los años
+    rif_digits = Column(String(10))          # Terminales de RIF, e.g. '05'; None = fecha propia, sin clientes
+    doy = Column(Integer)                    # Día del año en un año bisiesto; lo mantienen triggers
     
     # Relationship to table
     table = relationship("TaxTable", back_populates="dates")
+    payments = relationship("Payment", back_populates="tax_date", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<TaxDate(table='{self.table_name}', month={self.month}, day={self.day}, description='{self.description}')>"
 
+# Mismos nombres que crea migrations.py en bases de datos existentes
+Index('ix_tax_dates_month_day', TaxDate.month, TaxDate.day)
+Index('ix_tax_dates_table_month_day', TaxDate.table_name, TaxDate.month, TaxDate.day)
+Index('uq_tax_dates_table_year_month_day',
+      TaxDate.table_name, func.coalesce(TaxDate.year, 0), TaxDate.month, TaxDate.day, unique=True)
+Index('ix_tax_dates_doy_year', TaxDate.doy, TaxDate.year)
+for _trigger in DOY_TRIGGERS:
+    # DDL aplica formato con %: escapar los de strftime/printf
+    event.listen(TaxDate.__table__, 'after_create', DDL(_trigger.replace('%', '%%')))
+
+class Payment(Base):
+    """Represents a paid occurrence of a tax date in a given year"""
+    __tablename__ = 'payments'
+    
+    id = Column(Integer, primary_key=True)
+    tax_date_id = Column(Integer, ForeignKey('tax_dates.id'), nullable=False)
+    year = Column(Integer, nullable=False)
+    paid_at = Column(DateTime, nullable=False, default=datetime.now)
+    
+    tax_date = relationship("TaxDate", back_populates="payments")
+    
+    def __repr__(self):
+        return f"<Payment(tax_date_id={self.tax_date_id}, year={self.year})>"
+
+# También sirve para buscar la próxima ocurrencia sin pagar (NOT EXISTS por fecha y año)
+Index('uq_payments_tax_date_year', Payment.tax_date_id, Payment.year, unique=True)
+
+# Columnas de un Reminder (reminder_records.BASE_FIELDS): las consultas de recordatorios
+# leen solo estas columnas con Core, sin crear objetos TaxDate en la sesión
+_REMINDER_COLUMNS = (TaxDate.id, TaxDate.table_name, TaxTable.description, TaxDate.month, TaxDate.day,
+                     TaxDate.description, TaxDate.year, TaxDate.rif_digits)
+
+class Client(Base):
+    """Represents a taxpayer followed by the firm"""
+    __tablename__ = 'clients'
+    
+    id = Column(Integer, primary_key=True)
+    rif = Column(String(12), unique=True, nullable=False)  # e.g. 'J-12345678-9'
+    name = Column(String(200), nullable=False)
+    rif_digit = Column(String(1), nullable=False, index=True)  # Último dígito del RIF
+    
+    def __repr__(self):
+        return f"<Client(rif='{self.rif}', name='{self.name}')>"
+
+class Holiday(Base):
+    """Represents a non-working day (national holiday or added by the user)"""
+    __tablename__ = 'holidays'
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, unique=True, nullable=False)
+    name = Column(String(100), nullable=False)
+    national = Column(Boolean, nullable=False, default=False)  # Calculado por business_calendar
+    
+    def __repr__(self):
+        return f"<Holiday(date={self.date}, name='{self.name}')>"
+
+_RIF_PATTERN = re.compile(r'^([VEJPG])-?(\d{8})-?(\d)$')
+
+def normalize_rif(rif: str) -> Optional[str]:
+    """Normalize a RIF to the 'J-12345678-9' format, or None if it is not valid"""
+    match = _RIF_PATTERN.match(rif.strip().upper().replace(' ', ''))
+    if not match:
+        return None
+    return '-'.join(match.groups())
+
+_RIF_DIGITS_PATTERN = re.compile(r'[0-9]+')
+
+def normalize_rif_digits(digits: Optional[str]) -> Optional[str]:
+    """Normalize RIF terminal digits to sorted unique digits, e.g. '50' -> '05'
+
+    Returns None for an empty value (the firm's own dates, without clients).
+
+    Raises:
+        ValueError: The value has characters other than the digits 0-9
+    """
+    digits = (digits or '').strip()
+    if not digits:
+        return None
+    if not _RIF_DIGITS_PATTERN.fullmatch(digits):
+        raise ValueError(f"terminales de RIF inválidos: '{digits}' (solo dígitos del 0 al 9)")
+    return ''.join(sorted(set(digits)))
+
+# Pragmas aplicados a cada conexión SQLite nueva (se pueden sobrescribir por DatabaseManager)
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',       # Lectores no bloquean al escritor
+    'synchronous': 'NORMAL',     # Seguro con WAL y sin fsync en cada commit
+    'cache_size': -8000,         # Negativo = KiB, ~8 MB de caché de páginas
+    'mmap_size': 64 * 1024 * 1024,
+}
+
+# Un engine por (URL, pragmas) y por proceso, con el esquema preparado una sola vez
+_engines: Dict[Tuple[str, Tuple], Engine] = {}
+_schema_versions: Dict[Engine, int] = {}
+_engines_lock = threading.RLock()
+
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    """Run the given PRAGMA statements on every new DBAPI connection of the engine"""
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def get_engine(db_url: str, pragmas: Optional[Dict[str, Any]] = None) -> Engine:
+    """Get the process-wide engine for a database URL, creating it on first use"""
+    if pragmas is None:
+        pragmas = DEFAULT_SQLITE_PRAGMAS
+    key = (db_url, tuple(sorted(pragmas.items())))
+    
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = create_engine(db_url)
+            if engine.dialect.name == 'sqlite' and pragmas:
+                _apply_sqlite_pragmas(engine, pragmas)
+            _engines[key] = engine
+        return engine
+
+
+# Caracteres leídos por vez al recorrer un arreglo JSON
+_JSON_CHUNK = 64 * 1024
+
+
+def _iter_json_array(stream, head: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (element number, element) pairs of a JSON array, reading the stream in chunks
+
+    A malformed element is yielded as its exception and ends the array, since
+    the parser cannot tell where the next element starts.
+    """
+    decoder = json.JSONDecoder()
+    buffer = head.lstrip()[1:]  # Sin el '[' inicial
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        chunk = stream.read(_JSON_CHUNK)
+        eof = not chunk
+        buffer += chunk
+
+    def skip_whitespace():
+        nonlocal buffer
+        buffer = buffer.lstrip()
+        while not buffer and not eof:
+            read_more()
+            buffer = buffer.lstrip()
+
+    number = 0
+    while True:
+        skip_whitespace()
+        if buffer.startswith(']'):
+            return
+        if number:
+            if not buffer.startswith(','):
+                yield number + 1, ValueError("se esperaba ',' o ']' entre los elementos del arreglo")
+                return
+            buffer = buffer[1:]
+            skip_whitespace()
+        number += 1
+
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer)
+            except ValueError as e:
+                if eof:
+                    yield number, e
+                    return
+                read_more()
+                continue
+            # Un número al final del búfer podría seguir en el próximo bloque
+            if end == len(buffer) and not eof:
+                read_more()
+                continue
+            break
+        buffer = buffer[end:]
+        yield number, record
+
+
+def _iter_import_records(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, record) pairs from a CSV or JSON stream
+
+    JSON may be a single array or JSON Lines (one object per line). Neither
+    is loaded whole: arrays are parsed element by element from fixed-size
+    chunks (the record number is then the position in the array) and JSON
+    Lines line by line.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    
+    first_line = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+    if first_line.lstrip().startswith('['):
+        yield from _iter_json_array(stream, first_line)
+        return
+    
+    for line_number, line in enumerate(itertools.chain([first_line], stream), 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def _import_text(record: Dict[str, Any], *keys: str) -> str:
+    """First non-empty value among keys as stripped text; JSON numbers are accepted
+
+    Raises:
+        ValueError: If the value is an object, array or boolean
+    """
+    for key in keys:
+        value = record.get(key)
+        if value is None or value == '':
+            continue
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError(f"'{key}' debe ser texto")
+        return str(value).strip()
+    return ''
+
+
+def _import_int(value: Any) -> int:
+    """Integer from CSV text or a JSON number; booleans and fractions are rejected"""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError(value)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(value)
+    return int(value)
+
+
+def _validate_import_record(record: Any, tables: set) -> Dict[str, Any]:
+    """Validate one imported record and return the TaxDate values
+
+    Raises:
+        ValueError: With the reason the record was rejected
+    """
+    if isinstance(record, Exception):
+        raise ValueError(f"JSON inválido: {record}")
+    if not isinstance(record, dict):
+        raise ValueError("el registro no es un objeto")
+    
+    table_name = _import_text(record, 'table_name', 'table')
+    if table_name not in tables:
+        raise ValueError(f"la tabla '{table_name}' no existe")
+    
+    try:
+        month = _import_int(record.get('month'))
+        day = _import_int(record.get('day'))
+        year = _import_int(record['year']) if record.get('year') not in (None, '') else None
+    except ValueError:
+        raise ValueError("mes, día o año no son números enteros")
+    
+    # Año bisiesto por defecto para aceptar el 29 de febrero en fechas recurrentes
+    try:
+        date(year or 2024, month, day)
+    except ValueError:
+        raise ValueError(f"fecha imposible: {day}/{month}" + (f"/{year}" if year else ""))
+    
+    rif_digits = _import_text(record, 'rif_digits') or None
+    if rif_digits is not None and not rif_digits.isdigit():
+        raise ValueError(f"terminales de RIF inválidos: '{rif_digits}'")
+    
+    description = _import_text(record, 'description') or None
+    return {
+        'table_name': table_name,
+        'month': month,
+        'day': day,
+        'year': year,
+        'rif_digits': rif_digits,
+        'description': description[:200] if description else None,
+    }
+
+def _mark_orm_write(orm_execute_state):
+    """Remember that the session ran an INSERT, UPDATE or DELETE statement"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+def _mark_flush_write(session, flush_context):
+    """Remember that the session flushed pending changes"""
+    session.info['wrote'] = True
+
+
 class DatabaseManager:
     """Handles all database operations"""
     
-    def __init__(self, db_url: str = None):
+    def __init__(self, db_url: str = None, pragmas: Optional[Dict[str, Any]] = None,
+                 snapshot: bool = True):
         import sys
         import os
         
@@ -63,36 +375,96 @@ class DatabaseManager:
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
         print(f"Conectando a la base de datos en: {db_url}")
-        self.engine = create_engine(db_url)
+        # Métricas de consultas solo si TAX_REMINDER_METRICS está definida
+        enable_from_environment()
+        self.engine = get_engine(db_url, pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self.create_tables()
+        
+        # Crear y migrar el esquema solo la primera vez que se abre este engine
+        with _engines_lock:
+            if self.engine not in _schema_versions:
+                is_new = not inspect(self.engine).has_table(TaxDate.__tablename__)
+                self.create_tables()
+                _schema_versions[self.engine] = self.migrate(fresh=is_new)
+        self.schema_version = _schema_versions[self.engine]
+        self._business_calendars: Dict[Tuple[int, int], BusinessCalendar] = {}
+        
+        # Invalidar la instantánea de recordatorios después de cada escritura confirmada
+        self.db_path = self.engine.url.database if self.engine.dialect.name == 'sqlite' else None
+        if snapshot and self.db_path and self.db_path != ':memory:':
+            event.listen(self.SessionLocal, 'do_orm_execute', _mark_orm_write)
+            event.listen(self.SessionLocal, 'after_flush', _mark_flush_write)
+            event.listen(self.SessionLocal, 'after_commit', self._after_commit)
     
     def create_tables(self):
         """Create database tables if they don't exist"""
         Base.metadata.create_all(bind=self.engine)
     
+    def migrate(self, fresh: bool = False) -> int:
+        """Upgrade an existing database file in place to the latest schema version"""
+        return migrate_engine(self.engine, fresh)
+    
+    def _after_commit(self, session: Session):
+        if session.info.pop('wrote', False):
+            self.invalidate_snapshot()
+    
+    def invalidate_snapshot(self):
+        """Drop the reminder snapshot so the next short-view read rebuilds it"""
+        invalidate_snapshot(self.db_path)
+    
     def get_db(self) -> Session:
-        """Get a database session"""
+        """Get a new database session; use it as a context manager so it is closed"""
+        return self.SessionLocal()
+    
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a transactional scope: commit on success, rollback on error"""
         db = self.SessionLocal()
         try:
-            return db
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
     
     def add_table(self, name: str, description: str = None) -> bool:
         """Add a new tax table"""
-        with self.get_db() as db:
+        with self.session_scope() as db:
             if db.query(TaxTable).filter(TaxTable.name == name).first():
                 return False  # Table already exists
             
             table = TaxTable(name=name, description=description)
             db.add(table)
-            db.commit()
             return True
     
-    def add_date(self, table_name: str, month: int, day: int, description: str = None) -> bool:
-        """Add a new tax date to a table"""
+    def get_tables(self) -> List[Dict[str, Any]]:
+        """Get all tax tables with their number of dates"""
         with self.get_db() as db:
+            results = db.query(TaxTable, func.count(TaxDate.id)).outerjoin(
+                TaxDate, TaxDate.table_name == TaxTable.name
+            ).group_by(TaxTable.id).order_by(TaxTable.name).all()
+            
+            return [{
+                'name': table.name,
+                'description': table.description,
+                'dates': count
+            } for table, count in results]
+    
+    def add_date(self, table_name: str, month: int, day: int, description: str = None,
+                 rif_digits: str = None) -> bool:
+        """Add a new tax date to a table
+
+        rif_digits are the RIF terminal digits it applies to (e.g. '05'); without
+        them the date is the firm's own and matches no client.
+        """
+        try:
+            rif_digits = normalize_rif_digits(rif_digits)
+        except ValueError:
+            return False  # Invalid terminal digits
+        
+        with self.session_scope() as db:
             # Check if table exists
             table = db.query(TaxTable).filter(TaxTable.name == table_name).first()
             if not table:
@@ -101,6 +473,7 @@ class DatabaseManager:
             # Check if date already exists
             existing = db.query(TaxDate).filter(
                 TaxDate.table_name == table_name,
+                TaxDate.year.is_(None),
                 TaxDate.month == month,
                 TaxDate.day == day
             ).first()
@@ -112,18 +485,420 @@ class DatabaseManager:
                 table_name=table_name,
                 month=month,
                 day=day,
+                rif_digits=rif_digits,
                 description=description
             )
             db.add(tax_date)
-            db.commit()
             return True
     
-    def check_today(self) -> List[Dict[str, Any]]:
+    def bulk_add_dates(self, rows: Iterable[Dict[str, Any]], tables: Dict[str, str] = None,
+                       chunk_size: int = 500) -> int:
+        """Insert many tax dates in a single transaction, skipping existing ones
+        
+        Args:
+            rows: Dictionaries with TaxDate column values (table_name, month, day, ...)
+            tables: Optional {name: description} of tables to create first if missing
+            chunk_size: Rows sent per executemany batch
+            
+        Returns:
+            Number of tax dates actually inserted
+        """
+        insert_tables = insert(TaxTable).prefix_with('OR IGNORE')
+        insert_dates = insert(TaxDate).prefix_with('OR IGNORE')
+        
+        with self.session_scope() as db:
+            if tables:
+                db.execute(insert_tables, [
+                    {'name': name, 'description': description}
+                    for name, description in tables.items()
+                ])
+            
+            before = db.query(func.count(TaxDate.id)).scalar()
+            chunk = []
+            for row in rows:
+                chunk.append({
+                    'table_name': row['table_name'],
+                    'month': row['month'],
+                    'day': row['day'],
+                    'description': row.get('description'),
+                    'year': row.get('year'),
+                    'rif_digits': row.get('rif_digits'),
+                })
+                if len(chunk) >= chunk_size:
+                    db.execute(insert_dates, chunk)
+                    chunk = []
+            if chunk:
+                db.execute(insert_dates, chunk)
+            
+            return db.query(func.count(TaxDate.id)).scalar() - before
+    
+    def import_dates(self, stream, fmt: str = 'csv', chunk_size: int = 500) -> Dict[str, Any]:
+        """Import tax dates from a CSV or JSON stream in a single transaction
+        
+        Records need table_name (or table), month and day; description, year
+        and rif_digits are optional. Invalid records (unknown table, Feb 30,
+        ...) are rejected and existing dates are skipped.
+        
+        Args:
+            stream: Text stream with the records
+            fmt: 'csv' or 'json' (array or JSON Lines)
+            chunk_size: Rows sent per executemany batch
+            
+        Returns:
+            Dictionary with inserted, skipped and rejected counts, plus the
+            (line, reason) list of rejected records
+        """
+        if fmt not in ('csv', 'json'):
+            raise ValueError(f"Formato no soportado: {fmt}")
+        
+        with self.get_db() as db:
+            tables = {name for (name,) in db.query(TaxTable.name).all()}
+        
+        valid = 0
+        errors = []
+        
+        def valid_rows():
+            nonlocal valid
+            for line_number, record in _iter_import_records(stream, fmt):
+                try:
+                    row = _validate_import_record(record, tables)
+                except ValueError as e:
+                    errors.append((line_number, str(e)))
+                    continue
+                valid += 1
+                yield row
+        
+        inserted = self.bulk_add_dates(valid_rows(), chunk_size=chunk_size)
+        return {
+            'inserted': inserted,
+            'skipped': valid - inserted,
+            'rejected': len(errors),
+            'errors': errors,
+        }
+    
+    def add_client(self, rif: str, name: str) -> bool:
+        """Add a new client; the RIF terminal digit links it to the shared calendar"""
+        rif = normalize_rif(rif)
+        if rif is None:
+            return False  # Invalid RIF
+        
+        with self.session_scope() as db:
+            if db.query(Client).filter(Client.rif == rif).first():
+                return False  # Client already exists
+            
+            db.add(Client(rif=rif, name=name, rif_digit=rif[-1]))
+            return True
+    
+    def get_clients(self) -> List[Dict[str, Any]]:
+        """Get all clients ordered by name"""
+        with self.get_db() as db:
+            return [{
+                'id': c.id,
+                'rif': c.rif,
+                'name': c.name,
+                'rif_digit': c.rif_digit
+            } for c in db.query(Client).order_by(Client.name).all()]
+    
+    def delete_client(self, client_id: int) -> bool:
+        """Delete a client by ID"""
+        with self.session_scope() as db:
+            return db.query(Client).filter(Client.id == client_id).delete() > 0
+    
+    def ensure_national_holidays(self, years: Iterable[int]) -> int:
+        """Store the national holidays of the given years if they are not there yet
+        
+        A year counts as loaded once it has any national holiday, so holidays
+        the user deleted are not added back.
+        
+        Returns:
+            Number of holidays inserted
+        """
+        inserted = 0
+        with self.session_scope() as db:
+            for year in years:
+                loaded = db.query(Holiday.id).filter(
+                    Holiday.national.is_(True),
+                    Holiday.date.between(date(year, 1, 1), date(year, 12, 31))
+                ).first()
+                if loaded:
+                    continue
+                
+                existing = {h.date for h in db.query(Holiday).filter(
+                    Holiday.date.between(date(year, 1, 1), date(year, 12, 31))
+                )}
+                for day, name in national_holidays(year):
+                    # Un feriado móvil puede caer en uno fijo (e.g. Viernes Santo el 19/04/2030)
+                    if day not in existing:
+                        db.add(Holiday(date=day, name=name, national=True))
+                        existing.add(day)
+                        inserted += 1
+        if inserted:
+            self._business_calendars.clear()
+        return inserted
+    
+    def get_holidays(self, start_year: int, end_year: int = None) -> List[Dict[str, Any]]:
+        """Get the holidays between two years (inclusive), loading national ones on first use"""
+        if end_year is None:
+            end_year = start_year
+        self.ensure_national_holidays(range(start_year, end_year + 1))
+        with self.get_db() as db:
+            return [{
+                'id': h.id,
+                'date': h.date,
+                'name': h.name,
+                'national': h.national
+            } for h in db.query(Holiday).filter(
+                Holiday.date.between(date(start_year, 1, 1), date(end_year, 12, 31))
+            ).order_by(Holiday.date).all()]
+    
+    def add_holiday(self, day: date, name: str) -> bool:
+        """Add a non-working day (e.g. a decreed holiday); False if the date already is one"""
+        with self.session_scope() as db:
+            if db.query(Holiday).filter(Holiday.date == day).first():
+                return False
+            db.add(Holiday(date=day, name=name, national=False))
+        self._business_calendars.clear()
+        return True
+    
+    def delete_holiday(self, holiday_id: int) -> bool:
+        """Delete a holiday by ID"""
+        with self.session_scope() as db:
+            deleted = db.query(Holiday).filter(Holiday.id == holiday_id).delete() > 0
+        self._business_calendars.clear()
+        return deleted
+    
+    def get_business_calendar(self, start_year: int, end_year: int = None) -> BusinessCalendar:
+        """Get the business-day calendar of a range of years, built once per range"""
+        if end_year is None:
+            end_year = start_year
+        key = (start_year, end_year)
+        calendar = self._business_calendars.get(key)
+        if calendar is None:
+            holidays = [h['date'] for h in self.get_holidays(start_year, end_year)]
+            calendar = BusinessCalendar(start_year, end_year, holidays)
+            self._business_calendars[key] = calendar
+        return calendar
+    
+    def get_calendar_for_window(self, reference_date: date = None, horizon_days: int = 3) -> BusinessCalendar:
+        """Business calendar wide enough for DeadlineIndex.upcoming over a window"""
+        if reference_date is None:
+            reference_date = date.today()
+        return self.get_business_calendar(*window_years(reference_date, horizon_days))
+    
+    def get_next_unpaid(self, reference_date: date = None) -> Optional[Reminder]:
+        """Get the nearest unpaid occurrence due on or after reference_date
+        
+        A single query with LIMIT 1: tax dates are crossed with the candidate
+        years, impossible dates (e.g. 29/2 in a non-leap year) and paid
+        occurrences are left out, and rows are ordered by (year, month, day).
+        Dates since the previous business day are included because they roll
+        forward to reference_date or later.
+        
+        Returns:
+            Reminder like DeadlineIndex.upcoming with a calendar, whose 'year'
+            is the year of the occurrence, or None if there is nothing left to pay
+        """
+        if reference_date is None:
+            reference_date = date.today()
+        calendar = self.get_calendar_for_window(reference_date, 366)
+        since = calendar.previous_business_day(reference_date) + timedelta(days=1)
+        
+        years = union_all(*[
+            select(literal(year).label('year'))
+            for year in range(since.year, reference_date.year + 2)
+        ]).subquery('years')
+        due_key = years.c.year * 10000 + TaxDate.month * 100 + TaxDate.day
+        # Fecha válida si sumar (día - 1) al primer día del mes no cambia de mes
+        valid_date = func.strftime('%m', func.date(
+            func.printf('%04d-%02d-01', years.c.year, TaxDate.month),
+            func.printf('+%d days', TaxDate.day - 1)
+        )) == func.printf('%02d', TaxDate.month)
+        paid = exists().where(Payment.tax_date_id == TaxDate.id, Payment.year == years.c.year)
+        
+        query = select(*_REMINDER_COLUMNS, years.c.year).join_from(
+            TaxDate, TaxTable, TaxDate.table_name == TaxTable.name
+        ).join(
+            years, or_(TaxDate.year.is_(None), TaxDate.year == years.c.year)
+        ).where(
+            due_key >= since.year * 10000 + since.month * 100 + since.day,
+            valid_date,
+            ~paid
+        ).order_by(due_key, TaxDate.id).limit(1)
+        
+        with self.get_db() as db:
+            result = db.execute(query).first()
+        if result is None:
+            return None
+        *row, year = result
+        # 'year' es el año de este vencimiento, no el del calendario de la fecha
+        row[6] = year
+        return calendar.annotate(Reminder.from_row(row, due_date=date(year, row[3], row[4])), reference_date)
+    
+    def record_payment(self, tax_date_id: int, year: int) -> bool:
+        """Mark one occurrence of a tax date as paid; False if it already was"""
+        with self.session_scope() as db:
+            result = db.execute(insert(Payment).prefix_with('OR IGNORE').values(
+                tax_date_id=tax_date_id, year=year, paid_at=datetime.now()
+            ))
+            return result.rowcount > 0
+    
+    def delete_payment(self, tax_date_id: int, year: int) -> bool:
+        """Undo a payment so the occurrence shows up as pending again"""
+        with self.session_scope() as db:
+            return db.query(Payment).filter(
+                Payment.tax_date_id == tax_date_id, Payment.year == year
+            ).delete() > 0
+    
+    def get_paid_occurrences(self, years: Iterable[int]) -> set:
+        """Get the (tax_date_id, year) pairs already paid in the given years, archived ones included"""
+        years = list(years)
+        with self.get_db() as db:
+            paid = {(tax_date_id, year) for tax_date_id, year in db.query(
+                Payment.tax_date_id, Payment.year
+            ).filter(Payment.year.in_(years))}
+        with self._archive_connection(years) as connection:
+            if connection is not None:
+                paid |= archive.read_archived_payments(connection, self.db_path, years)
+        return paid
+    
+    @contextmanager
+    def _archive_connection(self, years: Iterable[int]) -> Iterator[Optional[Any]]:
+        """sqlite3 connection to attach archives to, or None when none of the years is archived"""
+        if not self.db_path or not set(years) & set(archive.archived_years(self.db_path)):
+            yield None
+            return
+        raw = self.engine.raw_connection()
+        try:
+            yield raw.driver_connection
+        finally:
+            raw.close()
+    
+    def get_archived_years(self) -> List[int]:
+        """Years moved to archive files by archive_year"""
+        return archive.archived_years(self.db_path) if self.db_path else []
+    
+    def get_archived_dates(self, years: Iterable[int]) -> List[Reminder]:
+        """Get the tax dates of the given years that were moved to archive files"""
+        years = list(years)
+        with self._archive_connection(years) as connection:
+            if connection is None:
+                return []
+            return [Reminder.from_row(row) for row in archive.read_archived_dates(connection, self.db_path, years)]
+    
+    def archive_year(self, year: int) -> Dict[str, int]:
+        """Move the tax dates and payments of a closed year into archive/<db>-<year>.db
+        
+        Raises:
+            ValueError: If the year is not closed yet or the database is not a file
+        """
+        if not self.db_path or self.db_path == ':memory:':
+            raise ValueError("Solo se puede archivar una base de datos SQLite en un archivo")
+        raw = self.engine.raw_connection()
+        try:
+            moved = archive.archive_year(raw.driver_connection, self.db_path, year)
+        finally:
+            raw.close()
+        self.invalidate_snapshot()
+        return moved
+    
+    def get_upcoming(self, reference_date: date = None, horizon_days: int = 3,
+                     include_paid: bool = False) -> List[Reminder]:
+        """Get every tax date due in a window with a single indexed query
+        
+        Uses the stored day-of-year key (tax_dates.doy); deadlines on weekends
+        or holidays move to the next business day and paid occurrences are
+        left out unless include_paid is True.
+        
+        Args:
+            reference_date: First day of the window (defaults to today)
+            horizon_days: Number of days in the window, including reference_date
+            include_paid: Also return occurrences already in the payments ledger
+            
+        Returns:
+            Reminder records like DeadlineIndex.upcoming with a calendar,
+            ordered by due date
+        """
+        if reference_date is None:
+            reference_date = date.today()
+        calendar = self.get_calendar_for_window(reference_date, horizon_days)
+        # Una fecha de hace hasta max_gap días pudo pasar a un día hábil dentro de la ventana
+        lookback = calendar.max_gap
+        sql, params = window_query(reference_date - timedelta(days=lookback), horizon_days + lookback,
+                                   include_paid)
+        if not sql:
+            return []
+        with self.engine.connect() as conn:
+            rows = conn.exec_driver_sql(sql, tuple(params)).fetchall()
+        return roll_to_business_days(window_rows(rows, reference_date), reference_date, horizon_days, calendar)
+    
+    def get_upcoming_for_clients(self, reference_date: date = None,
+                                 horizon_days: int = 3) -> List[Reminder]:
+        """Get the upcoming deadlines of every client in one set-based query
+        
+        Clients are matched to the shared calendar through their RIF terminal
+        digit; dates without rif_digits are the firm's own and match no client.
+        Paid occurrences are left out and deadlines on weekends or holidays move
+        to the next business day, as in get_upcoming.
+        
+        Args:
+            reference_date: First day of the window (defaults to today)
+            horizon_days: Number of days in the window, including reference_date
+            
+        Returns:
+            Reminder records ordered by due date and client name
+        """
+        if reference_date is None:
+            reference_date = date.today()
+        calendar = self.get_calendar_for_window(reference_date, horizon_days)
+        # Una fecha de hace hasta max_gap días pudo pasar a un día hábil dentro de la ventana
+        lookback = calendar.max_gap
+        segments = window_segments(reference_date - timedelta(days=lookback), horizon_days + lookback)
+        if not segments:
+            return []
+        
+        # Un rango de (mes, día) por año de la ventana en lugar de una consulta por día
+        segment_rows = union_all(*[
+            select(literal(year).label('year'),
+                   literal(start.month * 100 + start.day).label('first_key'),
+                   literal(end.month * 100 + end.day).label('last_key'))
+            for year, start, end in segments
+        ]).subquery('segments')
+        month_day = TaxDate.month * 100 + TaxDate.day
+        paid = exists().where(Payment.tax_date_id == TaxDate.id, Payment.year == segment_rows.c.year)
+        
+        query = select(segment_rows.c.year, Client.id, Client.rif, Client.name, *_REMINDER_COLUMNS).join_from(
+            Client, TaxDate, func.instr(TaxDate.rif_digits, Client.rif_digit) > 0
+        ).join(
+            TaxTable, TaxDate.table_name == TaxTable.name
+        ).join(
+            segment_rows, and_(
+                month_day.between(segment_rows.c.first_key, segment_rows.c.last_key),
+                or_(TaxDate.year.is_(None), TaxDate.year == segment_rows.c.year)
+            )
+        ).where(~paid)
+        
+        with self.get_db() as db:
+            reminders = []
+            for year, client_id, client_rif, client_name, *row in db.execute(query):
+                try:
+                    due_date = date(year, row[3], row[4])
+                except ValueError:
+                    continue  # 29 de febrero en un año no bisiesto
+                reminders.append(Reminder.from_row(
+                    row, due_date=due_date, days_until=(due_date - reference_date).days,
+                    client_id=client_id, client_rif=client_rif, client_name=client_name
+                ))
+        
+        reminders = roll_to_business_days(reminders, reference_date, horizon_days, calendar)
+        reminders.sort(key=lambda r: (r.due_date, r.client_name, r.table))
+        return reminders
+    
+    def check_today(self) -> List[Reminder]:
         """Check for any tax dates due today"""
         today = date.today()
-        return self.get_dates_by_month_day(today.month, today.day)
+        return self.get_dates_by_month_day(today.month, today.day, today.year)
         
-    def check_date(self, month: int, day: int) -> List[Dict[str, Any]]:
+    def check_date(self, month: int, day: int) -> List[Reminder]:
         """Check for tax dates on a specific month and day
         
         Args:
@@ -131,29 +906,74 @@ class DatabaseManager:
             day: Day of month (1-31)
             
         Returns:
-            List of dictionaries containing tax date information
+            Reminder records with the tax date information
         """
         return self.get_dates_by_month_day(month, day)
 
-    def get_dates_by_month_day(self, month: int, day: int) -> List[Dict[str, Any]]:
-        """Get all tax dates for a specific month and day"""
+    def get_dates_by_month_day(self, month: int, day: int, year: int = None) -> List[Reminder]:
+        """Get all tax dates for a specific month and day
+        
+        If year is given, dates from other years' calendars are left out.
+        """
+        # Usar el nombre correcto de la tabla 'tables' en lugar de 'tax_tables'
+        query = select(*_REMINDER_COLUMNS).join_from(
+            TaxDate, TaxTable, TaxDate.table_name == TaxTable.name
+        ).where(
+            TaxDate.month == month,
+            TaxDate.day == day
+        )
+        if year is not None:
+            query = query.where(or_(TaxDate.year.is_(None), TaxDate.year == year))
+        
         with self.get_db() as db:
-            # Usar el nombre correcto de la tabla 'tables' en lugar de 'tax_tables'
-            results = db.query(TaxDate, TaxTable.description).join(
-                TaxTable, TaxDate.table_name == TaxTable.name
-            ).filter(
-                TaxDate.month == month,
-                TaxDate.day == day
-            ).all()
-            
-            return [{
-                'table': date_obj.table_name,
-                'table_description': table_desc,
-                'month': date_obj.month,
-                'day': date_obj.day,
-                'description': date_obj.description
-            } for date_obj, table_desc in results]
+            return [Reminder.from_row(row) for row in db.execute(query)]
     
+    def get_deadline_index(self) -> DeadlineIndex:
+        """Build an in-memory day-of-year index of every tax date with a single query"""
+        query = select(*_REMINDER_COLUMNS).join_from(TaxDate, TaxTable, TaxDate.table_name == TaxTable.name)
+        with self.get_db() as db:
+            return DeadlineIndex(Reminder.from_row(row) for row in db.execute(query))
+
+    def get_occurrences(self, start_year: int, end_year: int, per_client: bool = False,
+                        holidays: Optional[List[date]] = None):
+        """Expand every tax date into concrete due dates for a range of years
+
+        Deadlines falling on weekends or holidays move to the next business day.
+        Requires NumPy, imported only when this method is used.
+
+        Args:
+            start_year: First year to expand
+            end_year: Last year to expand (inclusive)
+            per_client: Pair each occurrence with the clients of matching RIF digit
+            holidays: Non-working days for the business-day roll-forward
+                (defaults to the holidays stored in the database)
+
+        Returns:
+            occurrences.Occurrences with column arrays
+        """
+        import occurrences
+
+        if holidays is None:
+            holidays = [h['date'] for h in self.get_holidays(start_year, end_year + 1)]
+
+        # Solo las columnas que usa la expansión y sin calendarios de otros años: sin objetos ORM
+        query = select(TaxDate.id, TaxDate.month, TaxDate.day, TaxDate.year, TaxDate.rif_digits).where(
+            or_(TaxDate.year.is_(None), TaxDate.year.between(start_year, end_year))
+        )
+        with self.get_db() as db:
+            rows = [row._asdict() for row in db.execute(query)]
+        rows += [{
+            'id': d.id,
+            'month': d.month,
+            'day': d.day,
+            'year': d.year,
+            'rif_digits': d.rif_digits
+        } for d in self.get_archived_dates(range(start_year, end_year + 1))]
+
+        if per_client:
+            return occurrences.expand_for_clients(rows, self.get_clients(), start_year, end_year, holidays)
+        return occurrences.expand(rows, start_year, end_year, holidays)
+
     def get_dates_for_table(self, table_name: str) -> List[Dict[str, Any]]:
         """Get all dates for a specific table"""
         with self.get_db() as db:
@@ -169,31 +989,55 @@ class DatabaseManager:
                 'day': d.day,
                 'description': d.description
             } for d in dates]
+    
+    def get_dates_page(self, offset: int = 0, limit: int = 500) -> Tuple[List[Dict[str, Any]], int]:
+        """Get one page of all tax dates ordered by table, month and day
+        
+        Returns:
+            (rows of the page, total number of dates)
+        """
+        with self.get_db() as db:
+            total = db.query(func.count(TaxDate.id)).scalar()
+            results = db.query(TaxDate, TaxTable.description).join(
+                TaxTable, TaxDate.table_name == TaxTable.name
+            ).order_by(
+                TaxDate.table_name, TaxDate.month, TaxDate.day, TaxDate.id
+            ).offset(offset).limit(limit).all()
+            
+            return [{
+                'id': date_obj.id,
+                'table': date_obj.table_name,
+                'table_description': table_desc,
+                'month': date_obj.month,
+                'day': date_obj.day,
+                'description': date_obj.description,
+                'year': date_obj.year
+            } for date_obj, table_desc in results], total
             
     def clean_database(self) -> bool:
         """Remove all data from the database"""
         try:
-            with self.get_db() as db:
+            with self.session_scope() as db:
+                # El delete masivo no aplica la cascada del ORM: sin esto los pagos quedarían
+                # apuntando a fechas que ya no existen
+                db.query(Payment).delete()
                 # Delete all dates first (due to foreign key constraint)
                 db.query(TaxDate).delete()
                 # Then delete all tables
                 db.query(TaxTable).delete()
-                db.commit()
-                # Recreate default tables
-                self.create_tables()
-                return True
+            # Recreate default tables
+            self.create_tables()
+            return True
         except Exception as e:
             print(f"Error cleaning database: {e}")
-            db.rollback()
             return False
     
     def delete_date(self, date_id: int) -> bool:
         """Delete a tax date by ID"""
-        with self.get_db() as db:
+        with self.session_scope() as db:
             date_obj = db.query(TaxDate).filter(TaxDate.id == date_id).first()
             if not date_obj:
                 return False
                 
             db.delete(date_obj)
-            db.commit()
             return True
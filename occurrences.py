@@ -0,0 +1,157 @@
+"""Expansión vectorizada de las reglas (mes, día) a fechas de vencimiento concretas
+
+TaxDate solo guarda pares (mes, día). Aquí se expanden todas las reglas para un
+rango de años en una sola pasada con arreglos datetime64 de NumPy:
+
+- el 29 de febrero en años no bisiestos (o el 31 en meses de 30 días) no genera
+  ocurrencia, igual que en la ventana de recordatorios y el ICS;
+- si la fecha cae en fin de semana o feriado, el vencimiento pasa al siguiente
+  día hábil (np.busday_offset con roll='forward').
+"""
+from datetime import date
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+# Lunes a viernes
+DEFAULT_WEEKMASK = '1111100'
+
+
+class Occurrences:
+    """Column arrays of concrete occurrences, one entry per (tax date, [client,] year)"""
+
+    def __init__(self, tax_date_id: np.ndarray, client_id: np.ndarray,
+                 nominal_date: np.ndarray, due_date: np.ndarray):
+        self.tax_date_id = tax_date_id
+        self.client_id = client_id          # -1 cuando no se expandió por cliente
+        self.nominal_date = nominal_date    # Fecha del calendario
+        self.due_date = due_date            # Fecha real tras pasar al siguiente día hábil
+
+    def __len__(self) -> int:
+        return len(self.tax_date_id)
+
+    def sorted(self) -> 'Occurrences':
+        """Occurrences ordered by due date"""
+        order = np.argsort(self.due_date, kind='stable')
+        return Occurrences(self.tax_date_id[order], self.client_id[order],
+                           self.nominal_date[order], self.due_date[order])
+
+    def between(self, start: date, end: date) -> 'Occurrences':
+        """Occurrences with a due date in [start, end]"""
+        mask = (self.due_date >= np.datetime64(start, 'D')) & (self.due_date <= np.datetime64(end, 'D'))
+        return Occurrences(self.tax_date_id[mask], self.client_id[mask],
+                           self.nominal_date[mask], self.due_date[mask])
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to a list of dictionaries (only for small result sets)"""
+        return [{
+            'tax_date_id': int(tax_date_id),
+            'client_id': int(client_id) if client_id >= 0 else None,
+            'nominal_date': nominal.astype(date),
+            'due_date': due.astype(date),
+        } for tax_date_id, client_id, nominal, due in zip(
+            self.tax_date_id, self.client_id, self.nominal_date, self.due_date
+        )]
+
+
+def _empty() -> Occurrences:
+    return Occurrences(np.array([], dtype=np.int64), np.array([], dtype=np.int64),
+                       np.array([], dtype='datetime64[D]'), np.array([], dtype='datetime64[D]'))
+
+
+def _digit_masks(rif_digits: Iterable[Optional[str]]) -> np.ndarray:
+    """10-bit mask of the RIF terminal digits of each rule (no bits when None: the firm's own dates)"""
+    masks = []
+    for digits in rif_digits:
+        if not digits:
+            masks.append(0)
+        else:
+            mask = 0
+            for digit in digits:
+                mask |= 1 << int(digit)
+            masks.append(mask)
+    return np.array(masks, dtype=np.int16)
+
+
+def expand(rows: Sequence[Dict[str, Any]], start_year: int, end_year: int,
+           holidays: Optional[Sequence[date]] = None, weekmask: str = DEFAULT_WEEKMASK,
+           roll_forward: bool = True) -> Occurrences:
+    """Expand every rule into its occurrences between start_year and end_year (inclusive)
+
+    Args:
+        rows: Dictionaries with id, month, day and optional year (None = every year)
+        start_year: First year to expand
+        end_year: Last year to expand
+        holidays: Non-working days for the business-day roll-forward
+        weekmask: Working days of the week, Monday first
+        roll_forward: Move deadlines on non-working days to the next business day
+
+    Returns:
+        Occurrences ordered by rule and year
+    """
+    ids = np.fromiter((row['id'] for row in rows), dtype=np.int64, count=len(rows))
+    months = np.fromiter((row['month'] for row in rows), dtype=np.int64, count=len(rows))
+    days = np.fromiter((row['day'] for row in rows), dtype=np.int64, count=len(rows))
+    fixed_years = np.fromiter((row.get('year') or 0 for row in rows), dtype=np.int64, count=len(rows))
+
+    years = np.arange(start_year, end_year + 1, dtype=np.int64)
+    rule_index = np.repeat(np.arange(len(rows)), len(years))
+    occurrence_years = np.tile(years, len(rows))
+
+    # Las reglas de un calendario de un año concreto solo aplican ese año
+    keep = (fixed_years[rule_index] == 0) | (fixed_years[rule_index] == occurrence_years)
+    rule_index = rule_index[keep]
+    occurrence_years = occurrence_years[keep]
+
+    month_offset = (occurrence_years - 1970) * 12 + (months[rule_index] - 1)
+    month_start = month_offset.astype('datetime64[M]').astype('datetime64[D]')
+    next_month_start = (month_offset + 1).astype('datetime64[M]').astype('datetime64[D]')
+    month_length = (next_month_start - month_start).astype(np.int64)
+
+    # Días que no existen ese año (29/2 en año no bisiesto, 31 en mes de 30 días) se omiten
+    exists = days[rule_index] <= month_length
+    rule_index = rule_index[exists]
+    month_start = month_start[exists]
+
+    nominal = month_start + (days[rule_index] - 1)
+    if roll_forward:
+        holiday_array = np.array(list(holidays or ()), dtype='datetime64[D]')
+        due = np.busday_offset(nominal, 0, roll='forward', weekmask=weekmask, holidays=holiday_array)
+    else:
+        due = nominal.copy()
+
+    return Occurrences(ids[rule_index], np.full(len(rule_index), -1, dtype=np.int64), nominal, due)
+
+
+def expand_for_clients(rows: Sequence[Dict[str, Any]], clients: Sequence[Dict[str, Any]],
+                       start_year: int, end_year: int, holidays: Optional[Sequence[date]] = None,
+                       weekmask: str = DEFAULT_WEEKMASK, roll_forward: bool = True) -> Occurrences:
+    """Expand the rules once and pair each occurrence with the clients of matching RIF digit"""
+    base = expand(rows, start_year, end_year, holidays, weekmask, roll_forward)
+    if not len(base) or not clients:
+        return _empty()
+
+    row_position = {row['id']: i for i, row in enumerate(rows)}
+    masks = _digit_masks(row.get('rif_digits') for row in rows)
+    occurrence_masks = masks[np.fromiter((row_position[i] for i in base.tax_date_id.tolist()),
+                                         dtype=np.int64, count=len(base))]
+
+    client_ids = np.fromiter((c['id'] for c in clients), dtype=np.int64, count=len(clients))
+    client_digits = np.fromiter((int(c['rif_digit']) for c in clients), dtype=np.int64, count=len(clients))
+
+    parts = []
+    for digit in range(10):
+        digit_clients = client_ids[client_digits == digit]
+        matching = np.nonzero(occurrence_masks & (1 << digit))[0]
+        if not len(digit_clients) or not len(matching):
+            continue
+        # Producto cartesiano ocurrencias × clientes de este terminal
+        occurrence_index = np.repeat(matching, len(digit_clients))
+        parts.append((occurrence_index, np.tile(digit_clients, len(matching))))
+
+    if not parts:
+        return _empty()
+    occurrence_index = np.concatenate([p[0] for p in parts])
+    client_column = np.concatenate([p[1] for p in parts])
+    return Occurrences(base.tax_date_id[occurrence_index], client_column,
+                       base.nominal_date[occurrence_index], base.due_date[occurrence_index])
@@ -0,0 +1,199 @@
+"""Servicio de recordatorios en segundo plano
+
+Uso:
+    python reminder_daemon.py [--db tax_reminder.db] [--time 08:00] [--lead-days 2]
+                              [--sink modulo:funcion]
+
+Carga el calendario una sola vez, guarda en un min-heap los próximos instantes
+de aviso y duerme hasta el siguiente. Solo recarga cuando cambia tax_reminder.db.
+"""
+import argparse
+import heapq
+import importlib
+import itertools
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Cada cuánto se revisa si el archivo de la base de datos cambió (segundos)
+DEFAULT_POLL_SECONDS = 60
+# Días programados en el heap antes de volver a llenarlo
+DEFAULT_HORIZON_DAYS = 30
+
+Sink = Callable[[Dict[str, Any]], None]
+
+_MONTHS = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+           "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"]
+
+
+def stdout_sink(reminder: Dict[str, Any]):
+    """Default sink: print the reminder on one line"""
+    if reminder['days_until'] == 0:
+        days_text = "hoy"
+    elif reminder['days_until'] == 1:
+        days_text = "mañana"
+    else:
+        days_text = f"en {reminder['days_until']} días"
+
+    line = (f"[{reminder['notify_at']:%Y-%m-%d %H:%M}] 🔔 {reminder['table_description']}: "
+            f"{reminder['day']} de {_MONTHS[reminder['month'] - 1]} ({days_text})")
+    if reminder.get('description'):
+        line += f" - {reminder['description']}"
+    print(line, flush=True)
+
+
+def load_sink(spec: str) -> Sink:
+    """Load a sink from a 'module:function' specification"""
+    module_name, _, attribute = spec.partition(':')
+    if not attribute:
+        raise ValueError(f"Sink inválido '{spec}', use el formato modulo:funcion")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ReminderDaemon:
+    """Emits reminders at their scheduled instant, sleeping in between"""
+
+    def __init__(self, db_path: str, sink: Sink = stdout_sink, notify_time: time = time(8, 0),
+                 lead_days: int = 2, horizon_days: int = DEFAULT_HORIZON_DAYS,
+                 poll_seconds: float = DEFAULT_POLL_SECONDS):
+        self.db_path = db_path
+        self.sink = sink
+        self.notify_time = notify_time
+        self.lead_days = lead_days
+        self.horizon_days = horizon_days
+        self.poll_seconds = poll_seconds
+
+        self._db = None
+        self._heap: List[Tuple[datetime, int, Optional[Dict[str, Any]]]] = []
+        self._counter = itertools.count()  # Desempate estable en el heap
+        self._signature = None
+        self._emitted = set()  # (id, días de anticipación, vencimiento) ya avisados
+        self._stop = threading.Event()
+
+    def _db_signature(self) -> Tuple:
+        """(mtime, size) of the database file and its WAL, to detect changes cheaply"""
+        signature = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload(self, now: Optional[datetime] = None):
+        """Rebuild the heap of reminder instants from the database"""
+        if now is None:
+            now = datetime.now()
+        if self._db is None:
+            from models import DatabaseManager
+            self._db = DatabaseManager(f'sqlite:///{self.db_path}')
+
+        self._signature = self._db_signature()
+        today = now.date()
+        refill_at = datetime.combine(today + timedelta(days=self.horizon_days), time.min)
+
+        self._emitted = {key for key in self._emitted if key[2] >= today}
+
+        heap = []
+        days = self.horizon_days + self.lead_days
+        # Sin las ocurrencias ya pagadas y con los vencimientos pasados al siguiente día hábil
+        for reminder in self._db.get_upcoming(today, days):
+            for lead in range(self.lead_days, -1, -1):
+                notify_at = datetime.combine(reminder['due_date'] - timedelta(days=lead), self.notify_time)
+                if notify_at.date() == today and notify_at < now:
+                    notify_at = now  # Aviso de hoy que se perdió porque el servicio no corría
+                if not now <= notify_at < refill_at:
+                    continue
+                if (reminder['id'], lead, reminder['due_date']) in self._emitted:
+                    continue
+                event = dict(reminder, days_until=lead, notify_at=notify_at)
+                heap.append((notify_at, next(self._counter), event))
+
+        # Evento vacío para volver a llenar el heap al final del horizonte
+        heap.append((refill_at, next(self._counter), None))
+        heapq.heapify(heap)
+        self._heap = heap
+
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """Emit every reminder due at or before now; returns how many were emitted"""
+        if now is None:
+            now = datetime.now()
+        emitted = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, _, event = heapq.heappop(self._heap)
+            if event is None:
+                self.reload(now)
+                continue
+            self._emitted.add((event['id'], event['days_until'], event['due_date']))
+            self.sink(event)
+            emitted += 1
+        return emitted
+
+    def next_instant(self) -> Optional[datetime]:
+        return self._heap[0][0] if self._heap else None
+
+    def run(self):
+        """Main loop: sleep until the next reminder or the next change check"""
+        self.reload()
+        while not self._stop.is_set():
+            self.run_pending()
+
+            now = datetime.now()
+            next_instant = self.next_instant()
+            timeout = self.poll_seconds
+            if next_instant is not None:
+                timeout = max(0.0, min(timeout, (next_instant - now).total_seconds()))
+            if self._stop.wait(timeout):
+                break
+
+            if self._db_signature() != self._signature:
+                self.reload()
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de recordatorios de impuestos")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    parser.add_argument('--time', default='08:00', help="hora de los avisos, HH:MM (por defecto 08:00)")
+    parser.add_argument('--lead-days', type=int, default=2, help="días de anticipación (por defecto 2)")
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL_SECONDS,
+                        help="segundos entre revisiones de cambios en la base de datos")
+    parser.add_argument('--sink', help="función que recibe cada recordatorio, modulo:funcion")
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = os.path.abspath(args.db)
+    else:
+        if getattr(sys, 'frozen', False):
+            base_dir = os.path.dirname(sys.executable)
+        else:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+        db_path = os.path.join(base_dir, 'tax_reminder.db')
+
+    try:
+        notify_time = datetime.strptime(args.time, '%H:%M').time()
+        sink = load_sink(args.sink) if args.sink else stdout_sink
+    except (ValueError, ImportError, AttributeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    daemon = ReminderDaemon(db_path, sink, notify_time, args.lead_days, poll_seconds=args.poll)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+
+    print(f"🔔 Servicio de recordatorios iniciado ({db_path})", flush=True)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    print("👋 Servicio detenido", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Registros livianos de recordatorios
+
+Reminder reemplaza a los diccionarios por fila: usa __slots__ (sin __dict__
+por instancia) y se comporta como un Mapping, así el código que
+hace reminder['table'], reminder.get('description') o dict(reminder) sigue
+funcionando. Los campos que una consulta no llena quedan sin asignar y no
+aparecen en keys(), igual que las claves que antes no se agregaban al dict.
+
+ReminderArray guarda muchos recordatorios por columnas en arrays de la
+biblioteca estándar, con las tablas y terminales de RIF internados, y crea un
+Reminder solo al leer una fila.
+"""
+from array import array
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Columnas de los registros, en el orden de las consultas de recordatorios
+BASE_FIELDS = ('id', 'table', 'table_description', 'month', 'day', 'description', 'year', 'rif_digits')
+FIELDS = BASE_FIELDS + ('due_date', 'days_until', 'nominal_date', 'business_days_until',
+                        'client_id', 'client_rif', 'client_name')
+_EXTRA_FIELDS = FIELDS[len(BASE_FIELDS):]
+_FIELD_SET = frozenset(FIELDS)
+_UNSET = object()
+
+
+class Reminder(Mapping):
+    """Reminder record with attribute and mapping access
+
+    Only the code that creates a record fills in its fields (e.g. due_date on
+    a record just read from a ReminderArray); once handed out, treat it as
+    read-only and use replace() to get a changed copy.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, id, table, table_description, month, day, description, year, rif_digits, **fields):
+        self.id = id
+        self.table = table
+        self.table_description = table_description
+        self.month = month
+        self.day = day
+        self.description = description
+        self.year = year
+        self.rif_digits = rif_digits
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_row(cls, row: Iterable[Any], **fields) -> 'Reminder':
+        """Build a record from a (id, table, table_description, month, day, description, year, rif_digits) row"""
+        return cls(*row, **fields)
+
+    def replace(self, **fields) -> 'Reminder':
+        """Copy of the record with some fields set or changed"""
+        record = Reminder(self.id, self.table, self.table_description, self.month, self.day,
+                          self.description, self.year, self.rif_digits)
+        for name in _EXTRA_FIELDS:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                setattr(record, name, value)
+        for name, value in fields.items():
+            setattr(record, name, value)
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if hasattr(self, name):
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Reminder({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+    def __reduce__(self):
+        return _restore, (dict(self),)
+
+
+def _restore(fields: Dict[str, Any]) -> Reminder:
+    return Reminder(**fields)
+
+
+def with_fields(reminder: Mapping, **fields) -> Mapping:
+    """Copy a Reminder or a dict with some fields set or changed"""
+    if isinstance(reminder, Reminder):
+        return reminder.replace(**fields)
+    return {**reminder, **fields}
+
+
+class ReminderArray:
+    """Column-oriented container of reminders with a small per-row footprint
+
+    Integer fields live in typed arrays (a None year is stored as 0), due
+    dates as ordinals, and repeated strings (table and its description, RIF
+    digits) as indexes into interned lists. Only the row fields and due_date
+    are kept. Indexing or iterating yields Reminder records.
+    """
+
+    def __init__(self, reminders: Iterable[Mapping] = ()):
+        self._ids = array('q')
+        self._months = array('b')
+        self._days = array('b')
+        self._years = array('h')          # 0 = se repite todos los años
+        self._tables = array('H')         # Índice en _table_values
+        self._rif_digits = array('H')     # Índice en _rif_values
+        self._due_dates = array('i')      # Ordinal; 0 = sin fecha
+        self._descriptions: List[Optional[str]] = []
+        self._table_values: List[Tuple[str, Optional[str]]] = []
+        self._rif_values: List[Optional[str]] = []
+        self._table_index: Dict[Tuple[str, Optional[str]], int] = {}
+        self._rif_index: Dict[Optional[str], int] = {}
+        self.extend(reminders)
+
+    @staticmethod
+    def _intern(values: list, index: dict, value) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(values)
+            values.append(value)
+        return position
+
+    def append(self, reminder: Mapping):
+        due_date = reminder.get('due_date')
+        self._ids.append(reminder['id'])
+        self._months.append(reminder['month'])
+        self._days.append(reminder['day'])
+        self._years.append(reminder.get('year') or 0)
+        self._tables.append(self._intern(self._table_values, self._table_index,
+                                         (reminder['table'], reminder.get('table_description'))))
+        self._rif_digits.append(self._intern(self._rif_values, self._rif_index, reminder.get('rif_digits')))
+        self._due_dates.append(due_date.toordinal() if due_date else 0)
+        self._descriptions.append(reminder.get('description'))
+
+    def extend(self, reminders: Iterable[Mapping]):
+        for reminder in reminders:
+            self.append(reminder)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        table, table_description = self._table_values[self._tables[i]]
+        year = self._years[i]
+        due = self._due_dates[i]
+        record = Reminder(self._ids[i], table, table_description, self._months[i], self._days[i],
+                          self._descriptions[i], year or None, self._rif_values[self._rif_digits[i]])
+        if due:
+            record.due_date = date.fromordinal(due)
+        return record
+
+    def __iter__(self) -> Iterator[Reminder]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns (not counting shared strings)"""
+        arrays = (self._ids, self._months, self._days, self._years, self._tables,
+                  self._rif_digits, self._due_dates)
+        return sum(a.itemsize * len(a) for a in arrays) + 8 * len(self._descriptions)
@@ -0,0 +1,240 @@
+"""Servicio HTTP/JSON local con los vencimientos
+
+Uso:
+    python reminder_server.py [--host 127.0.0.1] [--port 8765] [--db tax_reminder.db]
+
+Rutas:
+    GET /upcoming?days=N       vencimientos de hoy y los próximos N-1 días (por defecto 3)
+    GET /tables                tablas de impuestos
+    GET /dates[?table=nombre]  fechas registradas, todas o de una tabla
+
+Las respuestas se guardan en caché por (ruta, fecha de referencia, versión de la
+base de datos) y llevan ETag: un cliente que repite la consulta con
+If-None-Match recibe 304 sin cuerpo mientras nada cambie.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from reminder_snapshot import db_signature
+
+DEFAULT_PORT = 8765
+# Máximo de días que se puede pedir en /upcoming
+MAX_UPCOMING_DAYS = 366
+# Respuestas distintas que se mantienen en caché
+CACHE_SIZE = 256
+
+
+class BadRequest(Exception):
+    """Invalid query parameters; reported as 400"""
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        return dict(value)  # reminder_records.Reminder
+    raise TypeError(f"{type(value).__name__} no es serializable")
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of encoded responses keyed by (path, date, DB version)"""
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._entries: 'OrderedDict[Tuple, Tuple[str, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._building: Dict[Tuple, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Tuple, build: Callable[[], Any]) -> Tuple[str, bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            # Un solo hilo arma cada respuesta; los demás esperan su resultado
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            try:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self.hits += 1
+                        return entry
+                    self.misses += 1
+
+                body = json.dumps(build(), ensure_ascii=False, default=_json_default).encode('utf-8')
+                entry = ('"' + hashlib.sha1(body).hexdigest()[:20] + '"', body)
+
+                with self._lock:
+                    self._entries[key] = entry
+                    while len(self._entries) > self.size:
+                        self._entries.popitem(last=False)
+                return entry
+            finally:
+                # También si build falla: la próxima petición vuelve a intentarlo con un lock nuevo
+                with self._lock:
+                    if self._building.get(key) is building:
+                        del self._building[key]
+
+
+class ReminderService:
+    """Builds the JSON documents of each route from a DatabaseManager"""
+
+    def __init__(self, db_path: str):
+        from models import DatabaseManager
+
+        self.db_path = db_path
+        self.db = DatabaseManager(f'sqlite:///{db_path}')
+        self.cache = ResponseCache()
+
+    def version(self) -> str:
+        """Cheap version of the database file; changes after every write"""
+        return json.dumps(db_signature(self.db_path))
+
+    def upcoming(self, days: int, today: date) -> Dict[str, Any]:
+        return {
+            'reference_date': today,
+            'days': days,
+            'reminders': self.db.get_upcoming(today, days),
+            'client_reminders': self.db.get_upcoming_for_clients(today, days),
+        }
+
+    def tables(self) -> Dict[str, Any]:
+        return {'tables': self.db.get_tables()}
+
+    def dates(self, table: Optional[str]) -> Dict[str, Any]:
+        if table:
+            if table not in {t['name'] for t in self.db.get_tables()}:
+                raise BadRequest(f"La tabla '{table}' no existe")
+            return {'table': table, 'dates': self.db.get_dates_for_table(table)}
+        rows, total = self.db.get_dates_page(0, sys.maxsize)
+        return {'dates': rows, 'total': total}
+
+    def route(self, path: str, query: Dict[str, list]) -> Tuple[Tuple, Callable[[], Any]]:
+        """Return (cache key, builder) for a request
+
+        Raises:
+            KeyError: Unknown path
+            BadRequest: Invalid parameters
+        """
+        today = date.today()
+        if path == '/upcoming':
+            try:
+                days = int(query.get('days', ['3'])[0])
+            except ValueError:
+                raise BadRequest("days debe ser un número entero")
+            if not 1 <= days <= MAX_UPCOMING_DAYS:
+                raise BadRequest(f"days debe estar entre 1 y {MAX_UPCOMING_DAYS}")
+            return (path, days, today), lambda: self.upcoming(days, today)
+        if path == '/tables':
+            return (path,), self.tables
+        if path == '/dates':
+            table = query.get('table', [None])[0]
+            return (path, table), lambda: self.dates(table)
+        raise KeyError(path)
+
+
+class ReminderRequestHandler(BaseHTTPRequestHandler):
+    server_version = 'TaxReminder/1.0'
+    protocol_version = 'HTTP/1.1'  # Conexiones persistentes para los clientes que consultan seguido
+    disable_nagle_algorithm = True  # Cabeceras y cuerpo salen en escrituras separadas
+    service: ReminderService = None  # Asignado por make_server
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            key, build = self.service.route(url.path.rstrip('/') or '/', parse_qs(url.query))
+        except KeyError:
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Ruta desconocida: {url.path}"})
+        except BadRequest as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+
+        # Un KeyError dentro de una consulta es un error del servidor, no una ruta desconocida
+        try:
+            etag, body = self.service.cache.get_or_build(key + (self.service.version(),), build)
+        except BadRequest as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+        except Exception as e:
+            return self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')  # Revalidar siempre con If-None-Match
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, document: Dict[str, Any]):
+        body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Cientos de clientes consultando llenarían la consola
+
+
+class ReminderHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Muchos clientes conectando a la vez
+
+
+def make_server(db_path: str, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> ReminderHTTPServer:
+    """Create the threaded HTTP server; call serve_forever() to run it"""
+    handler = type('Handler', (ReminderRequestHandler,), {'service': ReminderService(db_path)})
+    return ReminderHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP de recordatorios de impuestos")
+    parser.add_argument('--host', default='127.0.0.1', help="dirección de escucha (por defecto 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"puerto (por defecto {DEFAULT_PORT})")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = os.path.abspath(args.db)
+    else:
+        if getattr(sys, 'frozen', False):
+            base_dir = os.path.dirname(sys.executable)
+        else:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+        db_path = os.path.join(base_dir, 'tax_reminder.db')
+
+    server = make_server(db_path, args.host, args.port)
+    print(f"🌐 Servicio de recordatorios en http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    print("👋 Servicio detenido", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Instantánea en disco de los próximos recordatorios
+
+Guarda junto a tax_reminder.db un JSON con los vencimientos de las próximas
+semanas ya calculados y pasados al siguiente día hábil. La firma del archivo (contador de cambios de la cabecera
+SQLite, tamaño y fecha de modificación del .db y de su WAL) indica si sigue
+vigente, así las vistas cortas pueden mostrar los recordatorios sin abrir la
+base de datos. DatabaseManager solo la borra al confirmar una escritura; la
+siguiente lectura de una vista corta la reconstruye.
+"""
+import json
+import os
+from datetime import date, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+# Días cubiertos por la instantánea a partir de la fecha de referencia
+SNAPSHOT_DAYS = 28
+_FORMAT_VERSION = 2
+_DATE_FIELDS = ('due_date', 'nominal_date')
+
+
+def snapshot_path(db_path: str) -> str:
+    """Path of the snapshot file of a database, e.g. tax_reminder.snapshot.json"""
+    return os.path.splitext(db_path)[0] + '.snapshot.json'
+
+
+def db_signature(db_path: str) -> Optional[List]:
+    """Cheap fingerprint of the database file without opening it with SQLite"""
+    try:
+        stat = os.stat(db_path)
+        with open(db_path, 'rb') as f:
+            header = f.read(28)
+    except OSError:
+        return None
+    # Bytes 24-27 de la cabecera: contador de cambios del archivo
+    change_counter = int.from_bytes(header[24:28], 'big') if len(header) == 28 else 0
+
+    try:
+        wal_stat = os.stat(db_path + '-wal')
+        wal = [wal_stat.st_mtime_ns, wal_stat.st_size] if wal_stat.st_size else None
+    except OSError:
+        wal = None  # Un WAL vacío o inexistente no tiene cambios pendientes
+
+    return [change_counter, stat.st_mtime_ns, stat.st_size, wal]
+
+
+def _serialized(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [dict(row, **{name: row[name].isoformat() for name in _DATE_FIELDS if name in row}) for row in rows]
+
+
+def _window(reminders: List[Dict[str, Any]], reference_date: date, horizon_days: int,
+            business_days_before: int = 0) -> List[Dict[str, Any]]:
+    """Reminders of the window with their counts relative to reference_date
+
+    Args:
+        business_days_before: Business days between the snapshot's reference
+            date and reference_date, to subtract from business_days_until
+    """
+    end = reference_date + timedelta(days=horizon_days - 1)
+    window = []
+    for reminder in reminders:
+        due_date = date.fromisoformat(reminder['due_date'])
+        if reference_date <= due_date <= end:
+            reminder = dict(reminder)
+            for name in _DATE_FIELDS:
+                if name in reminder:
+                    reminder[name] = date.fromisoformat(reminder[name])
+            reminder['days_until'] = (due_date - reference_date).days
+            if 'business_days_until' in reminder:
+                reminder['business_days_until'] -= business_days_before
+            window.append(reminder)
+    return window
+
+
+def load_snapshot(db_path: str, reference_date: date = None,
+                  horizon_days: int = 3) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """Get the calendar and client reminders of the window from the snapshot
+
+    Returns:
+        (calendar reminders, client reminders), or None if the snapshot is
+        missing, stale or does not cover the requested window
+    """
+    if reference_date is None:
+        reference_date = date.today()
+    try:
+        with open(snapshot_path(db_path), encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if snapshot.get('format') != _FORMAT_VERSION or snapshot.get('signature') != db_signature(db_path):
+        return None
+    start = date.fromisoformat(snapshot['reference_date'])
+    covered_until = start + timedelta(days=snapshot['days'] - 1)
+    if not start <= reference_date or reference_date + timedelta(days=horizon_days - 1) > covered_until:
+        return None
+
+    business_days_before = snapshot['business_days'][(reference_date - start).days]
+    return (_window(snapshot['reminders'], reference_date, horizon_days, business_days_before),
+            _window(snapshot['client_reminders'], reference_date, horizon_days, business_days_before))
+
+
+def save_snapshot(db_path: str, reference_date: date, reminders: List[Dict[str, Any]],
+                  client_reminders: List[Dict[str, Any]], business_days: List[int],
+                  signature: Optional[List] = None):
+    """Write the snapshot atomically next to the database
+
+    Args:
+        business_days: Business days between reference_date and each covered
+            day, one entry per day of the snapshot
+    """
+    snapshot = {
+        'format': _FORMAT_VERSION,
+        'signature': signature if signature is not None else db_signature(db_path),
+        'reference_date': reference_date.isoformat(),
+        'days': len(business_days),
+        'business_days': business_days,
+        'reminders': _serialized(reminders),
+        'client_reminders': _serialized(client_reminders),
+    }
+    path = snapshot_path(db_path)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def invalidate_snapshot(db_path: str):
+    """Delete the snapshot so the next read rebuilds it from the database"""
+    try:
+        os.remove(snapshot_path(db_path))
+    except FileNotFoundError:
+        pass
+
+
+def refresh_snapshot(db_path: str, reference_date: date = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Rebuild the snapshot from the database and return its reminders"""
+    from fast_reader import open_readonly, read_window
+
+    if reference_date is None:
+        reference_date = date.today()
+    # Firma tomada antes de leer: si alguien escribe mientras tanto, la instantánea queda vencida
+    signature = db_signature(db_path)
+    connection = open_readonly(db_path)
+    try:
+        reminders, client_reminders, calendar = read_window(connection, reference_date, SNAPSHOT_DAYS)
+    finally:
+        connection.close()
+    business_days = [calendar.business_days_between(reference_date, reference_date + timedelta(days=i))
+                     for i in range(SNAPSHOT_DAYS)]
+    try:
+        save_snapshot(db_path, reference_date, reminders, client_reminders, business_days, signature)
+    except OSError:
+        pass  # Carpeta de solo lectura: se sigue leyendo de la base de datos
+    return reminders, client_reminders
+
+
+def read_upcoming_cached(db_path: str, reference_date: date = None,
+                         horizon_days: int = 3) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Get the window from the snapshot, rebuilding it from the database when stale
+
+    Raises:
+        fast_reader.NeedsMigration: If the database has to be created or upgraded first
+    """
+    if reference_date is None:
+        reference_date = date.today()
+    if horizon_days > SNAPSHOT_DAYS:
+        from fast_reader import read_upcoming
+        return read_upcoming(db_path, reference_date, horizon_days)
+
+    cached = load_snapshot(db_path, reference_date, horizon_days)
+    if cached is not None:
+        return cached
+
+    reminders, client_reminders = refresh_snapshot(db_path, reference_date)
+    return (_window(_serialized(reminders), reference_date, horizon_days),
+            _window(_serialized(client_reminders), reference_date, horizon_days))
@@ -0,0 +1,226 @@
+"""Importador del calendario SENIAT de Sujetos Pasivos Especiales (SPE) en PDF
+
+Uso:
+    python spe_importer.py SPE-2025.pdf [--year 2025] [--db tax_reminder.db] [--workers N]
+
+El calendario trae una tabla por obligación: un encabezado con el nombre de la
+obligación, una fila con los grupos de terminales de RIF ("0 y 1", "2 y 3", ...)
+y una fila por mes con el día de vencimiento de cada grupo:
+
+    RETENCIONES DE IVA - PRIMERA QUINCENA
+    Último dígito del RIF   0 y 5   1 y 6   2 y 7   3 y 8   4 y 9
+    Enero                   20      21      22      23      24
+    ...
+
+Las páginas se leen una a una en procesos separados y todas las fechas se
+insertan en tax_dates en una sola transacción.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
+
+MONTHS = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4, 'mayo': 5, 'junio': 6,
+    'julio': 7, 'agosto': 8, 'septiembre': 9, 'setiembre': 9, 'octubre': 10,
+    'noviembre': 11, 'diciembre': 12,
+}
+
+# Grupo de terminales: "0", "0 y 5", "0-5", "0, 5", "0/5"
+_DIGIT_GROUP = re.compile(r'\d(?:\s*(?:y|,|-|–|/)\s*\d)*')
+_DIGIT_HEADER = re.compile(r'd[ií]gitos?|terminal', re.IGNORECASE)
+_MONTH_ROW = re.compile(r'^\s*([A-Za-zÁÉÍÓÚáéíóú]+)\b(.*)$')
+_DAYS = re.compile(r'\b([0-3]?\d)\b')
+_YEAR = re.compile(r'\b(20\d{2})\b')
+# Terminales de una obligación sin fila de grupos
+ALL_DIGITS = '0123456789'
+
+_reader = None  # PdfReader abierto una vez por proceso trabajador
+
+
+def _normalize(text: str) -> str:
+    """Lowercase text without accents"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def obligation_table_name(title: str) -> str:
+    """Build the TaxTable name for an obligation title, e.g. 'spe_retenciones_de_iva'"""
+    slug = re.sub(r'[^a-z0-9]+', '_', _normalize(title)).strip('_')
+    return f"spe_{slug}"[:50]
+
+
+def parse_page_text(text: str, year: int) -> List[Dict[str, Any]]:
+    """Extract the deadlines of one calendar page
+
+    Tables without a terminal-digit header apply to every taxpayer and get
+    all ten digits.
+
+    Returns:
+        List of dictionaries with obligation, month, day and rif_digits
+    """
+    records = []
+    obligation = None
+    groups: List[str] = []
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        if _DIGIT_HEADER.search(line):
+            groups = [re.sub(r'\D', '', group) for group in _DIGIT_GROUP.findall(line)]
+            continue
+
+        match = _MONTH_ROW.match(line)
+        month = MONTHS.get(_normalize(match.group(1))) if match else None
+        if month is not None:
+            if obligation is None:
+                continue
+            days = [int(d) for d in _DAYS.findall(match.group(2))]
+            # Sin fila de terminales la obligación es de todos los contribuyentes: se guardan
+            # los diez dígitos, porque NULL es para las fechas propias de la firma, sin clientes
+            cells = zip(groups, days) if groups else ((ALL_DIGITS, day) for day in days)
+            for digits, day in cells:
+                try:
+                    date(year, month, day)
+                except ValueError:
+                    continue  # Celda mal leída del PDF
+                records.append({
+                    'obligation': obligation,
+                    'month': month,
+                    'day': day,
+                    'rif_digits': ''.join(sorted(set(digits))),
+                })
+            continue
+
+        # Cualquier otra línea con letras inicia una nueva obligación
+        if re.search(r'[A-Za-z]{3,}', line) and not _DAYS.fullmatch(line):
+            obligation = line[:200]
+            groups = []
+
+    return records
+
+
+def _init_worker(pdf_path: str):
+    global _reader
+    from pypdf import PdfReader
+    _reader = PdfReader(pdf_path)
+
+
+def _parse_page(args: Tuple[int, int]) -> List[Dict[str, Any]]:
+    page_number, year = args
+    text = _reader.pages[page_number].extract_text() or ''
+    return parse_page_text(text, year)
+
+
+def _count_pages(pdf_path: str) -> int:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("Se necesita el paquete 'pypdf' para leer el calendario: pip install pypdf")
+    return len(PdfReader(pdf_path).pages)
+
+
+def parse_calendar(pdf_path: str, year: int, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Parse every page of the calendar PDF, in parallel when it has several pages"""
+    page_count = _count_pages(pdf_path)
+    tasks = [(page, year) for page in range(page_count)]
+
+    if workers == 1 or page_count <= 1:
+        _init_worker(pdf_path)
+        pages = map(_parse_page, tasks)
+        return [record for page in pages for record in page]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pdf_path,)) as pool:
+        return [record for page in pool.map(_parse_page, tasks) for record in page]
+
+
+def _merge_records(records: List[Dict[str, Any]], year: int) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Group the terminal digits that share an obligation and day into one tax date"""
+    merged: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+    tables: Dict[str, str] = {}
+
+    for record in records:
+        table_name = obligation_table_name(record['obligation'])
+        tables.setdefault(table_name, f"{record['obligation']} (SPE {year})")
+
+        key = (table_name, record['month'], record['day'])
+        row = merged.get(key)
+        if row is None:
+            merged[key] = {
+                'table_name': table_name,
+                'month': record['month'],
+                'day': record['day'],
+                'year': year,
+                'rif_digits': record['rif_digits'],
+                'description': record['obligation'],
+            }
+        else:
+            row['rif_digits'] = ''.join(sorted(set(row['rif_digits'] + record['rif_digits'])))
+
+    return list(merged.values()), tables
+
+
+def import_spe_calendar(db, pdf_path: str, year: Optional[int] = None,
+                        workers: Optional[int] = None) -> Dict[str, int]:
+    """Import the SPE calendar PDF into tax_dates in a single transaction
+
+    Args:
+        db: DatabaseManager to write to
+        pdf_path: Path to the SENIAT calendar PDF
+        year: Calendar year (inferred from the file name when omitted)
+        workers: Worker processes for page parsing (defaults to one per core)
+
+    Returns:
+        Dictionary with the number of parsed deadlines, inserted rows and tables
+    """
+    if year is None:
+        match = _YEAR.search(os.path.basename(pdf_path))
+        if not match:
+            raise ValueError("No se pudo deducir el año del calendario; use --year")
+        year = int(match.group(1))
+
+    records = parse_calendar(pdf_path, year, workers)
+    if not records:
+        raise ValueError(
+            "No se encontraron vencimientos en el PDF. Verifique que tenga texto "
+            "extraíble (los PDF escaneados o sin mapa de caracteres no se pueden leer)."
+        )
+
+    rows, tables = _merge_records(records, year)
+    inserted = db.bulk_add_dates(rows, tables)
+    return {'parsed': len(records), 'dates': len(rows), 'inserted': inserted, 'tables': len(tables)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa el calendario SPE del SENIAT a tax_reminder.db")
+    parser.add_argument('pdf', help="ruta del PDF del calendario (e.g. SPE-2025.pdf)")
+    parser.add_argument('--year', type=int, help="año del calendario (por defecto se toma del nombre del archivo)")
+    parser.add_argument('--db', help="ruta de la base de datos (por defecto tax_reminder.db del proyecto)")
+    parser.add_argument('--workers', type=int, help="procesos para leer las páginas (por defecto uno por núcleo)")
+    args = parser.parse_args()
+
+    from models import DatabaseManager
+    db = DatabaseManager(f'sqlite:///{os.path.abspath(args.db)}' if args.db else None)
+
+    start = time.perf_counter()
+    try:
+        report = import_spe_calendar(db, args.pdf, args.year, args.workers)
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {report['parsed']} vencimientos leídos en {report['tables']} obligaciones")
+    print(f"   {report['inserted']} de {report['dates']} fechas nuevas insertadas en {elapsed:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""Fixtures compartidas de las pruebas
+
+Uso:
+    python -m pytest -q
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of an empty tax_reminder.db in a temporary directory"""
+    return str(tmp_path / 'tax_reminder.db')
+
+
+@pytest.fixture
+def db(db_path):
+    """DatabaseManager on a new database file with the current schema"""
+    from models import DatabaseManager
+    return DatabaseManager(f'sqlite:///{db_path}')
+
+
+def add_dates(db, rows, tables=None):
+    """Insert tax dates (and their tables) and return their ids in insertion order"""
+    from models import TaxDate
+
+    rows = list(rows)
+    tables = tables or {row['table_name']: row['table_name'] for row in rows}
+    with db.get_db() as session:
+        before = session.query(TaxDate.id).order_by(TaxDate.id.desc()).first()
+    db.bulk_add_dates(rows, tables)
+    with db.get_db() as session:
+        query = session.query(TaxDate.id).order_by(TaxDate.id)
+        if before is not None:
+            query = query.filter(TaxDate.id > before[0])
+        return [tax_date_id for (tax_date_id,) in query]
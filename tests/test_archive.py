@@ -0,0 +1,104 @@
+import os
+import sqlite3
+from datetime import date
+
+import pytest
+
+import archive
+from conftest import add_dates
+
+
+@pytest.fixture
+def archived_db(db):
+    recurring, dated_2023, dated_2024 = add_dates(db, [
+        {'table_name': 'monthly', 'month': 3, 'day': 15},
+        {'table_name': 'spe', 'month': 3, 'day': 20, 'year': 2023, 'rif_digits': '5'},
+        {'table_name': 'spe', 'month': 3, 'day': 20, 'year': 2024, 'rif_digits': '5'},
+    ])
+    db.record_payment(recurring, 2023)
+    db.record_payment(recurring, 2024)
+    db.record_payment(dated_2023, 2023)
+    db.ids = {'recurring': recurring, '2023': dated_2023, '2024': dated_2024}
+    return db
+
+
+def test_archive_moves_dates_and_payments_of_the_year(archived_db, db_path):
+    ids = archived_db.ids
+    assert archived_db.archive_year(2023) == {'dates': 1, 'payments': 2}
+    assert os.path.exists(archive.archive_path(db_path, 2023))
+    assert archived_db.get_archived_years() == [2023]
+
+    connection = sqlite3.connect(db_path)
+    try:
+        assert {i for (i,) in connection.execute("SELECT id FROM tax_dates")} == {ids['recurring'], ids['2024']}
+        assert set(connection.execute("SELECT tax_date_id, year FROM payments")) == {(ids['recurring'], 2024)}
+    finally:
+        connection.close()
+
+    assert [r['id'] for r in archived_db.get_archived_dates([2023])] == [ids['2023']]
+    assert archived_db.get_paid_occurrences([2023, 2024]) == {
+        (ids['recurring'], 2023), (ids['2023'], 2023), (ids['recurring'], 2024)
+    }
+
+
+def test_archived_year_still_shows_in_occurrences(archived_db):
+    archived_db.archive_year(2023)
+    occurrences = archived_db.get_occurrences(2023, 2023).to_records()
+    assert {o['tax_date_id'] for o in occurrences} == {archived_db.ids['recurring'], archived_db.ids['2023']}
+
+
+def test_archived_ids_are_never_reused(db, db_path):
+    # La fecha archivada es la de id más alto
+    recurring, dated = add_dates(db, [
+        {'table_name': 'monthly', 'month': 3, 'day': 15},
+        {'table_name': 'spe', 'month': 3, 'day': 20, 'year': 2023},
+    ])
+    db.record_payment(dated, 2023)
+    db.archive_year(2023)
+
+    new_id, = add_dates(db, [{'table_name': 'monthly', 'month': 4, 'day': 15}])
+    assert new_id > dated
+    assert db.get_paid_occurrences([2023]) == {(dated, 2023)}
+    assert new_id not in {tax_date_id for tax_date_id, _ in db.get_paid_occurrences([2023])}
+
+
+def test_archiving_again_moves_what_was_added(archived_db):
+    archived_db.archive_year(2023)
+    late, = add_dates(archived_db, [{'table_name': 'spe', 'month': 6, 'day': 1, 'year': 2023}])
+    assert archived_db.archive_year(2023) == {'dates': 1, 'payments': 0}
+    assert {r['id'] for r in archived_db.get_archived_dates([2023])} == {archived_db.ids['2023'], late}
+
+
+def test_open_year_cannot_be_archived(db):
+    with pytest.raises(ValueError):
+        db.archive_year(date.today().year)
+    assert not archive.is_closed(2024, date(2025, 1, 31))
+    assert archive.is_closed(2024, date(2025, 2, 1))
+
+
+def test_interrupted_move_loses_nothing_and_can_be_completed(archived_db, db_path):
+    # El borrado falla después de que la copia ya se confirmó en el archivo
+    connection = sqlite3.connect(db_path)
+    connection.execute("CREATE TRIGGER tr_fail BEFORE DELETE ON payments BEGIN SELECT RAISE(ABORT, 'falla'); END")
+    connection.commit()
+    with pytest.raises(sqlite3.IntegrityError):
+        archived_db.archive_year(2023)
+
+    ids = archived_db.ids
+    archived = sqlite3.connect(archive.archive_path(db_path, 2023))
+    try:
+        assert [i for (i,) in archived.execute("SELECT id FROM tax_dates")] == [ids['2023']]
+        assert archived.execute("SELECT count(*) FROM payments").fetchone()[0] == 2
+    finally:
+        archived.close()
+    assert connection.execute("SELECT count(*) FROM tax_dates WHERE year = 2023").fetchone()[0] == 1
+    assert connection.execute("SELECT count(*) FROM payments").fetchone()[0] == 3
+
+    connection.execute("DROP TRIGGER tr_fail")
+    connection.commit()
+    connection.close()
+    assert archived_db.archive_year(2023) == {'dates': 1, 'payments': 2}
+    assert [r['id'] for r in archived_db.get_archived_dates([2023])] == [ids['2023']]
+    assert archived_db.get_paid_occurrences([2023, 2024]) == {
+        (ids['recurring'], 2023), (ids['2023'], 2023), (ids['recurring'], 2024)
+    }
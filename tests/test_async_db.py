@@ -0,0 +1,22 @@
+import asyncio
+
+from async_db import AsyncDatabaseManager
+
+
+def test_identical_reads_in_flight_share_one_query(db, db_path):
+    db.add_table('monthly', 'Mensual')
+    db.add_date('monthly', 1, 15, 'IVA')
+
+    async def scenario():
+        async with AsyncDatabaseManager(f'sqlite:///{db_path}') as async_db:
+            results = await asyncio.gather(*[async_db.get_dates_for_table('monthly') for _ in range(50)])
+            assert (async_db.queries, async_db.coalesced) == (1, 49)
+            assert all(result is results[0] for result in results)
+
+            # Las escrituras no se agrupan, y una lectura posterior vuelve a consultar
+            assert await async_db.add_date('monthly', 2, 15, 'ISLR')
+            dates = await async_db.get_dates_for_table('monthly')
+            assert async_db.queries == 3
+            return [d['description'] for d in dates]
+
+    assert asyncio.run(scenario()) == ['IVA', 'ISLR']
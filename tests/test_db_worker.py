@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from db_worker import DBWorker
+
+
+class _Root:
+    """Stand-in for the Tk root: runs after() callbacks when pumped"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def report_callback_exception(self, *exc_info):
+        raise AssertionError(exc_info)
+
+    def pump(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.callbacks:
+            assert time.monotonic() < deadline
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.001)
+
+
+@pytest.fixture
+def root():
+    return _Root()
+
+
+def test_results_and_errors_come_back_on_the_calling_thread(root):
+    busy, results = [], []
+    worker = DBWorker(root, on_busy=busy.append)
+    caller = threading.get_ident()
+
+    worker.submit(lambda a, b: (a + b, threading.get_ident()), 2, 3, on_done=results.append)
+    worker.submit(int, 'x', on_error=lambda e: results.append((type(e), threading.get_ident())))
+    root.pump()
+    worker.shutdown()
+
+    (total, worker_thread), error = results
+    assert total == 5 and worker_thread != caller
+    assert error == (ValueError, caller)
+    assert busy == [True, False]
+
+
+def test_a_newer_job_with_the_same_key_supersedes_the_previous_one(root):
+    release = threading.Event()
+    results = []
+    worker = DBWorker(root)
+
+    worker.submit(release.wait, 5, on_done=lambda _: results.append('bloqueo'))
+    first = worker.submit(lambda: 'primera', key='refresh', on_done=results.append)
+    worker.submit(lambda: 'segunda', key='refresh', on_done=results.append)
+    release.set()
+    root.pump()
+    worker.shutdown()
+
+    assert first.cancelled
+    assert results == ['bloqueo', 'segunda']
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from conftest import add_dates
+from gui_main import TaxReminderMainGUI
+
+
+def test_save_date_duplicates_follow_the_year(db):
+    recurring, dated = add_dates(db, [
+        {'table_name': 'iva', 'month': 3, 'day': 15},
+        {'table_name': 'iva', 'month': 4, 'day': 10, 'year': 2025},
+    ])
+    app = SimpleNamespace(db_manager=db)
+
+    def save(date_id, month, day):
+        return TaxReminderMainGUI.save_date(app, date_id, 'iva', month, day, None)
+
+    # Una fecha de todos los años no choca con la misma fecha de un calendario de 2025
+    assert not save(None, 3, 15)
+    assert save(None, 4, 10)
+    # Al editar se compara con el año de la fecha editada, sin contarse a sí misma
+    assert save(dated, 3, 15)
+    assert save(recurring, 3, 15)
+    assert not save(recurring, 4, 10)
+
+    rows, total = db.get_dates_page(0, 10)
+    assert total == 3
+    assert sorted((r['month'], r['day'], r['year'] or 0) for r in rows) == [(3, 15, 0), (3, 15, 2025), (4, 10, 0)]
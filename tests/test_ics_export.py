@@ -0,0 +1,55 @@
+import os
+from datetime import date
+
+from conftest import add_dates
+from ics_export import export_ics, iter_ics
+
+
+def _events(text):
+    return text.split('BEGIN:VEVENT\r\n')[1:]
+
+
+def test_events_are_rolled_folded_and_marked_when_paid(db):
+    long_text = 'Declaración definitiva de ISLR, con anexos; ' * 4
+    saturday, monthly = add_dates(db, [
+        {'table_name': 'monthly', 'month': 1, 'day': 11, 'description': long_text},  # Sábado en 2025
+        {'table_name': 'monthly', 'month': 2, 'day': 29},
+    ], {'monthly': 'Mensual'})
+    db.record_payment(saturday, 2025)
+
+    text = ''.join(iter_ics(db, 2024, 2025))
+    assert text.startswith('BEGIN:VCALENDAR\r\n') and text.endswith('END:VCALENDAR\r\n')
+    assert all(len(line.encode('utf-8')) <= 75 for line in text.split('\r\n'))
+
+    events = {block.split('\r\n')[0]: block for block in _events(text)}
+    assert set(events) == {f'UID:{saturday}-2024@taxreminder', f'UID:{saturday}-2025@taxreminder',
+                           f'UID:{monthly}-2024@taxreminder'}
+    paid = events[f'UID:{saturday}-2025@taxreminder']
+    assert 'DTSTART;VALUE=DATE:20250113\r\n' in paid
+    assert 'SUMMARY:✅ Mensual\r\n' in paid
+    assert 'con anexos\\;' in paid.replace('\r\n ', '')
+    assert '11/01/2025 (día no hábil)' in paid.replace('\r\n ', '')
+
+
+def test_one_event_per_matching_client(db):
+    add_dates(db, [{'table_name': 'spe', 'month': 3, 'day': 17, 'rif_digits': '5'},
+                   {'table_name': 'spe', 'month': 3, 'day': 18}])
+    db.add_client('J-12345678-5', 'Cliente cinco')
+    db.add_client('J-12345678-6', 'Cliente seis')
+    text = ''.join(iter_ics(db, 2025, 2025, clients=db.get_clients()))
+    event, = _events(text)
+    assert 'Cliente cinco (J-12345678-5)' in event
+
+
+def test_export_is_skipped_until_the_database_changes(db, tmp_path):
+    add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 15}])
+    path = str(tmp_path / 'vencimientos.ics')
+    assert export_ics(db, path, 2025, 2025)
+    assert not export_ics(db, path, 2025, 2025)
+    assert export_ics(db, path, 2025, 2026)  # Otros parámetros
+
+    db.add_date('monthly', 2, 15)
+    assert export_ics(db, path, 2025, 2026)
+    with open(path, encoding='utf-8', newline='') as f:
+        assert f.read().count('BEGIN:VEVENT') == 4
+    assert os.path.exists(path + '.meta.json')
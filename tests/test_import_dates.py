@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+import models
+
+
+@pytest.fixture
+def import_db(db):
+    db.add_table('monthly', 'Mensual')
+    return db
+
+
+def test_csv_rejects_invalid_records(import_db):
+    stream = io.StringIO(
+        "table_name,month,day,year,rif_digits,description\n"
+        "monthly,1,15,,,IVA\n"
+        "missing,1,15,,,Tabla inexistente\n"
+        "monthly,2,30,,,Fecha imposible\n"
+        "monthly,enero,15,,,Mes no numérico\n"
+        "monthly,3,15,,5a,Terminales inválidos\n"
+        "monthly,2,29,2025,,29 de febrero en año no bisiesto\n"
+        "monthly,1,15,,,Repetida\n"
+    )
+    result = import_db.import_dates(stream, 'csv')
+
+    assert (result['inserted'], result['skipped'], result['rejected']) == (1, 1, 5)
+    assert [line for line, _ in result['errors']] == [3, 4, 5, 6, 7]
+    assert "la tabla 'missing' no existe" in result['errors'][0][1]
+
+
+def test_json_array_rejects_fields_of_the_wrong_type(import_db, monkeypatch):
+    # Bloques diminutos: los elementos quedan partidos entre lecturas
+    monkeypatch.setattr(models, '_JSON_CHUNK', 5)
+    records = [
+        {'table_name': 'monthly', 'month': 1, 'day': 15, 'rif_digits': 5, 'description': 'IVA'},
+        {'table_name': ['monthly'], 'month': 1, 'day': 16},
+        {'table_name': 'monthly', 'month': True, 'day': 17},
+        {'table_name': 'monthly', 'month': 1.5, 'day': 18},
+        {'table_name': 'monthly', 'month': 1, 'day': 19, 'description': {'text': 'x'}},
+        'no es un objeto',
+        {'table': 'monthly', 'month': 2.0, 'day': '20'},
+    ]
+    result = import_db.import_dates(io.StringIO(json.dumps(records, indent=2)), 'json')
+
+    assert (result['inserted'], result['rejected']) == (2, 5)
+    assert [number for number, _ in result['errors']] == [2, 3, 4, 5, 6]
+    assert "'table_name' debe ser texto" in result['errors'][0][1]
+    dates = import_db.get_dates_for_table('monthly')
+    assert sorted((d['month'], d['day']) for d in dates) == [(1, 15), (2, 20)]
+
+
+def test_malformed_json_array_ends_the_import(import_db):
+    stream = io.StringIO('[{"table_name": "monthly", "month": 1, "day": 15} {"month": 2}]')
+    result = import_db.import_dates(stream, 'json')
+    assert (result['inserted'], result['rejected']) == (1, 1)
+    assert result['errors'][0][0] == 2
+
+
+def test_json_lines_reject_invalid_lines(import_db):
+    stream = io.StringIO(
+        '{"table_name": "monthly", "month": 1, "day": 15}\n'
+        '\n'
+        '{"table_name": "monthly", "month": 1,\n'
+        '{"table_name": "monthly", "month": 4, "day": 31}\n'
+    )
+    result = import_db.import_dates(stream, 'json')
+    assert (result['inserted'], result['rejected']) == (1, 2)
+    assert [line for line, _ in result['errors']] == [3, 4]
+    assert result['errors'][0][1].startswith('JSON inválido')
+
+
+def test_unknown_format_is_an_error(import_db):
+    with pytest.raises(ValueError):
+        import_db.import_dates(io.StringIO(''), 'xml')
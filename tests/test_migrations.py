@@ -0,0 +1,138 @@
+import sqlite3
+
+from migrations import SCHEMA_VERSION, get_schema_version
+
+# Esquema de las bases de datos anteriores a las migraciones (user_version = 0)
+_OLD_SCHEMA = """
+    CREATE TABLE tables (
+        id INTEGER NOT NULL,
+        name VARCHAR(50) NOT NULL,
+        description VARCHAR(200),
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    );
+    CREATE TABLE tax_dates (
+        id INTEGER NOT NULL,
+        table_name VARCHAR(50) NOT NULL,
+        month INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        description VARCHAR(200),
+        PRIMARY KEY (id),
+        FOREIGN KEY(table_name) REFERENCES tables (name)
+    );
+    INSERT INTO tables (id, name, description) VALUES (1, 'monthly', 'Mensual');
+    INSERT INTO tax_dates (id, table_name, month, day, description) VALUES
+        (1, 'monthly', 1, 15, 'IVA'),
+        (2, 'monthly', 1, 15, 'ISLR'),
+        (3, 'monthly', 1, 15, 'IVA'),
+        (4, 'monthly', 2, 29, 'Bisiesto'),
+        (5, 'monthly', 12, 31, 'Cierre');
+"""
+
+
+def _old_database(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(_OLD_SCHEMA)
+    connection.close()
+
+
+def test_old_schema_is_migrated_to_current_version(db_path):
+    from models import DatabaseManager
+
+    _old_database(db_path)
+    db = DatabaseManager(f'sqlite:///{db_path}')
+    assert db.schema_version == SCHEMA_VERSION
+
+    connection = sqlite3.connect(db_path)
+    try:
+        assert get_schema_version(connection) == SCHEMA_VERSION
+        names = {name for (name,) in connection.execute("SELECT name FROM sqlite_master")}
+        assert {'clients', 'holidays', 'payments', 'tax_dates_duplicates',
+                'uq_tax_dates_table_year_month_day', 'ix_tax_dates_doy_year',
+                'tr_tax_dates_doy_insert', 'tr_tax_dates_doy_update'} <= names
+    finally:
+        connection.close()
+
+
+def test_duplicate_dates_are_merged_not_lost(db_path):
+    from models import DatabaseManager
+
+    _old_database(db_path)
+    DatabaseManager(f'sqlite:///{db_path}')
+
+    connection = sqlite3.connect(db_path)
+    try:
+        assert connection.execute(
+            "SELECT id, description FROM tax_dates WHERE month = 1 AND day = 15"
+        ).fetchall() == [(1, 'IVA / ISLR')]
+        assert connection.execute(
+            "SELECT id, kept_id, description FROM tax_dates_duplicates ORDER BY id"
+        ).fetchall() == [(2, 1, 'ISLR'), (3, 1, 'IVA')]
+    finally:
+        connection.close()
+
+
+def test_day_of_year_is_filled_and_kept_by_triggers(db_path):
+    from models import DatabaseManager
+
+    _old_database(db_path)
+    db = DatabaseManager(f'sqlite:///{db_path}')
+
+    connection = sqlite3.connect(db_path)
+    try:
+        assert dict(connection.execute("SELECT id, doy FROM tax_dates")) == {1: 15, 4: 60, 5: 366}
+    finally:
+        connection.close()
+
+    db.add_date('monthly', 3, 1)
+    db.add_date('monthly', 4, 31)  # No existe: sin clave
+    connection = sqlite3.connect(db_path)
+    try:
+        assert connection.execute(
+            "SELECT month, day, doy FROM tax_dates WHERE id > 5 ORDER BY id"
+        ).fetchall() == [(3, 1, 61), (4, 31, None)]
+    finally:
+        connection.close()
+
+
+def test_tax_date_ids_are_never_reused(db_path):
+    from models import DatabaseManager
+
+    _old_database(db_path)
+    db = DatabaseManager(f'sqlite:///{db_path}')
+    assert db.delete_date(5)
+    db.add_date('monthly', 3, 1)
+
+    connection = sqlite3.connect(db_path)
+    try:
+        sql = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'tax_dates'").fetchone()[0]
+        assert 'AUTOINCREMENT' in sql
+        assert connection.execute("SELECT max(id) FROM tax_dates").fetchone()[0] == 6
+    finally:
+        connection.close()
+
+
+def test_migrating_twice_changes_nothing(db_path):
+    from migrations import migrate_connection
+    from models import DatabaseManager
+
+    _old_database(db_path)
+    DatabaseManager(f'sqlite:///{db_path}')
+
+    connection = sqlite3.connect(db_path)
+    try:
+        before = connection.execute("SELECT * FROM tax_dates ORDER BY id").fetchall()
+        assert migrate_connection(connection) == SCHEMA_VERSION
+        assert connection.execute("SELECT * FROM tax_dates ORDER BY id").fetchall() == before
+    finally:
+        connection.close()
+
+
+def test_new_database_records_current_version(db, db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        assert get_schema_version(connection) == SCHEMA_VERSION
+        sql = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'tax_dates'").fetchone()[0]
+        assert 'AUTOINCREMENT' in sql
+    finally:
+        connection.close()
@@ -0,0 +1,41 @@
+from datetime import date
+
+from occurrences import expand, expand_for_clients
+
+_ROWS = [
+    {'id': 1, 'month': 2, 'day': 29},
+    {'id': 2, 'month': 4, 'day': 31},                    # No existe ningún año
+    {'id': 3, 'month': 3, 'day': 15, 'year': 2025},      # Solo 2025
+    {'id': 4, 'month': 1, 'day': 11, 'rif_digits': '05'},
+    {'id': 5, 'month': 6, 'day': 2, 'rif_digits': None},
+]
+
+
+def _records(occurrences):
+    return [(r['tax_date_id'], r['client_id'], r['nominal_date'], r['due_date']) for r in occurrences.to_records()]
+
+
+def test_impossible_and_other_year_dates_have_no_occurrence():
+    occurrences = expand(_ROWS, 2024, 2025, roll_forward=False)
+    assert sorted((tax_date_id, nominal) for tax_date_id, _, nominal, _ in _records(occurrences)) == [
+        (1, date(2024, 2, 29)),
+        (3, date(2025, 3, 15)),
+        (4, date(2024, 1, 11)), (4, date(2025, 1, 11)),
+        (5, date(2024, 6, 2)), (5, date(2025, 6, 2)),
+    ]
+
+
+def test_due_dates_roll_past_weekends_and_holidays():
+    # Sábado 11 de enero de 2025 -> lunes 13, feriado -> martes 14
+    occurrences = expand(_ROWS[3:4], 2025, 2025, holidays=[date(2025, 1, 13)])
+    assert _records(occurrences) == [(4, None, date(2025, 1, 11), date(2025, 1, 14))]
+    assert len(occurrences.between(date(2025, 1, 12), date(2025, 1, 13))) == 0
+    assert len(occurrences.between(date(2025, 1, 14), date(2025, 1, 14))) == 1
+
+
+def test_clients_only_get_dates_of_their_rif_digit():
+    clients = [{'id': 10, 'rif_digit': '5'}, {'id': 11, 'rif_digit': '6'}, {'id': 12, 'rif_digit': '0'}]
+    occurrences = expand_for_clients(_ROWS, clients, 2025, 2025, roll_forward=False).sorted()
+    assert sorted((tax_date_id, client_id) for tax_date_id, client_id, _, _ in _records(occurrences)) == [
+        (4, 10), (4, 12)
+    ]
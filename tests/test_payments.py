@@ -0,0 +1,82 @@
+import sqlite3
+from datetime import date
+
+from conftest import add_dates
+
+
+def test_record_payment_is_idempotent(db):
+    tax_date_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+    assert db.record_payment(tax_date_id, 2025)
+    assert not db.record_payment(tax_date_id, 2025)
+    assert db.get_paid_occurrences([2025]) == {(tax_date_id, 2025)}
+    assert db.delete_payment(tax_date_id, 2025)
+    assert not db.delete_payment(tax_date_id, 2025)
+    assert db.get_paid_occurrences([2025]) == set()
+
+
+def test_next_unpaid_skips_paid_occurrences(db):
+    # 10 de enero: viernes en 2025, sábado en 2026
+    tax_date_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+
+    reminder = db.get_next_unpaid(date(2025, 1, 6))
+    assert (reminder['id'], reminder['year'], reminder['due_date']) == (tax_date_id, 2025, date(2025, 1, 10))
+    assert reminder['days_until'] == 4
+
+    db.record_payment(tax_date_id, 2025)
+    reminder = db.get_next_unpaid(date(2025, 1, 6))
+    assert reminder['year'] == 2026
+    assert reminder['nominal_date'] == date(2026, 1, 10)
+    assert reminder['due_date'] == date(2026, 1, 12)  # Siguiente día hábil
+
+
+def test_next_unpaid_includes_dates_rolled_into_the_reference_date(db):
+    # Sábado 4 de enero de 2025: vence el lunes 6
+    saturday, friday = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 4},
+                                      {'table_name': 'monthly', 'month': 1, 'day': 3}])
+    reminder = db.get_next_unpaid(date(2025, 1, 6))
+    assert (reminder['id'], reminder['due_date'], reminder['days_until']) == (saturday, date(2025, 1, 6), 0)
+
+
+def test_next_unpaid_skips_impossible_dates(db):
+    feb_29, = add_dates(db, [{'table_name': 'monthly', 'month': 2, 'day': 29}])
+    # Solo se buscan el año de referencia y el siguiente: ni 2025 ni 2026 son bisiestos
+    assert db.get_next_unpaid(date(2025, 1, 1)) is None
+    reminder = db.get_next_unpaid(date(2027, 6, 1))
+    assert (reminder['id'], reminder['nominal_date']) == (feb_29, date(2028, 2, 29))
+    assert reminder['due_date'] == date(2028, 3, 1)  # Martes de Carnaval
+
+
+def test_next_unpaid_is_none_when_everything_is_paid(db):
+    tax_date_id, = add_dates(db, [{'table_name': 'spe', 'month': 3, 'day': 14, 'year': 2025}])
+    db.record_payment(tax_date_id, 2025)
+    assert db.get_next_unpaid(date(2025, 1, 1)) is None
+
+
+def test_clean_database_leaves_no_orphan_payments(db, db_path):
+    tax_date_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+    db.record_payment(tax_date_id, 2025)
+
+    assert db.clean_database()
+    connection = sqlite3.connect(db_path)
+    try:
+        for table in ('payments', 'tax_dates', 'tables'):
+            assert connection.execute(f"SELECT count(*) FROM {table}").fetchone()[0] == 0
+    finally:
+        connection.close()
+
+    new_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+    assert new_id != tax_date_id
+    assert [r['id'] for r in db.get_upcoming(date(2025, 1, 10), 1)] == [new_id]
+
+
+def test_paid_occurrences_leave_the_client_list(db):
+    # Viernes 10 de enero de 2025 y del año siguiente en una ventana de más de un año
+    tax_date_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10, 'rif_digits': '5'}])
+    db.add_client('J-12345678-5', 'Cliente cinco')
+    assert [r['due_date'] for r in db.get_upcoming_for_clients(date(2025, 1, 8), 370)] == \
+        [date(2025, 1, 10), date(2026, 1, 12)]
+
+    db.record_payment(tax_date_id, 2025)
+    assert [r['due_date'] for r in db.get_upcoming_for_clients(date(2025, 1, 8), 370)] == [date(2026, 1, 12)]
+    db.record_payment(tax_date_id, 2026)
+    assert db.get_upcoming_for_clients(date(2025, 1, 8), 3) == []
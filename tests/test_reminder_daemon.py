@@ -0,0 +1,36 @@
+from datetime import date, datetime
+
+from conftest import add_dates
+from reminder_daemon import ReminderDaemon
+
+
+def _announced(db_path, now, until):
+    events = []
+    daemon = ReminderDaemon(db_path, events.append, lead_days=2)
+    daemon.reload(now)
+    assert daemon.run_pending(until) == len(events)
+    return [(e['id'], e['due_date'], e['days_until'], e['notify_at']) for e in events]
+
+
+def test_reminders_are_announced_before_the_business_day_due_date(db, db_path):
+    # Sábado 10 de enero de 2026: vence el lunes 12
+    tax_date_id, = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+    assert _announced(db_path, datetime(2026, 1, 9, 7, 0), datetime(2026, 1, 12, 9, 0)) == [
+        (tax_date_id, date(2026, 1, 12), 2, datetime(2026, 1, 10, 8, 0)),
+        (tax_date_id, date(2026, 1, 12), 1, datetime(2026, 1, 11, 8, 0)),
+        (tax_date_id, date(2026, 1, 12), 0, datetime(2026, 1, 12, 8, 0)),
+    ]
+
+
+def test_paid_occurrences_are_not_announced(db, db_path):
+    paid, unpaid = add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10},
+                                  {'table_name': 'monthly', 'month': 1, 'day': 9}])
+    db.record_payment(paid, 2025)
+    announced = _announced(db_path, datetime(2025, 1, 6, 7, 0), datetime(2025, 1, 10, 9, 0))
+    assert {tax_date_id for tax_date_id, *_ in announced} == {unpaid}
+
+
+def test_missed_reminder_of_today_is_announced_at_once(db, db_path):
+    add_dates(db, [{'table_name': 'monthly', 'month': 1, 'day': 10}])
+    now = datetime(2025, 1, 10, 11, 30)
+    assert [(days_until, notify_at) for _, _, days_until, notify_at in _announced(db_path, now, now)] == [(0, now)]
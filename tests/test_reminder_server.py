@@ -0,0 +1,72 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from reminder_server import ResponseCache, make_server
+
+
+@pytest.fixture
+def server(db, db_path):
+    db.add_table('monthly', 'Mensual')
+    server = make_server(db_path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path, etag=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.request('GET', path, headers={'If-None-Match': etag} if etag else {})
+        response = connection.getresponse()
+        return response.status, response.getheader('ETag'), response.read()
+    finally:
+        connection.close()
+
+
+def test_etag_revalidation_until_the_database_changes(server, db):
+    status, etag, body = _get(server, '/dates?table=monthly')
+    assert status == 200 and json.loads(body)['dates'] == []
+    assert _get(server, '/dates?table=monthly', etag) == (304, etag, b'')
+
+    db.add_date('monthly', 1, 15, 'IVA')
+    status, new_etag, body = _get(server, '/dates?table=monthly', etag)
+    assert status == 200 and new_etag != etag
+    assert [d['description'] for d in json.loads(body)['dates']] == ['IVA']
+
+
+def test_invalid_requests(server):
+    assert _get(server, '/nada')[0] == 404
+    assert _get(server, '/upcoming?days=0')[0] == 400
+    assert _get(server, '/dates?table=nada')[0] == 400
+
+
+def test_cache_evicts_the_least_recently_used_response():
+    cache = ResponseCache(size=2)
+    builds = []
+
+    def get(key):
+        return cache.get_or_build((key,), lambda: builds.append(key) or {'key': key})
+
+    first = get('a')
+    get('b')
+    assert get('a') == first  # 'a' pasa a ser la más reciente
+    get('c')                  # Sale 'b'
+    get('a')
+    get('b')
+    assert builds == ['a', 'b', 'c', 'b']
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_failed_build_is_not_cached():
+    def fail():
+        raise RuntimeError('falla')
+
+    cache = ResponseCache()
+    with pytest.raises(RuntimeError):
+        cache.get_or_build(('x',), fail)
+    assert cache.get_or_build(('x',), lambda: [1])[1] == b'[1]'
@@ -0,0 +1,32 @@
+from spe_importer import ALL_DIGITS, _merge_records, parse_page_text
+
+PAGE = """CALENDARIO SUJETOS PASIVOS ESPECIALES 2025
+RETENCIONES DE IVA - PRIMERA QUINCENA
+Último dígito del RIF   0 y 5   1 y 6   2 y 7   3 y 8   4 y 9
+Enero                   20      21      22      23      20
+Febrero                 18      19      30      21      24
+DECLARACIÓN DEFINITIVA DE ISLR
+Marzo                   31
+"""
+
+
+def test_page_with_and_without_digit_header():
+    records = parse_page_text(PAGE, 2025)
+    by_obligation = {}
+    for record in records:
+        by_obligation.setdefault(record['obligation'], []).append(
+            (record['month'], record['day'], record['rif_digits']))
+
+    # El 30 de febrero es una celda mal leída y se descarta
+    assert by_obligation['RETENCIONES DE IVA - PRIMERA QUINCENA'] == [
+        (1, 20, '05'), (1, 21, '16'), (1, 22, '27'), (1, 23, '38'), (1, 20, '49'),
+        (2, 18, '05'), (2, 19, '16'), (2, 21, '38'), (2, 24, '49'),
+    ]
+    # La obligación sin fila de terminales aplica a todos los contribuyentes
+    assert by_obligation['DECLARACIÓN DEFINITIVA DE ISLR'] == [(3, 31, ALL_DIGITS)]
+
+    rows, tables = _merge_records(records, 2025)
+    merged = {(row['table_name'], row['month'], row['day']): row['rif_digits'] for row in rows}
+    assert merged[('spe_retenciones_de_iva_primera_quincena', 1, 20)] == '0459'
+    assert merged[('spe_declaracion_definitiva_de_islr', 3, 31)] == ALL_DIGITS
+    assert len(tables) == 2
@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import add_dates
+from deadline_index import DeadlineIndex, window_query, window_rows
+from models import TaxDate
+
+# Cada (mes, día) de un año bisiesto, más fechas de calendarios de un año concreto
+_EVERY_DAY = [date(2000, 1, 1) + timedelta(days=n) for n in range(366)]
+_ROWS = (
+    [{'table_name': 'recurring', 'month': d.month, 'day': d.day, 'rif_digits': str(d.day % 10)}
+     for d in _EVERY_DAY]
+    + [{'table_name': 'spe', 'month': month, 'day': day, 'year': year, 'rif_digits': '0123456789'}
+       for year, month, day in [(2023, 12, 31), (2024, 1, 1), (2024, 2, 29), (2024, 12, 30), (2025, 1, 2)]]
+)
+
+# Ventanas que cruzan el cambio de año y el 29 de febrero, en años bisiestos y no bisiestos
+_WINDOWS = [
+    (start + timedelta(days=offset), horizon)
+    for start in (date(2023, 12, 27), date(2024, 12, 27), date(2023, 2, 25), date(2024, 2, 25))
+    for offset in range(0, 8)
+    for horizon in (1, 3, 10)
+] + [(date(2023, 11, 1), 400)]
+
+
+@pytest.fixture
+def calendar_db(db):
+    add_dates(db, _ROWS)
+    return db
+
+
+def _key(reminders):
+    return sorted((r['id'], r['due_date'], r['days_until']) for r in reminders)
+
+
+def test_window_query_matches_deadline_index(calendar_db, db_path):
+    from fast_reader import open_readonly
+
+    index = calendar_db.get_deadline_index()
+    connection = open_readonly(db_path)
+    try:
+        for reference_date, horizon_days in _WINDOWS:
+            sql, params = window_query(reference_date, horizon_days)
+            rows = window_rows(connection.execute(sql, params), reference_date)
+            assert _key(rows) == _key(index.upcoming(reference_date, horizon_days)), (reference_date, horizon_days)
+    finally:
+        connection.close()
+
+
+def test_feb_29_only_in_leap_years(calendar_db):
+    index = calendar_db.get_deadline_index()
+    feb_29 = [(r['month'], r['day']) for r in index.upcoming(date(2023, 2, 28), 2)]
+    assert (2, 29) not in feb_29
+    assert feb_29.count((3, 1)) == 1
+    leap = [(r['table'], r['due_date']) for r in index.upcoming(date(2024, 2, 29), 1)]
+    assert sorted(leap) == [('recurring', date(2024, 2, 29)), ('spe', date(2024, 2, 29))]
+
+
+def test_dated_calendars_only_match_their_year(calendar_db):
+    index = calendar_db.get_deadline_index()
+    spe = [r['due_date'] for r in index.upcoming(date(2023, 12, 30), 4) if r['table'] == 'spe']
+    assert spe == [date(2023, 12, 31), date(2024, 1, 1)]
+    spe = [r['due_date'] for r in index.upcoming(date(2024, 12, 30), 4) if r['table'] == 'spe']
+    assert spe == [date(2024, 12, 30), date(2025, 1, 2)]
+
+
+def test_window_query_leaves_out_paid_occurrences(calendar_db, db_path):
+    from fast_reader import open_readonly
+
+    reference_date = date(2024, 12, 30)
+    first, *_ = calendar_db.get_deadline_index().upcoming(reference_date, 3)
+    calendar_db.record_payment(first['id'], first['due_date'].year)
+
+    sql, params = window_query(reference_date, 3, include_paid=False)
+    connection = open_readonly(db_path)
+    try:
+        ids = {row[0] for row in connection.execute(sql, params)}
+    finally:
+        connection.close()
+    assert first['id'] not in ids
+
+
+def test_upcoming_rolls_to_business_days(calendar_db):
+    # Sábado 14 y domingo 15 de diciembre de 2024 pasan al lunes 16
+    reminders = calendar_db.get_upcoming(date(2024, 12, 16), 1)
+    assert {(r['month'], r['day']) for r in reminders} == {(12, 14), (12, 15), (12, 16)}
+    assert all(r['due_date'] == date(2024, 12, 16) and r['days_until'] == 0 for r in reminders)
+    moved = [r for r in reminders if r['nominal_date'] != r['due_date']]
+    assert len(moved) == 2
+
+
+def test_short_views_match_get_upcoming(calendar_db, db_path):
+    from fast_reader import read_upcoming
+    from reminder_snapshot import read_upcoming_cached
+
+    def key(reminders):
+        return sorted((r['id'], r['due_date'], r['nominal_date'], r['days_until'],
+                       r['business_days_until'], r.get('client_id')) for r in reminders)
+
+    calendar_db.add_client('J-12345678-5', 'Cliente cinco')
+    # Navidad, fin de año y Semana Santa
+    for reference_date in [date(2024, 12, 20) + timedelta(days=n) for n in range(16)] + \
+                          [date(2024, 3, 25) + timedelta(days=n) for n in range(7)]:
+        expected = calendar_db.get_upcoming(reference_date, 3)
+        expected_clients = calendar_db.get_upcoming_for_clients(reference_date, 3)
+
+        for upcoming, client_reminders in (read_upcoming(db_path, reference_date, 3),
+                                           read_upcoming_cached(db_path, reference_date, 3)):
+            assert key(upcoming) == key(expected), reference_date
+            assert key(client_reminders) == key(expected_clients), reference_date
+
+
+def test_manually_added_date_reaches_the_clients_of_its_digits(db):
+    db.add_table('monthly', 'Mensual')
+    db.add_client('J-12345678-5', 'Cliente cinco')
+    db.add_client('J-12345678-3', 'Cliente tres')
+
+    # Solo dígitos 0-9: ni letras ni dígitos de otros alfabetos
+    assert not db.add_date('monthly', 3, 11, 'IVA', '5a')
+    assert not db.add_date('monthly', 3, 11, 'IVA', '٥')
+    assert db.add_date('monthly', 3, 11, 'IVA', '50')
+
+    with db.get_db() as session:
+        assert session.query(TaxDate.rif_digits).all() == [('05',)]
+    reminders = db.get_upcoming_for_clients(date(2025, 3, 10), 3)
+    assert [(r['client_name'], r['due_date']) for r in reminders] == [('Cliente cinco', date(2025, 3, 11))]